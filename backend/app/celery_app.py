@@ -1,6 +1,7 @@
 """Celery application configuration."""
 
 from celery import Celery
+from celery.signals import worker_init
 from celery.schedules import crontab
 from app.config import get_settings
 
@@ -28,6 +29,14 @@ celery_app.conf.update(
     worker_max_tasks_per_child=1000,
 )
 
+
+@worker_init.connect
+def prepare_database(**kwargs):
+    """Create missing tables and columns before the worker takes tasks."""
+    from app.database import init_db
+    init_db()
+
+
 # Configure Celery Beat schedule
 celery_app.conf.beat_schedule = {
     'scrape-jobs-daily': {
@@ -44,11 +53,19 @@ celery_app.conf.beat_schedule = {
         'task': 'app.tasks.cleanup_old_jobs_task',
         'schedule': crontab(hour=2, minute=0),  # Run at 2 AM every day
         'options': {'expires': 3600}
+    },
+    'reconcile-counters': {
+        'task': 'app.tasks.reconcile_counters_task',
+        'schedule': crontab(hour=3, minute=0),  # Run at 3 AM every day (after cleanup)
+        'options': {'expires': 3600}
     }
 }
 
 celery_app.conf.task_routes = {
     'app.tasks.scrape_jobs_task': {'queue': 'scraping'},
+    'app.tasks.scrape_unit_task': {'queue': 'scraping'},
+    'app.tasks.scrape_summary_task': {'queue': 'scraping'},
     'app.tasks.aggregate_daily_stats_task': {'queue': 'analytics'},
     'app.tasks.cleanup_old_jobs_task': {'queue': 'maintenance'},
+    'app.tasks.reconcile_counters_task': {'queue': 'maintenance'},
 }
@@ -14,10 +14,57 @@ class Settings(BaseSettings):
     
     # Redis for Celery
     redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Worker profile started by app.worker (scraping, analytics, maintenance or all)
+    # and overrides of its pool settings; empty or 0 keeps the profile's default
+    worker_profile: str = os.getenv("WORKER_PROFILE", "all")
+    worker_pool: str = os.getenv("WORKER_POOL", "")
+    worker_concurrency: int = int(os.getenv("WORKER_CONCURRENCY", "0"))
+    worker_prefetch_multiplier: int = int(os.getenv("WORKER_PREFETCH_MULTIPLIER", "0"))
+    worker_max_tasks_per_child: int = int(os.getenv("WORKER_MAX_TASKS_PER_CHILD", "0"))
     
     # Scraping
     scraping_enabled: bool = os.getenv("SCRAPING_ENABLED", "true").lower() == "true"
     max_jobs_per_scrape: int = int(os.getenv("MAX_JOBS_PER_SCRAPE", "100"))
+    # Concurrent scrape units allowed per source, as "source=limit" pairs
+    scrape_source_concurrency: str = os.getenv("SCRAPE_SOURCE_CONCURRENCY", "remoteok=1,indeed=2")
+    # Whole-run deadline; keep it under the Celery soft time limit (25 min)
+    scrape_deadline_seconds: int = int(os.getenv("SCRAPE_DEADLINE_SECONDS", str(20 * 60)))
+    # Ignore high-water marks and rescan every source from the top
+    scrape_full_refresh: bool = os.getenv("SCRAPE_FULL_REFRESH", "false").lower() == "true"
+    # Skip scrape units that already finished today (see scrape_checkpoints)
+    scrape_resume: bool = os.getenv("SCRAPE_RESUME", "true").lower() == "true"
+    # Start the daily stats aggregation as soon as the scrape fan-out finishes
+    scrape_trigger_aggregation: bool = os.getenv("SCRAPE_TRIGGER_AGGREGATION", "false").lower() == "true"
+    # Extra scraper sources as "name=module:Class" pairs (see app/scrapers/registry.py)
+    scraper_plugins: str = os.getenv("SCRAPER_PLUGINS", "")
+    
+    # Shared Playwright browser pool
+    browser_max_pages: int = int(os.getenv("BROWSER_MAX_PAGES", "2"))
+    browser_recycle_pages: int = int(os.getenv("BROWSER_RECYCLE_PAGES", "50"))
+    browser_max_memory_mb: int = int(os.getenv("BROWSER_MAX_MEMORY_MB", "1024"))
+    # Resource types aborted on scraping pages, and whether third-party hosts are blocked
+    browser_blocked_resource_types: str = os.getenv("BROWSER_BLOCKED_RESOURCE_TYPES", "image,media,font,stylesheet")
+    browser_block_third_party: bool = os.getenv("BROWSER_BLOCK_THIRD_PARTY", "true").lower() == "true"
+    # How long to wait for results to render before giving up on a page
+    browser_content_timeout_ms: int = int(os.getenv("BROWSER_CONTENT_TIMEOUT_MS", "15000"))
+    
+    # Per-source request rate limiting (rates come from source_configs)
+    # "redis" shares one token bucket per source across workers; "local" is per process
+    rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "redis")
+    # Requests a source may burst before the per-minute rate applies
+    rate_limit_burst: int = int(os.getenv("RATE_LIMIT_BURST", "5"))
+    
+    # Enrichment stage: worker processes for skill extraction and classification
+    # (0 = one per CPU, 1 = serial) and jobs per chunk sent to a worker
+    enrich_workers: int = int(os.getenv("ENRICH_WORKERS", "0"))
+    enrich_chunk_size: int = int(os.getenv("ENRICH_CHUNK_SIZE", "100"))
+    
+    # Daily stats: skill, location and company stages run in this many threads (1 = serial)
+    aggregation_workers: int = int(os.getenv("AGGREGATION_WORKERS", "3"))
+    
+    # Raw payload archive for offline replay (app/replay.py)
+    archive_enabled: bool = os.getenv("ARCHIVE_ENABLED", "true").lower() == "true"
+    archive_dir: str = os.getenv("ARCHIVE_DIR", "./archive")
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,200 @@
+"""Running counts of active jobs, maintained as deltas when jobs are saved
+or deactivated, so daily stats can snapshot them instead of recounting."""
+
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, insert, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, func, select
+
+from app.models import JobPosting, JobSkillLink, StatCounter
+
+logger = logging.getLogger(__name__)
+
+# Counter scopes. key_id is the skill, location or company id (0 for the
+# global count); other_id is the company or location id of a pair scope,
+# whose rows give each skill's distinct companies and locations.
+SKILL = "skill"
+LOCATION = "location"
+COMPANY = "company"
+SKILL_COMPANY = "skill_company"
+SKILL_LOCATION = "skill_location"
+GLOBAL = "global"
+
+CounterKey = Tuple[str, int, int]
+
+
+class JobKeys(NamedTuple):
+    """What a job contributes to the counters."""
+    company_id: Optional[int]
+    location_id: Optional[int]
+    skill_ids: Iterable[int]
+
+
+def job_deltas(jobs: Iterable[JobKeys], sign: int, deltas: Optional[Counter] = None) -> Counter:
+    """Add sign (1 for a job becoming active, -1 for one leaving) for each
+    job to the counters it contributes to."""
+    deltas = Counter() if deltas is None else deltas
+    for company_id, location_id, skill_ids in jobs:
+        deltas[(GLOBAL, 0, 0)] += sign
+        if company_id is not None:
+            deltas[(COMPANY, company_id, 0)] += sign
+        if location_id is not None:
+            deltas[(LOCATION, location_id, 0)] += sign
+        for skill_id in set(skill_ids):
+            deltas[(SKILL, skill_id, 0)] += sign
+            if company_id is not None:
+                deltas[(SKILL_COMPANY, skill_id, company_id)] += sign
+            if location_id is not None:
+                deltas[(SKILL_LOCATION, skill_id, location_id)] += sign
+    return deltas
+
+
+def apply_deltas(session: Session, deltas: Counter) -> None:
+    """Add deltas to the stored counters in the session's transaction; the
+    caller commits them together with the job changes they describe.
+
+    Each counter is incremented in the database (INSERT ... ON CONFLICT DO
+    UPDATE count = count + delta), so concurrent writers never overwrite
+    each other's deltas. Rows are written in key order so that concurrent
+    transactions lock them in the same order.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {"scope": scope, "key_id": key_id, "other_id": other_id, "job_count": delta, "updated_at": now}
+        for (scope, key_id, other_id), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(StatCounter)
+    statement = statement.on_conflict_do_update(
+        index_elements=["scope", "key_id", "other_id"],
+        set_={
+            "job_count": StatCounter.job_count + statement.excluded.job_count,
+            "updated_at": statement.excluded.updated_at,
+        }
+    )
+    session.execute(statement, rows)
+
+
+def record_jobs(session: Session, jobs: Iterable[JobKeys], sign: int = 1) -> None:
+    """Count jobs in (sign=1) or out of (sign=-1) the active counters."""
+    apply_deltas(session, job_deltas(jobs, sign))
+
+
+def load_job_keys(session: Session, job_ids: List[int]) -> Dict[int, JobKeys]:
+    """Company, location and current skill links of stored jobs, by id."""
+    if not job_ids:
+        return {}
+    skills: Dict[int, List[int]] = {}
+    for job_id, skill_id in session.exec(
+        select(JobSkillLink.job_id, JobSkillLink.skill_id).where(JobSkillLink.job_id.in_(job_ids))
+    ):
+        skills.setdefault(job_id, []).append(skill_id)
+    return {
+        job_id: JobKeys(company_id, location_id, skills.get(job_id, []))
+        for job_id, company_id, location_id in session.exec(
+            select(JobPosting.id, JobPosting.company_id, JobPosting.location_id).where(JobPosting.id.in_(job_ids))
+        )
+    }
+
+
+def counts(session: Session, scope: str) -> Dict[int, int]:
+    """Non-zero counters of a scope by key_id (pair scopes: see pair_counts)."""
+    return dict(session.exec(
+        select(StatCounter.key_id, StatCounter.job_count).where(
+            StatCounter.scope == scope,
+            StatCounter.job_count > 0
+        )
+    ).all())
+
+
+def pair_counts(scope: str):
+    """Subquery of key_id and n, the number of distinct other_ids with
+    active jobs, for a pair scope (a skill's distinct companies or
+    locations)."""
+    return select(
+        StatCounter.key_id,
+        func.count().label("n")
+    ).where(
+        StatCounter.scope == scope,
+        StatCounter.job_count > 0
+    ).group_by(StatCounter.key_id).subquery()
+
+
+def recount(session: Session) -> Counter:
+    """Every counter computed from scratch from the active jobs."""
+    totals = Counter()
+    active = JobPosting.is_active == True
+    totals[(GLOBAL, 0, 0)] = session.exec(select(func.count(JobPosting.id)).where(active)).one()
+    for scope, column in ((COMPANY, JobPosting.company_id), (LOCATION, JobPosting.location_id)):
+        for key_id, job_count in session.exec(
+            select(column, func.count()).where(active, column.isnot(None)).group_by(column)
+        ):
+            totals[(scope, key_id, 0)] = job_count
+
+    linked = (JobPosting, JobPosting.id == JobSkillLink.job_id)
+    for skill_id, job_count in session.exec(
+        select(JobSkillLink.skill_id, func.count()).join(*linked).where(active).group_by(JobSkillLink.skill_id)
+    ):
+        totals[(SKILL, skill_id, 0)] = job_count
+    for scope, column in ((SKILL_COMPANY, JobPosting.company_id), (SKILL_LOCATION, JobPosting.location_id)):
+        for skill_id, other_id, job_count in session.exec(
+            select(JobSkillLink.skill_id, column, func.count())
+            .join(*linked)
+            .where(active, column.isnot(None))
+            .group_by(JobSkillLink.skill_id, column)
+        ):
+            totals[(scope, skill_id, other_id)] = job_count
+    return totals
+
+
+def rebuild_counters(session: Session) -> Dict[str, int]:
+    """Replace the counters with a full recount and return how many
+    counters of each scope were wrong.
+
+    Writers are held off until the rebuild commits (an EXCLUSIVE table
+    lock on Postgres, SQLite's write lock taken by the delete on SQLite),
+    so jobs saved meanwhile add their deltas to the rebuilt counters
+    rather than being counted twice or lost.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(text("LOCK TABLE stat_counters IN EXCLUSIVE MODE"))
+    stored = {
+        (counter.scope, counter.key_id, counter.other_id): counter.job_count
+        for counter in session.exec(select(StatCounter))
+    }
+    session.execute(delete(StatCounter))
+    totals = recount(session)
+
+    now = datetime.utcnow()
+    session.execute(insert(StatCounter), [
+        {"scope": scope, "key_id": key_id, "other_id": other_id, "job_count": job_count, "updated_at": now}
+        for (scope, key_id, other_id), job_count in sorted(totals.items())
+        if job_count or scope == GLOBAL
+    ])
+    session.commit()
+
+    mismatches = Counter(
+        key[0] for key in set(stored) | set(totals) if stored.get(key, 0) != totals.get(key, 0)
+    )
+    return dict(mismatches)
+
+
+def ensure_counters(session: Session) -> bool:
+    """Build the counters from a recount if they were never built (the
+    global counter is always stored once they are). Returns whether they
+    were built."""
+    built = session.exec(
+        select(StatCounter.id).where(StatCounter.scope == GLOBAL)
+    ).first() is not None
+    if built:
+        return False
+    logger.info("Stat counters missing, building them from a full recount")
+    rebuild_counters(session)
+    return True
@@ -1,5 +1,12 @@
-from sqlmodel import SQLModel, create_engine, Session
+import logging
+
+from sqlalchemy import bindparam, inspect, text, update
+from sqlmodel import SQLModel, create_engine, Session, select
 from app.config import get_settings
+from app.counters import ensure_counters
+from app.models import Company, JobPosting, Location
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
@@ -13,10 +20,67 @@ engine = create_engine(
     pool_pre_ping=True,
 )
 
+# Columns added to existing tables since they were first created. create_all
+# never alters a table that already exists, so migrate_db adds these.
+ADDED_COLUMNS = {
+    "job_postings": ["fingerprint"],
+    "source_configs": ["high_water_id", "high_water_at", "http_etag", "http_last_modified"],
+}
+
 
 def init_db():
-    """Create all tables in the database."""
+    """Create all tables in the database and add any missing columns.
+
+    Also builds the stat counters of a database that has none yet, before
+    any writer adds deltas to them: their first delta would otherwise look
+    like a built counter table to ensure_counters.
+    """
     SQLModel.metadata.create_all(engine)
+    migrate_db()
+    with Session(engine) as session:
+        ensure_counters(session)
+
+
+def migrate_db(db_engine=engine):
+    """Add ADDED_COLUMNS missing from existing tables, with their indexes.
+    Safe to run on every start: columns already present are left alone."""
+    inspector = inspect(db_engine)
+    with db_engine.begin() as connection:
+        for table_name, column_names in ADDED_COLUMNS.items():
+            existing = {column["name"] for column in inspector.get_columns(table_name)}
+            table = SQLModel.metadata.tables[table_name]
+            for name in column_names:
+                if name in existing:
+                    continue
+                column_type = table.c[name].type.compile(dialect=db_engine.dialect)
+                connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {column_type}"))
+                for index in table.indexes:
+                    if name in index.columns:
+                        index.create(connection, checkfirst=True)
+                logger.info(f"Added column {table_name}.{name}")
+                if (table_name, name) == ("job_postings", "fingerprint"):
+                    backfill_fingerprints(connection)
+
+
+def backfill_fingerprints(connection) -> int:
+    """Fingerprint stored jobs that have none, so new postings are matched
+    against them. Returns how many were filled in."""
+    from app.scrapers.fingerprint import job_fingerprint
+
+    rows = connection.execute(
+        select(JobPosting.id, JobPosting.title, Company.name, Location.city)
+        .outerjoin(Company, Company.id == JobPosting.company_id)
+        .outerjoin(Location, Location.id == JobPosting.location_id)
+        .where(JobPosting.fingerprint.is_(None))
+    ).all()
+    if rows:
+        connection.execute(
+            update(JobPosting.__table__)
+            .where(JobPosting.__table__.c.id == bindparam("job_id"))
+            .values(fingerprint=bindparam("value")),
+            [{"job_id": job_id, "value": job_fingerprint(title, company, city)} for job_id, title, company, city in rows]
+        )
+    return len(rows)
 
 
 def get_session():
@@ -1,4 +1,4 @@
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, UniqueConstraint
 from typing import Optional, List
 from datetime import datetime, date as date_type
 from enum import Enum
@@ -135,6 +135,9 @@ class JobPosting(SQLModel, table=True):
     is_active: bool = Field(default=True)
     
     url: Optional[str] = None
+    # Hash of normalized title, company and city; the same role on another
+    # source or reposted under a new external_id has the same fingerprint
+    fingerprint: Optional[str] = Field(default=None, index=True, max_length=40)
     
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -208,6 +211,22 @@ class DailyGlobalStats(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class StatCounter(SQLModel, table=True):
+    """Running count of active jobs per skill, location, company, skill and
+    company pair, skill and location pair, or overall, updated as jobs are
+    saved or deactivated (see app/counters.py)."""
+    __tablename__ = "stat_counters"
+    __table_args__ = (UniqueConstraint("scope", "key_id", "other_id"),)
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    scope: str  # skill, location, company, skill_company, skill_location, global
+    key_id: int = Field(default=0)  # skill, location or company id; 0 for global
+    other_id: int = Field(default=0)  # company or location id of a pair scope
+    job_count: int = Field(default=0)
+    
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
 # ============ Source Configuration ============
 
 class SourceConfig(SQLModel, table=True):
@@ -226,5 +245,32 @@ class SourceConfig(SQLModel, table=True):
     last_run_jobs_fetched: int = Field(default=0)
     last_run_errors: int = Field(default=0)
     
+    # Newest posting ingested so far; incremental scrapes stop once they reach it
+    high_water_id: Optional[str] = None
+    high_water_at: Optional[datetime] = None
+    # Validators of the source's feed as of its last fully saved fetch, sent
+    # with the next conditional request so an unchanged feed answers 304
+    http_etag: Optional[str] = None
+    http_last_modified: Optional[str] = None
+    
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ScrapeCheckpoint(SQLModel, table=True):
+    """Progress of one scrape unit (source and query) on one day, so retries
+    and re-runs can skip units that already finished."""
+    __tablename__ = "scrape_checkpoints"
+    __table_args__ = (UniqueConstraint("run_date", "source", "query"),)
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    run_date: date_type = Field(index=True)
+    source: str
+    query: str
+    status: str  # success, error, timeout
+    attempts: int = Field(default=0)
+    jobs_saved: int = Field(default=0)
+    error: Optional[str] = None
+    
+    completed_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
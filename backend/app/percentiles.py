@@ -0,0 +1,79 @@
+"""Salary percentiles per group, computed inside the database."""
+
+from typing import Any, Dict, NamedTuple, Optional
+
+from sqlalchemy import Integer, Select, case, cast, func
+from sqlmodel import Session, select
+
+from app.models import JobPosting
+
+# Fractions matching the fields of Percentiles
+FRACTIONS = (0.25, 0.5, 0.75, 0.9)
+
+
+class Percentiles(NamedTuple):
+    """Continuous percentiles (linear interpolation between the nearest
+    values, as percentile_cont) of one group's values."""
+    p25: Optional[float] = None
+    p50: Optional[float] = None
+    p75: Optional[float] = None
+    p90: Optional[float] = None
+
+
+def active_salaries(group: Any = None) -> Select:
+    """salary_max of active jobs that have one, labelled "value", with the
+    group column labelled "group". Callers join whatever group needs."""
+    columns = [JobPosting.salary_max.label("value")]
+    if group is not None:
+        columns.insert(0, group.label("group"))
+    return select(*columns).select_from(JobPosting).where(
+        JobPosting.is_active == True,
+        JobPosting.salary_max.isnot(None)
+    )
+
+
+def percentiles(session: Session, rows: Select) -> Dict[Any, Percentiles]:
+    """Percentiles of rows' "value" column per "group", or under the key
+    None when rows has no group column. Groups without values are absent.
+
+    Postgres computes them with percentile_cont. Elsewhere (SQLite) each
+    group is numbered with window functions and the two values around
+    each percentile's position are interpolated in the same statement, so
+    only one row per group leaves the database either way.
+    """
+    values = rows.subquery()
+    grouped = "group" in values.c
+    if session.get_bind().dialect.name == "postgresql":
+        statement = select(*[
+            func.percentile_cont(fraction).within_group(values.c.value) for fraction in FRACTIONS
+        ])
+        if grouped:
+            statement = statement.add_columns(values.c.group).group_by(values.c.group)
+    else:
+        partition = [values.c.group] if grouped else None
+        ranked = select(
+            *([values.c.group] if grouped else []),
+            values.c.value,
+            func.row_number().over(partition_by=partition, order_by=values.c.value).label("rank"),
+            func.count().over(partition_by=partition).label("size"),
+        ).subquery()
+        statement = select(*[_interpolated(ranked, fraction) for fraction in FRACTIONS])
+        if grouped:
+            statement = statement.add_columns(ranked.c.group).group_by(ranked.c.group)
+
+    results = {}
+    for row in session.exec(statement):
+        if row[0] is not None:
+            results[row[len(FRACTIONS)] if grouped else None] = Percentiles(*[float(value) for value in row[:len(FRACTIONS)]])
+    return results
+
+
+def _interpolated(ranked, fraction: float):
+    """percentile_cont of one group from its ranked rows: the value at the
+    0-based position fraction * (size - 1), interpolated linearly between
+    the rows on either side of it."""
+    position = fraction * (ranked.c.size - 1)
+    lower = cast(position, Integer)  # position is never negative, so this is floor
+    below = func.max(case((ranked.c.rank == lower + 1, ranked.c.value)))
+    above = func.max(case((ranked.c.rank == lower + 2, ranked.c.value)))
+    return below + func.coalesce(above - below, 0) * func.max(position - lower)
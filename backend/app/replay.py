@@ -0,0 +1,115 @@
+"""Replay archived raw payloads through the parse-and-save pipeline.
+
+Reads the segments written by PayloadArchive instead of scraping, so a
+parser change can be applied to months of history with no network.
+By default new postings are inserted as in a normal run; --refresh
+re-derives salaries, classifications and skills of postings that are
+already stored.
+
+    python -m app.replay --source indeed --since 2026-01-01 --refresh
+"""
+
+import argparse
+import logging
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from sqlmodel import Session
+
+from app.database import engine
+from app.scrapers.archive import iter_archive
+from app.scrapers.cache import DimensionCache
+from app.scrapers.enrich import enrich_jobs, shutdown_enrich_pool
+from app.scrapers.registry import SCRAPERS
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def replay_source(
+    session: Session,
+    source: str,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    refresh: bool = False,
+    batch_size: int = 500,
+    cache: Optional[DimensionCache] = None,
+    archive_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Parse, enrich and save every archived payload of one source."""
+    start = time.monotonic()
+    scraper = SCRAPERS[source](session, cache)
+    totals: Dict[str, Any] = {"source": source, "records": 0, "parse_errors": 0}
+
+    def flush(batch: List[Dict[str, Any]]) -> None:
+        jobs = enrich_jobs(type(scraper), batch)
+        totals["parse_errors"] += len(batch) - len(jobs)
+        counts = scraper.refresh_jobs(jobs) if refresh else scraper.save_jobs(jobs)
+        for key, value in counts.items():
+            totals[key] = totals.get(key, 0) + value
+        batch.clear()
+
+    batch: List[Dict[str, Any]] = []
+    for record in iter_archive(source, since, until, root=archive_dir):
+        totals["records"] += 1
+        try:
+            job_data = scraper.parse_archived(record)
+        except Exception as e:
+            logger.error(f"Error parsing archived {source} payload: {str(e)}")
+            totals["parse_errors"] += 1
+            continue
+        if job_data:
+            batch.append(job_data)
+        if len(batch) >= batch_size:
+            flush(batch)
+    if batch:
+        flush(batch)
+
+    totals["elapsed"] = round(time.monotonic() - start, 2)
+    return totals
+
+
+def replay(
+    sources: List[str],
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    refresh: bool = False,
+    batch_size: int = 500,
+) -> List[Dict[str, Any]]:
+    """Replay several sources with one session and dimension cache."""
+    session = Session(engine)
+    try:
+        cache = DimensionCache()
+        cache.preload(session)
+        results = []
+        for source in sources:
+            logger.info(f"Replaying archived {source} payloads")
+            result = replay_source(session, source, since, until, refresh, batch_size, cache)
+            logger.info(f"Replayed {source}: {result}")
+            results.append(result)
+        return results
+    finally:
+        shutdown_enrich_pool()
+        session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay archived scraper payloads without network access.")
+    parser.add_argument(
+        "--source", action="append", choices=sorted(SCRAPERS),
+        help="source to replay; repeat for several (default: all)"
+    )
+    parser.add_argument("--since", type=date.fromisoformat, help="first archive day, YYYY-MM-DD")
+    parser.add_argument("--until", type=date.fromisoformat, help="last archive day, YYYY-MM-DD")
+    parser.add_argument(
+        "--refresh", action="store_true",
+        help="update salaries, classifications and skills of stored postings instead of inserting"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    replay(args.source or sorted(SCRAPERS), args.since, args.until, args.refresh, args.batch_size)
@@ -10,6 +10,7 @@ from app.models import (
     DailySkillStats, DailyGlobalStats, SourceConfig,
     SkillCategory, JobSkillLink
 )
+from app.percentiles import Percentiles, active_salaries, percentiles
 from app.schemas import (
     KPIResponse, TrendResponse, TrendDataPoint,
     SkillInsightResponse, SkillTrendItem,
@@ -69,13 +70,8 @@ def get_dashboard_kpis(session: Session = Depends(get_session)):
         )
     ).one()
     
-    # Median salary - use avg for SQLite compatibility
-    median_salary_result = session.exec(
-        select(func.avg(JobPosting.salary_max)).where(
-            JobPosting.salary_max.isnot(None),
-            JobPosting.is_active == True
-        )
-    ).first()
+    # Median salary, computed in the database
+    median_salary_result = percentiles(session, active_salaries()).get(None, Percentiles()).p50
     
     return KPIResponse(
         jobs_last_24h=jobs_24h or 0,
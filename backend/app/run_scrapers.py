@@ -1,11 +1,15 @@
 """Run scrapers to collect job data."""
 
+import argparse
 import asyncio
 import logging
+from typing import Optional
 from sqlmodel import Session
 
-from app.database import engine
+from app.database import engine, init_db
 from app.scrapers import IndeedScraper, RemoteOKScraper
+from app.scrapers.cache import DimensionCache
+from app.scrapers.orchestrator import ScrapeOrchestrator, ScrapeUnit
 
 logging.basicConfig(
     level=logging.INFO,
@@ -14,44 +18,55 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def run_indeed_scraper(session: Session, query: str = "software engineer", limit: int = 30):
+async def run_indeed_scraper(
+    session: Session,
+    query: str = "software engineer",
+    limit: int = 30,
+    cache: Optional[DimensionCache] = None,
+):
     """Run Indeed scraper."""
     logger.info(f"Starting Indeed scraper for '{query}'")
-    scraper = IndeedScraper(session)
+    scraper = IndeedScraper(session, cache)
     
     jobs = await scraper.scrape(search_query=query, limit=limit)
     logger.info(f"Found {len(jobs)} jobs from Indeed")
     
-    # Save jobs to database
-    saved_count = 0
-    for job_data in jobs:
-        if scraper.save_job(job_data):
-            saved_count += 1
+    # Save jobs to database in one batch
+    result = scraper.save_jobs(jobs)
+    saved_count = result["inserted"]
+    if not result["failed"]:
+        scraper.confirm_saved()
     
-    logger.info(f"Saved {saved_count} new jobs from Indeed")
+    logger.info(
+        f"Saved {saved_count} new jobs from Indeed "
+        f"({result['duplicates']} duplicates, {result['failed']} failed, {result['invalid']} invalid)"
+    )
     return saved_count
 
 
-async def run_remoteok_scraper(session: Session, limit: int = 50):
+async def run_remoteok_scraper(session: Session, limit: int = 50, cache: Optional[DimensionCache] = None):
     """Run RemoteOK scraper."""
     logger.info("Starting RemoteOK scraper")
-    scraper = RemoteOKScraper(session)
+    scraper = RemoteOKScraper(session, cache)
     
     jobs = await scraper.scrape(limit=limit)
     logger.info(f"Found {len(jobs)} jobs from RemoteOK")
     
-    # Save jobs to database
-    saved_count = 0
-    for job_data in jobs:
-        if scraper.save_job(job_data):
-            saved_count += 1
+    # Save jobs to database in one batch
+    result = scraper.save_jobs(jobs)
+    saved_count = result["inserted"]
+    if not result["failed"]:
+        scraper.confirm_saved()
     
-    logger.info(f"Saved {saved_count} new jobs from RemoteOK")
+    logger.info(
+        f"Saved {saved_count} new jobs from RemoteOK "
+        f"({result['duplicates']} duplicates, {result['failed']} failed, {result['invalid']} invalid)"
+    )
     return saved_count
 
 
-async def run_all_scrapers():
-    """Run all scrapers."""
+async def run_all_scrapers(full_refresh: Optional[bool] = None, resume: Optional[bool] = None):
+    """Run all scrapers concurrently."""
     session = Session(engine)
     
     try:
@@ -59,29 +74,41 @@ async def run_all_scrapers():
         logger.info("Starting job scraping process")
         logger.info("=" * 60)
         
-        total_saved = 0
+        # One dimension cache shared by every scraper in the run
+        cache = DimensionCache()
+        cache.preload(session)
         
-        # Run RemoteOK scraper (API-based, faster and more reliable)
-        logger.info("\n[1/2] Running RemoteOK scraper...")
-        remoteok_count = await run_remoteok_scraper(session, limit=50)
-        total_saved += remoteok_count
+        # RemoteOK (API-based, faster and more reliable) plus Indeed searches.
+        # You can add more search queries for Indeed here.
+        units = [
+            ScrapeUnit("remoteok", limit=50),
+            ScrapeUnit("indeed", query="software engineer", limit=30),
+            ScrapeUnit("indeed", query="python developer", limit=20),
+            ScrapeUnit("indeed", query="frontend developer", limit=20),
+        ]
+        summary = await ScrapeOrchestrator(
+            session, units, cache=cache, full_refresh=full_refresh, resume=resume
+        ).run()
         
-        # Run Indeed scraper
-        logger.info("\n[2/2] Running Indeed scraper...")
-        indeed_count = await run_indeed_scraper(session, query="software engineer", limit=30)
-        total_saved += indeed_count
+        for result in summary["units"]:
+            logger.info(
+                f"{result['unit']}: {result['status']} - {result['fetched']} fetched, "
+                f"{result['inserted']} saved, {result['duplicates']} duplicates, "
+                f"{result['fingerprint_duplicates']} cross-source duplicates "
+                f"in {result['elapsed']}s"
+            )
         
-        # You can add more search queries for Indeed
-        logger.info("\nSearching for Python developers...")
-        python_count = await run_indeed_scraper(session, query="python developer", limit=20)
-        total_saved += python_count
-        
-        logger.info("\nSearching for Frontend developers...")
-        frontend_count = await run_indeed_scraper(session, query="frontend developer", limit=20)
-        total_saved += frontend_count
+        if summary["skipped"]:
+            logger.info(f"Skipped (already finished today): {', '.join(summary['skipped'])}")
+        if summary["resumed"]:
+            logger.info(f"Resumed after an earlier failure: {', '.join(summary['resumed'])}")
         
         logger.info("=" * 60)
-        logger.info(f"✅ Scraping complete! Total new jobs saved: {total_saved}")
+        logger.info(
+            f"✅ Scraping complete! Total new jobs saved: {summary['jobs_saved']} "
+            f"in {summary['elapsed']}s"
+        )
+        logger.info(f"Dimension cache stats: {cache.stats()}")
         logger.info("=" * 60)
         
     except Exception as e:
@@ -92,4 +119,15 @@ async def run_all_scrapers():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_all_scrapers())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--full-refresh", action="store_true", default=None,
+        help="ignore per-source high-water marks and rescan every source"
+    )
+    parser.add_argument(
+        "--no-resume", dest="resume", action="store_false", default=None,
+        help="scrape every unit, including those that already finished today"
+    )
+    args = parser.parse_args()
+    init_db()
+    asyncio.run(run_all_scrapers(full_refresh=args.full_refresh, resume=args.resume))
@@ -1,7 +1,21 @@
-"""Web scrapers for job boards."""
+"""Web scrapers for job boards.
+
+Scraper classes are imported on first access, so importing this package
+does not load Playwright; see registry.py.
+"""
 
 from .base import BaseScraper
-from .indeed import IndeedScraper
-from .remoteok import RemoteOKScraper
+from .registry import SCRAPERS
+
+__all__ = ["BaseScraper", "IndeedScraper", "RemoteOKScraper", "SCRAPERS"]
+
+_LAZY = {
+    "IndeedScraper": "indeed",
+    "RemoteOKScraper": "remoteok",
+}
+
 
-__all__ = ["BaseScraper", "IndeedScraper", "RemoteOKScraper"]
+def __getattr__(name: str):
+    if name in _LAZY:
+        return SCRAPERS[_LAZY[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,112 @@
+"""Append-only archive of raw scraped payloads, for offline replay."""
+
+import gzip
+import json
+import logging
+import os
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class PayloadArchive:
+    """Raw payloads written to gzip-compressed JSON-lines segment files.
+
+    Files are partitioned by source and day:
+    {root}/{source}/{YYYY-MM-DD}/{HHMMSS}-{pid}-{writer}.jsonl.gz, where
+    writer is random per archive. Every archive starts its own segment,
+    so concurrent workers, and concurrent runs within one worker, never
+    share a file, and segments are only ever appended to. Each line is one
+    record: source, query, url, fetched_at, position in the response,
+    and the raw payload (a RemoteOK listing object or an Indeed card's
+    HTML).
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or get_settings().archive_dir)
+        self._segments: Dict[str, IO[bytes]] = {}
+        self._segment_days: Dict[str, date] = {}
+        self._writer = uuid.uuid4().hex[:8]
+        self.records_written = 0
+
+    def write(
+        self,
+        source: str,
+        payload: Any,
+        query: Optional[str] = None,
+        url: Optional[str] = None,
+        index: Optional[int] = None,
+    ) -> None:
+        """Append one raw payload to today's segment for source."""
+        now = datetime.utcnow()
+        record = {
+            "source": source,
+            "query": query,
+            "url": url,
+            "index": index,
+            "fetched_at": now.isoformat(),
+            "payload": payload,
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        self._segment(source, now).write(line.encode("utf-8"))
+        self.records_written += 1
+
+    def close(self) -> None:
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+        self._segment_days.clear()
+
+    def _segment(self, source: str, now: datetime) -> IO[bytes]:
+        """Open segment for source, starting a new one when the day changes."""
+        segment = self._segments.get(source)
+        if segment is not None and self._segment_days[source] == now.date():
+            return segment
+        if segment is not None:
+            segment.close()
+
+        directory = self.root / source / now.date().isoformat()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{now:%H%M%S}-{os.getpid()}-{self._writer}.jsonl.gz"
+        # Append mode adds a new gzip member, which readers see as one stream
+        segment = gzip.open(path, "ab")
+        self._segments[source] = segment
+        self._segment_days[source] = now.date()
+        logger.info(f"Archiving {source} payloads to {path}")
+        return segment
+
+
+def iter_archive(
+    source: str,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    root: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield archived records of source in time order, optionally limited
+    to days between since and until (inclusive)."""
+    source_dir = Path(root or get_settings().archive_dir) / source
+    if not source_dir.is_dir():
+        return
+
+    for day_dir in sorted(source_dir.iterdir()):
+        try:
+            day = date.fromisoformat(day_dir.name)
+        except ValueError:
+            continue
+        if (since and day < since) or (until and day > until):
+            continue
+
+        for path in sorted(day_dir.glob("*.jsonl.gz")):
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as segment:
+                    for line in segment:
+                        if line.strip():
+                            yield json.loads(line)
+            except (EOFError, OSError, ValueError) as e:
+                # A segment cut short by a crashed writer still replays up to the break
+                logger.warning(f"Stopped reading damaged segment {path}: {str(e)}")
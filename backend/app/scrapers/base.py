@@ -1,15 +1,25 @@
 """Base scraper class."""
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Hashable, Set
 from datetime import datetime
 import logging
-from sqlmodel import Session
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select, func
 
 from app.models import (
     JobPosting, Company, Location, Skill, JobSkillLink,
     EmploymentType, SeniorityLevel, RemoteType, SkillCategory
 )
+from app.counters import JobKeys, apply_deltas, job_deltas, load_job_keys, record_jobs
+from .archive import PayloadArchive
+from .cache import DimensionCache, company_key, location_key, skill_key
+from .classifiers import classify_employment_type, classify_remote_type, classify_seniority
+from .enrich import enrich_jobs_async
+from .fingerprint import job_fingerprint
+from .ratelimit import RateLimiter
+from .skills import skill_matcher
+from .watermark import HighWaterMark
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,203 +28,169 @@ logger = logging.getLogger(__name__)
 class BaseScraper(ABC):
     """Base class for all job board scrapers."""
     
-    def __init__(self, session: Session):
+    # Browser-based scrapers accept a shared browser_pool
+    uses_browser = False
+    # Stored on the source's SourceConfig row: api or html_scraper
+    source_type = "unknown"
+    
+    def __init__(self, session: Session, cache: Optional[DimensionCache] = None):
         self.session = session
+        self.cache = cache
         self.source_name = "unknown"
+        # One entry per page or API response fetched: bytes, timings, etc.
+        self.fetch_metrics: List[Dict[str, Any]] = []
+        # Incremental scraping: the mark stored by the last run and ids already
+        # ingested near it (both empty for a full refresh), and the newest
+        # posting this scrape has seen, which becomes the next mark
+        self.high_water = HighWaterMark()
+        self.known_ids: Set[str] = set()
+        self.newest_seen = HighWaterMark()
+        # HTTP validators stored for the source's feed; scrapers that fetch
+        # conditionally send them and replace them in confirm_saved
+        self.validators: Dict[str, str] = {}
+        # Per-source request budget shared with other scrapers; None means unlimited
+        self.rate_limiter: Optional[RateLimiter] = None
+        # Where raw payloads are archived for replay; None disables archiving
+        self.archive: Optional[PayloadArchive] = None
+        # Ids of dimension rows created in the open transaction; they are
+        # only published to the shared cache once the transaction commits
+        self._pending_cache: List[Tuple[str, Hashable, int]] = []
         
     @abstractmethod
     async def scrape(self, search_query: str = "software engineer", limit: int = 50) -> List[Dict[str, Any]]:
         """Scrape job postings from the source."""
         pass
     
-    def parse_employment_type(self, text: str) -> Optional[EmploymentType]:
+    def confirm_saved(self) -> None:
+        """Called once every job of the last scrape has been saved; scrapers
+        that carry fetch state between runs (HTTP validators) commit it here,
+        so a failed save is fetched again on the next run."""
+        pass
+    
+    async def throttle(self) -> float:
+        """Wait for this source's rate limit; call before every request.
+        Returns the seconds spent waiting."""
+        if self.rate_limiter is None:
+            return 0.0
+        return await self.rate_limiter.acquire(self.source_name)
+    
+    def archive_payload(self, payload: Any, query: Optional[str] = None, url: Optional[str] = None, index: Optional[int] = None) -> None:
+        """Keep a raw payload so it can be re-parsed later without scraping."""
+        if self.archive is None:
+            return
+        try:
+            self.archive.write(self.source_name, payload, query=query, url=url, index=index)
+        except Exception as e:
+            logger.warning(f"Could not archive {self.source_name} payload: {str(e)}")
+    
+    @classmethod
+    def enrich(cls, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Derive classification, salary and skill fields from a raw job dict.
+        
+        Scrapers return raw dicts from parsing and do the CPU-heavy work
+        here, so it can run in worker processes (see enrich.py). Must be a
+        pure function of raw: it runs wherever the enrichment stage puts it.
+        """
+        return dict(raw)
+    
+    async def enrich_jobs(self, raw_jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Enrich raw jobs, across worker processes for large batches."""
+        return await enrich_jobs_async(type(self), raw_jobs)
+    
+    @staticmethod
+    def parse_employment_type(text: str) -> Optional[EmploymentType]:
         """Parse employment type from text."""
-        text_lower = text.lower()
-        if "full" in text_lower and "time" in text_lower:
-            return EmploymentType.FULL_TIME
-        elif "part" in text_lower and "time" in text_lower:
-            return EmploymentType.PART_TIME
-        elif "contract" in text_lower:
-            return EmploymentType.CONTRACT
-        elif "freelance" in text_lower:
-            return EmploymentType.FREELANCE
-        elif "intern" in text_lower:
-            return EmploymentType.INTERNSHIP
-        return EmploymentType.FULL_TIME
+        return classify_employment_type(text)
     
-    def parse_seniority(self, title: str, description: str = "") -> Optional[SeniorityLevel]:
+    @staticmethod
+    def parse_seniority(title: str, description: str = "") -> Optional[SeniorityLevel]:
         """Parse seniority level from job title and description."""
-        text = (title + " " + description).lower()
-        
-        if any(word in text for word in ["cto", "ceo", "cfo", "chief"]):
-            return SeniorityLevel.C_LEVEL
-        elif any(word in text for word in ["vp", "vice president"]):
-            return SeniorityLevel.VP
-        elif "director" in text:
-            return SeniorityLevel.DIRECTOR
-        elif "manager" in text or "lead" in text:
-            return SeniorityLevel.MANAGER
-        elif "principal" in text or "staff" in text:
-            return SeniorityLevel.PRINCIPAL
-        elif "senior" in text or "sr" in text:
-            return SeniorityLevel.SENIOR
-        elif "junior" in text or "jr" in text or "entry" in text:
-            return SeniorityLevel.JUNIOR
-        else:
-            return SeniorityLevel.MID
+        return classify_seniority(title, description)
     
-    def parse_remote_type(self, text: str) -> Optional[RemoteType]:
+    @staticmethod
+    def parse_remote_type(text: str) -> Optional[RemoteType]:
         """Parse remote work type from text."""
-        text_lower = text.lower()
-        if "remote" in text_lower and "hybrid" not in text_lower:
-            return RemoteType.REMOTE
-        elif "hybrid" in text_lower:
-            return RemoteType.HYBRID
-        else:
-            return RemoteType.ONSITE
+        return classify_remote_type(text)
     
-    def extract_skills(self, title: str, description: str) -> List[str]:
+    @staticmethod
+    def extract_skills(title: str, description: str) -> List[str]:
         """Extract skills from job title and description."""
-        # Common tech skills to look for
-        skill_patterns = {
-            # Languages
-            "python": SkillCategory.LANGUAGE,
-            "javascript": SkillCategory.LANGUAGE,
-            "typescript": SkillCategory.LANGUAGE,
-            "java": SkillCategory.LANGUAGE,
-            "c++": SkillCategory.LANGUAGE,
-            "c#": SkillCategory.LANGUAGE,
-            "go": SkillCategory.LANGUAGE,
-            "golang": SkillCategory.LANGUAGE,
-            "rust": SkillCategory.LANGUAGE,
-            "php": SkillCategory.LANGUAGE,
-            "ruby": SkillCategory.LANGUAGE,
-            "swift": SkillCategory.LANGUAGE,
-            "kotlin": SkillCategory.LANGUAGE,
-            "scala": SkillCategory.LANGUAGE,
-            "r": SkillCategory.LANGUAGE,
-            
-            # Frameworks
-            "react": SkillCategory.FRAMEWORK,
-            "reactjs": SkillCategory.FRAMEWORK,
-            "vue": SkillCategory.FRAMEWORK,
-            "vuejs": SkillCategory.FRAMEWORK,
-            "angular": SkillCategory.FRAMEWORK,
-            "node.js": SkillCategory.FRAMEWORK,
-            "nodejs": SkillCategory.FRAMEWORK,
-            "express": SkillCategory.FRAMEWORK,
-            "django": SkillCategory.FRAMEWORK,
-            "flask": SkillCategory.FRAMEWORK,
-            "fastapi": SkillCategory.FRAMEWORK,
-            "spring": SkillCategory.FRAMEWORK,
-            "spring boot": SkillCategory.FRAMEWORK,
-            ".net": SkillCategory.FRAMEWORK,
-            "asp.net": SkillCategory.FRAMEWORK,
-            "laravel": SkillCategory.FRAMEWORK,
-            "rails": SkillCategory.FRAMEWORK,
-            "next.js": SkillCategory.FRAMEWORK,
-            "nextjs": SkillCategory.FRAMEWORK,
-            
-            # Cloud
-            "aws": SkillCategory.CLOUD,
-            "azure": SkillCategory.CLOUD,
-            "gcp": SkillCategory.CLOUD,
-            "google cloud": SkillCategory.CLOUD,
-            "kubernetes": SkillCategory.CLOUD,
-            "k8s": SkillCategory.CLOUD,
-            "docker": SkillCategory.TOOL,
-            "terraform": SkillCategory.CLOUD,
-            
-            # Databases
-            "postgresql": SkillCategory.DATABASE,
-            "postgres": SkillCategory.DATABASE,
-            "mysql": SkillCategory.DATABASE,
-            "mongodb": SkillCategory.DATABASE,
-            "redis": SkillCategory.DATABASE,
-            "elasticsearch": SkillCategory.DATABASE,
-            "dynamodb": SkillCategory.DATABASE,
-            "oracle": SkillCategory.DATABASE,
-            "sql server": SkillCategory.DATABASE,
-            "cassandra": SkillCategory.DATABASE,
-            
-            # Tools
-            "git": SkillCategory.TOOL,
-            "github": SkillCategory.TOOL,
-            "gitlab": SkillCategory.TOOL,
-            "jenkins": SkillCategory.TOOL,
-            "ci/cd": SkillCategory.TOOL,
-            "jira": SkillCategory.TOOL,
-            "linux": SkillCategory.TOOL,
-            "unix": SkillCategory.TOOL,
-            "bash": SkillCategory.TOOL,
-        }
-        
-        text = (title + " " + description).lower()
-        found_skills = []
-        
-        for skill, category in skill_patterns.items():
-            # Use word boundary matching for short skills (<=3 chars)
-            if len(skill) <= 3:
-                import re
-                # Match whole word only (with word boundaries)
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                if re.search(pattern, text):
-                    skill_name = skill.upper()
-                    if skill_name not in found_skills:
-                        found_skills.append(skill_name)
-            else:
-                if skill.lower() in text:
-                    # Normalize skill name
-                    skill_name = skill.title() if len(skill) > 3 else skill.upper()
-                    if skill_name not in found_skills:
-                        found_skills.append(skill_name)
-        
-        return found_skills
+        return skill_matcher.find(title + " " + description)
     
     def get_or_create_company(self, name: str, **kwargs) -> Company:
         """Get or create a company."""
+        # Check the run cache first
+        if self.cache:
+            company_id = self.cache.get("company", company_key(name))
+            if company_id is not None:
+                return self.session.get(Company, company_id)
+        
         # Check if company exists
         company = self.session.query(Company).filter(Company.name == name).first()
         if company:
+            self._remember("company", {company_key(name): company.id}, committed=True)
             return company
         
         # Create new company
         company = Company(name=name, **kwargs)
         self.session.add(company)
         self.session.flush()
+        self._remember("company", {company_key(name): company.id}, committed=False)
         return company
     
     def get_or_create_location(self, city: str, country: str, **kwargs) -> Location:
         """Get or create a location."""
+        # Check the run cache first
+        if self.cache:
+            location_id = self.cache.get("location", location_key(city, country))
+            if location_id is not None:
+                return self.session.get(Location, location_id)
+        
         # Check if location exists
         location = self.session.query(Location).filter(
             Location.city == city,
             Location.country == country
         ).first()
         if location:
+            self._remember("location", {location_key(city, country): location.id}, committed=True)
             return location
         
         # Create new location
         location = Location(city=city, country=country, **kwargs)
         self.session.add(location)
         self.session.flush()
+        self._remember("location", {location_key(city, country): location.id}, committed=False)
         return location
     
     def get_or_create_skill(self, name: str, category: SkillCategory = SkillCategory.OTHER) -> Skill:
         """Get or create a skill."""
+        # Check the run cache first
+        if self.cache:
+            skill_id = self.cache.get("skill", skill_key(name))
+            if skill_id is not None:
+                return self.session.get(Skill, skill_id)
+        
         # Check if skill exists
         skill = self.session.query(Skill).filter(Skill.name == name).first()
         if skill:
+            self._remember("skill", {skill_key(name): skill.id}, committed=True)
             return skill
         
         # Create new skill
         skill = Skill(name=name, category=category)
         self.session.add(skill)
         self.session.flush()
+        self._remember("skill", {skill_key(name): skill.id}, committed=False)
         return skill
     
     def save_job(self, job_data: Dict[str, Any]) -> Optional[JobPosting]:
-        """Save a job posting to database."""
+        """Save a job posting to database. Returns the new posting, the
+        already stored posting it duplicates, or None on failure."""
+        return self.save_job_status(job_data)[0]
+    
+    def save_job_status(self, job_data: Dict[str, Any]) -> Tuple[Optional[JobPosting], str]:
+        """save_job, also returning which save_jobs counter the job belongs
+        to: "inserted", "duplicates", "fingerprint_duplicates" or "failed"."""
         try:
             # Check if job already exists
             existing_job = self.session.query(JobPosting).filter(
@@ -224,19 +200,30 @@ class BaseScraper(ABC):
             
             if existing_job:
                 logger.info(f"Job already exists: {job_data.get('title')}")
-                return existing_job
+                return existing_job, "duplicates"
             
-            # Get or create company
-            company = self.get_or_create_company(
-                name=job_data["company_name"],
-                industry=job_data.get("industry")
-            )
+            # Same role already ingested from another source or under another id
+            fingerprint = self.fingerprint(job_data)
+            same_job = self.session.exec(
+                select(JobPosting).where(
+                    JobPosting.fingerprint == fingerprint,
+                    JobPosting.is_active == True
+                )
+            ).first()
             
-            # Get or create location
-            location = self.get_or_create_location(
-                city=job_data["location_city"],
-                country=job_data.get("location_country", "USA")
-            )
+            if same_job:
+                logger.info(f"Job already ingested from {same_job.source}: {job_data.get('title')}")
+                return same_job, "fingerprint_duplicates"
+            
+            # Resolve company, location and skills through the run cache
+            company_id = self._resolve_company_ids(
+                {job_data["company_name"]: job_data.get("industry")}
+            )[job_data["company_name"]]
+            
+            location = (job_data["location_city"], job_data.get("location_country", "USA"))
+            location_id = self._resolve_location_ids({location})[location]
+            
+            skill_ids = self._resolve_skill_ids(set(job_data.get("skills", [])))
             
             # Create job posting
             job = JobPosting(
@@ -244,8 +231,8 @@ class BaseScraper(ABC):
                 source=self.source_name,
                 title=job_data["title"],
                 description=job_data.get("description"),
-                company_id=company.id,
-                location_id=location.id,
+                company_id=company_id,
+                location_id=location_id,
                 salary_min=job_data.get("salary_min"),
                 salary_max=job_data.get("salary_max"),
                 salary_currency=job_data.get("salary_currency", "USD"),
@@ -253,7 +240,9 @@ class BaseScraper(ABC):
                 employment_type=job_data.get("employment_type"),
                 seniority=job_data.get("seniority"),
                 remote_type=job_data.get("remote_type"),
+                posting_date=job_data["posted_at"].date() if job_data.get("posted_at") else None,
                 url=job_data.get("url"),
+                fingerprint=fingerprint,
                 is_active=True,
                 created_at=datetime.utcnow()
             )
@@ -262,17 +251,351 @@ class BaseScraper(ABC):
             self.session.flush()
             
             # Add skills
-            skills = job_data.get("skills", [])
-            for skill_name in skills:
-                skill = self.get_or_create_skill(skill_name)
-                link = JobSkillLink(job_id=job.id, skill_id=skill.id)
+            job_skill_ids = list(dict.fromkeys(skill_ids[name] for name in job_data.get("skills", [])))
+            for skill_id in job_skill_ids:
+                link = JobSkillLink(job_id=job.id, skill_id=skill_id)
                 self.session.add(link)
             
-            self.session.commit()
-            logger.info(f"Saved job: {job.title} at {company.name}")
-            return job
+            # Count the job in the running stats, in the same transaction
+            record_jobs(self.session, [JobKeys(company_id, location_id, job_skill_ids)])
+            
+            self._commit()
+            logger.info(f"Saved job: {job.title} at {job_data['company_name']}")
+            return job, "inserted"
             
         except Exception as e:
-            self.session.rollback()
+            self._rollback()
             logger.error(f"Error saving job: {str(e)}")
-            return None
+            return None, "failed"
+    
+    def save_jobs(self, batch: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Save a batch of job postings in one transaction.
+        
+        Existing postings are resolved with one query, companies, locations
+        and skills are resolved or created in bulk, and postings and skill
+        links are inserted in bulk. If the batch transaction fails, each job
+        is retried on its own through save_job so one bad record does not
+        drop the rest.
+        
+        Postings whose content fingerprint matches an active posting (from
+        any source) or an earlier job in the batch are skipped and counted
+        as fingerprint_duplicates; they are resolved with one indexed query.
+        
+        Records missing a title, company or city can never be saved and are
+        counted as invalid; failed only counts jobs whose save failed, which
+        a retry may fix.
+        """
+        result = {"inserted": 0, "duplicates": 0, "fingerprint_duplicates": 0, "failed": 0, "invalid": 0}
+        
+        # Drop malformed records and repeats within the batch
+        jobs = []
+        seen_ids = set()
+        for job_data in batch:
+            if not job_data.get("title") or not job_data.get("company_name") or not job_data.get("location_city"):
+                result["invalid"] += 1
+                continue
+            external_id = job_data.get("external_id")
+            if external_id is not None:
+                if external_id in seen_ids:
+                    result["duplicates"] += 1
+                    continue
+                seen_ids.add(external_id)
+            jobs.append(job_data)
+        
+        if not jobs:
+            return result
+        
+        new_jobs = jobs
+        try:
+            # Resolve already-ingested postings in one query
+            existing_ids = set()
+            if seen_ids:
+                existing_ids = set(self.session.exec(
+                    select(JobPosting.external_id).where(
+                        JobPosting.source == self.source_name,
+                        JobPosting.external_id.in_(list(seen_ids))
+                    )
+                ).all())
+            
+            new_jobs = [job for job in jobs if job.get("external_id") not in existing_ids]
+            result["duplicates"] += len(jobs) - len(new_jobs)
+            if not new_jobs:
+                return result
+            
+            # Resolve the same postings from other sources, or reposted under
+            # a new external_id, in one indexed query
+            fingerprints = {id(job): self.fingerprint(job) for job in new_jobs}
+            known_fingerprints = set(self.session.exec(
+                select(JobPosting.fingerprint).where(
+                    JobPosting.fingerprint.in_(set(fingerprints.values())),
+                    JobPosting.is_active == True
+                )
+            ).all())
+            unique_jobs = []
+            for job in new_jobs:
+                if fingerprints[id(job)] in known_fingerprints:
+                    result["fingerprint_duplicates"] += 1
+                    continue
+                known_fingerprints.add(fingerprints[id(job)])
+                unique_jobs.append(job)
+            new_jobs = unique_jobs
+            if not new_jobs:
+                return result
+            
+            company_ids = self._resolve_company_ids({
+                job["company_name"]: job.get("industry") for job in new_jobs
+            })
+            location_ids = self._resolve_location_ids({
+                (job["location_city"], job.get("location_country", "USA")) for job in new_jobs
+            })
+            skill_ids = self._resolve_skill_ids({
+                skill_name for job in new_jobs for skill_name in job.get("skills", [])
+            })
+            
+            # Bulk insert postings
+            now = datetime.utcnow()
+            postings = [
+                JobPosting(
+                    external_id=job_data.get("external_id"),
+                    source=self.source_name,
+                    title=job_data["title"],
+                    description=job_data.get("description"),
+                    company_id=company_ids[job_data["company_name"]],
+                    location_id=location_ids[(job_data["location_city"], job_data.get("location_country", "USA"))],
+                    salary_min=job_data.get("salary_min"),
+                    salary_max=job_data.get("salary_max"),
+                    salary_currency=job_data.get("salary_currency", "USD"),
+                    salary_period=job_data.get("salary_period", "year"),
+                    employment_type=job_data.get("employment_type"),
+                    seniority=job_data.get("seniority"),
+                    remote_type=job_data.get("remote_type"),
+                    posting_date=job_data["posted_at"].date() if job_data.get("posted_at") else None,
+                    url=job_data.get("url"),
+                    fingerprint=fingerprints[id(job_data)],
+                    is_active=True,
+                    created_at=now
+                )
+                for job_data in new_jobs
+            ]
+            self.session.add_all(postings)
+            self.session.flush()
+            
+            # Bulk insert skill links
+            links = []
+            keys = []
+            for job, job_data in zip(postings, new_jobs):
+                job_skill_ids = list(dict.fromkeys(skill_ids[name] for name in job_data.get("skills", [])))
+                links.extend({"job_id": job.id, "skill_id": skill_id} for skill_id in job_skill_ids)
+                keys.append(JobKeys(job.company_id, job.location_id, job_skill_ids))
+            if links:
+                self.session.execute(insert(JobSkillLink), links)
+            
+            # Count the batch in the running stats, in the same transaction
+            record_jobs(self.session, keys)
+            
+            self._commit()
+            result["inserted"] += len(postings)
+            logger.info(f"Saved batch of {len(postings)} jobs from {self.source_name}")
+            
+        except Exception as e:
+            self._rollback()
+            logger.error(f"Error saving batch, retrying jobs one by one: {str(e)}")
+            for job_data in new_jobs:
+                result[self.save_job_status(job_data)[1]] += 1
+        
+        return result
+    
+    def refresh_jobs(self, batch: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Re-apply parsed fields to postings that already exist.
+        
+        Used when replaying archived payloads after a parser change: the
+        salary, classification fields and skill links of each posting with
+        a matching (source, external_id) are replaced in one transaction,
+        which also moves active postings' running stats counters from
+        their old skill links to the new ones. Jobs with no stored posting
+        are counted as missing.
+        """
+        result = {"updated": 0, "missing": 0}
+        by_id = {job["external_id"]: job for job in batch if job.get("external_id")}
+        if not by_id:
+            return result
+        
+        try:
+            postings = self.session.exec(
+                select(JobPosting).where(
+                    JobPosting.source == self.source_name,
+                    JobPosting.external_id.in_(list(by_id))
+                )
+            ).all()
+            skill_ids = self._resolve_skill_ids({
+                skill_name for job in by_id.values() for skill_name in job.get("skills", [])
+            })
+            
+            # Skill links the running stats currently count for active postings
+            previous = load_job_keys(self.session, [posting.id for posting in postings if posting.is_active])
+            
+            now = datetime.utcnow()
+            links = []
+            deltas = job_deltas(previous.values(), -1)
+            for posting in postings:
+                job_data = by_id[posting.external_id]
+                posting.salary_min = job_data.get("salary_min")
+                posting.salary_max = job_data.get("salary_max")
+                posting.employment_type = job_data.get("employment_type")
+                posting.seniority = job_data.get("seniority")
+                posting.remote_type = job_data.get("remote_type")
+                posting.updated_at = now
+                job_skill_ids = list(dict.fromkeys(skill_ids[name] for name in job_data.get("skills", [])))
+                links.extend({"job_id": posting.id, "skill_id": skill_id} for skill_id in job_skill_ids)
+                if posting.id in previous:
+                    job_deltas([JobKeys(posting.company_id, posting.location_id, job_skill_ids)], 1, deltas)
+            
+            if postings:
+                self.session.execute(
+                    delete(JobSkillLink).where(JobSkillLink.job_id.in_([posting.id for posting in postings]))
+                )
+            if links:
+                self.session.execute(insert(JobSkillLink), links)
+            apply_deltas(self.session, deltas)
+            self._commit()
+            
+        except Exception:
+            self._rollback()
+            raise
+        
+        result["updated"] = len(postings)
+        result["missing"] = len(by_id) - len(postings)
+        return result
+    
+    def parse_archived(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build a raw job dict from an archived raw payload (see archive.py);
+        pass it through enrich() before saving."""
+        raise NotImplementedError(f"{type(self).__name__} cannot replay archived payloads")
+    
+    @staticmethod
+    def fingerprint(job_data: Dict[str, Any]) -> str:
+        """Content fingerprint of a scraped job dict."""
+        return job_fingerprint(job_data["title"], job_data["company_name"], job_data["location_city"])
+    
+    def _commit(self) -> None:
+        """Commit and publish ids of newly created dimension rows to the cache."""
+        self.session.commit()
+        if self.cache:
+            for kind, key, entity_id in self._pending_cache:
+                self.cache.put(kind, key, entity_id)
+        self._pending_cache.clear()
+    
+    def _rollback(self) -> None:
+        """Roll back and forget ids of dimension rows that no longer exist."""
+        self.session.rollback()
+        self._pending_cache.clear()
+    
+    def _remember(self, kind: str, ids: Dict[Hashable, int], committed: bool) -> None:
+        """Record resolved ids in the cache, deferring uncommitted rows."""
+        if not self.cache:
+            return
+        for key, entity_id in ids.items():
+            if committed:
+                self.cache.put(kind, key, entity_id)
+            else:
+                self._pending_cache.append((kind, key, entity_id))
+    
+    def _cached_ids(self, kind: str, keys: Dict[Any, Hashable]) -> Tuple[Dict[Any, int], Dict[Any, Hashable]]:
+        """Split items into cached ids and cache misses."""
+        ids, missing = {}, {}
+        for item, key in keys.items():
+            entity_id = self.cache.get(kind, key) if self.cache else None
+            if entity_id is None:
+                missing[item] = key
+            else:
+                ids[item] = entity_id
+        return ids, missing
+    
+    def _resolve_company_ids(self, companies: Dict[str, Optional[str]]) -> Dict[str, int]:
+        """Map company names to ids, creating missing companies in bulk."""
+        ids, missing = self._cached_ids("company", {name: company_key(name) for name in companies})
+        if not missing:
+            return ids
+        
+        rows = self.session.exec(
+            select(Company.name, Company.id).where(
+                func.lower(func.trim(Company.name)).in_(list(set(missing.values())))
+            ).order_by(Company.id)
+        ).all()
+        found: Dict[Hashable, int] = {}
+        for name, company_id in rows:
+            found.setdefault(company_key(name), company_id)
+        
+        created: Dict[Hashable, Company] = {}
+        for name, key in missing.items():
+            if key not in found and key not in created:
+                created[key] = Company(name=name, industry=companies[name])
+        if created:
+            self.session.add_all(list(created.values()))
+            self.session.flush()
+        
+        self._remember("company", found, committed=True)
+        self._remember("company", {key: company.id for key, company in created.items()}, committed=False)
+        for name, key in missing.items():
+            ids[name] = found[key] if key in found else created[key].id
+        return ids
+    
+    def _resolve_location_ids(self, locations: set) -> Dict[Tuple[str, str], int]:
+        """Map (city, country) pairs to ids, creating missing locations in bulk."""
+        ids, missing = self._cached_ids(
+            "location", {(city, country): location_key(city, country) for city, country in locations}
+        )
+        if not missing:
+            return ids
+        
+        rows = self.session.exec(
+            select(Location.city, Location.country, Location.id).where(
+                func.lower(func.trim(Location.city)).in_(list({city for city, _ in missing.values()}))
+            ).order_by(Location.id)
+        ).all()
+        found: Dict[Hashable, int] = {}
+        for city, country, location_id in rows:
+            found.setdefault(location_key(city, country), location_id)
+        
+        created: Dict[Hashable, Location] = {}
+        for (city, country), key in missing.items():
+            if key not in found and key not in created:
+                created[key] = Location(city=city, country=country)
+        if created:
+            self.session.add_all(list(created.values()))
+            self.session.flush()
+        
+        self._remember("location", found, committed=True)
+        self._remember("location", {key: location.id for key, location in created.items()}, committed=False)
+        for location, key in missing.items():
+            ids[location] = found[key] if key in found else created[key].id
+        return ids
+    
+    def _resolve_skill_ids(self, names: set) -> Dict[str, int]:
+        """Map skill names to ids, creating missing skills in bulk."""
+        ids, missing = self._cached_ids("skill", {name: skill_key(name) for name in names})
+        if not missing:
+            return ids
+        
+        rows = self.session.exec(
+            select(Skill.name, Skill.id).where(
+                func.lower(func.trim(Skill.name)).in_(list(set(missing.values())))
+            ).order_by(Skill.id)
+        ).all()
+        found: Dict[Hashable, int] = {}
+        for name, skill_id in rows:
+            found.setdefault(skill_key(name), skill_id)
+        
+        created: Dict[Hashable, Skill] = {}
+        for name, key in missing.items():
+            if key not in found and key not in created:
+                created[key] = Skill(name=name)
+        if created:
+            self.session.add_all(list(created.values()))
+            self.session.flush()
+        
+        self._remember("skill", found, committed=True)
+        self._remember("skill", {key: skill.id for key, skill in created.items()}, committed=False)
+        for name, key in missing.items():
+            ids[name] = found[key] if key in found else created[key].id
+        return ids
@@ -0,0 +1,285 @@
+"""Shared Playwright browser pool for browser-based scrapers."""
+
+import asyncio
+import logging
+import os
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import Browser, Page, Playwright, Request, Route, async_playwright
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+def browser_memory_mb() -> Optional[float]:
+    """Resident memory of the Playwright drivers started by this process
+    and the browsers under them, or None when psutil is not installed.
+    Other children, such as the enrich pool's workers, are not counted."""
+    if psutil is None:
+        return None
+    total = 0
+    for child in psutil.Process(os.getpid()).children():
+        try:
+            if not _is_playwright_driver(child):
+                continue
+            processes = [child] + child.children(recursive=True)
+        except psutil.Error:
+            continue
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+    return total / (1024 * 1024)
+
+
+def _is_playwright_driver(process: "psutil.Process") -> bool:
+    # The driver is Playwright's bundled node running its package's cli.js
+    return any("playwright" in part for part in process.cmdline())
+
+
+class ResourcePolicy:
+    """Which requests a scraping page is allowed to make.
+
+    Requests whose Playwright resource type is in blocked_types are
+    aborted, and so is every request to a host outside allowed_domains
+    (and their subdomains) when block_third_party is set. The page
+    document itself is never blocked.
+    """
+
+    def __init__(
+        self,
+        allowed_domains: Iterable[str] = (),
+        blocked_types: Optional[Iterable[str]] = None,
+        block_third_party: Optional[bool] = None,
+    ):
+        settings = get_settings()
+        if blocked_types is None:
+            blocked_types = [t.strip() for t in settings.browser_blocked_resource_types.split(",") if t.strip()]
+        self.allowed_domains = [domain.lower() for domain in allowed_domains]
+        self.blocked_types = set(blocked_types)
+        self.block_third_party = (
+            settings.browser_block_third_party if block_third_party is None else block_third_party
+        )
+
+    def allows(self, resource_type: str, url: str) -> bool:
+        if resource_type == "document":
+            return True
+        if resource_type in self.blocked_types:
+            return False
+        if self.block_third_party and self.allowed_domains:
+            host = (urlparse(url).hostname or "").lower()
+            return any(host == domain or host.endswith("." + domain) for domain in self.allowed_domains)
+        return True
+
+
+class PageMetrics:
+    """Requests, blocked requests, bytes transferred and time-to-content of
+    one page, with the resource policy applied through request interception."""
+
+    def __init__(self, policy: ResourcePolicy):
+        self.policy = policy
+        self.requests = 0
+        self.blocked = 0
+        self.bytes = 0
+        self._started = time.monotonic()
+        self._ready: Optional[float] = None
+        self._sizes: List[asyncio.Future] = []
+
+    async def attach(self, page: Page) -> None:
+        """Intercept the page's requests; call before navigating."""
+        self._started = time.monotonic()
+        await page.route("**/*", self._route)
+        page.on("requestfinished", self._on_request_finished)
+
+    def mark_ready(self) -> None:
+        """Record that the content the scraper waits for has appeared."""
+        self._ready = time.monotonic()
+
+    async def summary(self) -> Dict[str, Any]:
+        await asyncio.gather(*self._sizes)
+        return {
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "bytes": self.bytes,
+            "time_to_content": round(self._ready - self._started, 3) if self._ready else None,
+        }
+
+    async def _route(self, route: Route) -> None:
+        request = route.request
+        if self.policy.allows(request.resource_type, request.url):
+            self.requests += 1
+            await route.continue_()
+        else:
+            self.blocked += 1
+            await route.abort()
+
+    def _on_request_finished(self, request: Request) -> None:
+        self._sizes.append(asyncio.ensure_future(self._add_size(request)))
+
+    async def _add_size(self, request: Request) -> None:
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            # Page or context already closed
+            return
+        self.bytes += sizes["responseHeadersSize"] + sizes["responseBodySize"]
+
+
+class BrowserPool:
+    """One long-lived Chromium handing out isolated contexts and pages.
+
+    Every page gets its own browser context, so cookies and storage never
+    leak between queries. At most max_pages pages are open at once. The
+    browser is replaced after recycle_after_pages pages, or once the
+    browser processes use more than max_memory_mb. The old browser is
+    closed when its last open page is released.
+    """
+
+    def __init__(
+        self,
+        max_pages: Optional[int] = None,
+        recycle_after_pages: Optional[int] = None,
+        max_memory_mb: Optional[int] = None,
+        headless: bool = True,
+    ):
+        settings = get_settings()
+        self.max_pages = max_pages or settings.browser_max_pages
+        self.recycle_after_pages = recycle_after_pages or settings.browser_recycle_pages
+        self.max_memory_mb = max_memory_mb or settings.browser_max_memory_mb
+        self.headless = headless
+
+        self._semaphore = asyncio.Semaphore(self.max_pages)
+        self._lock = asyncio.Lock()
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._browser_pages = 0
+        self._open_pages: Dict[Browser, int] = {}
+        self._retired: set = set()
+
+        self.pages_served = 0
+        self.browsers_launched = 0
+
+    async def __aenter__(self) -> "BrowserPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Open a page in a fresh context; both are closed on exit."""
+        async with self._semaphore:
+            browser = await self._acquire_browser()
+            try:
+                context = await browser.new_context(user_agent=USER_AGENT)
+                try:
+                    yield await context.new_page()
+                finally:
+                    await context.close()
+            finally:
+                await self._release_browser(browser)
+
+    async def close(self) -> None:
+        """Close every browser and stop Playwright."""
+        async with self._lock:
+            for browser in list(self._open_pages):
+                await browser.close()
+            self._open_pages.clear()
+            self._retired.clear()
+            self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pages_served": self.pages_served,
+            "browsers_launched": self.browsers_launched,
+            "memory_mb": browser_memory_mb(),
+        }
+
+    async def _acquire_browser(self) -> Browser:
+        async with self._lock:
+            if self._browser is not None and self._needs_recycle():
+                logger.info(f"Recycling browser after {self._browser_pages} pages")
+                await self._retire(self._browser)
+                self._browser = None
+
+            if self._browser is None:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                self._browser_pages = 0
+                self._open_pages[self._browser] = 0
+                self.browsers_launched += 1
+
+            self._browser_pages += 1
+            self._open_pages[self._browser] += 1
+            self.pages_served += 1
+            return self._browser
+
+    async def _release_browser(self, browser: Browser) -> None:
+        async with self._lock:
+            if browser not in self._open_pages:
+                # Pool was closed while the page was open
+                return
+            self._open_pages[browser] -= 1
+            if browser in self._retired and self._open_pages[browser] == 0:
+                await self._close_browser(browser)
+
+    def _needs_recycle(self) -> bool:
+        if self._browser_pages >= self.recycle_after_pages:
+            return True
+        memory = browser_memory_mb()
+        return memory is not None and memory > self.max_memory_mb
+
+    async def _retire(self, browser: Browser) -> None:
+        """Close the browser now, or once its last open page is released."""
+        if self._open_pages.get(browser) == 0:
+            await self._close_browser(browser)
+        else:
+            self._retired.add(browser)
+
+    async def _close_browser(self, browser: Browser) -> None:
+        self._retired.discard(browser)
+        self._open_pages.pop(browser, None)
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing retired browser: {str(e)}")
+
+
+# One pool per event loop, like the HTTP client: Playwright objects cannot
+# outlive the loop they were started on. A Celery worker runs all its
+# scrape tasks on one loop (see app/tasks.py), so they share one browser.
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BrowserPool]" = weakref.WeakKeyDictionary()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the shared pool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = BrowserPool()
+    return pool
+
+
+async def close_browser_pool() -> None:
+    """Close the shared pool of the running event loop, if any."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        logger.info(f"Browser pool stats: {pool.stats()}")
+        await pool.close()
@@ -0,0 +1,96 @@
+"""Run-scoped cache of company, location and skill ids."""
+
+import logging
+import threading
+from typing import Dict, Hashable, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from app.models import Company, Location, Skill
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_name(value: str) -> str:
+    """Normalize a dimension name for cache and lookup keys."""
+    return (value or "").strip().lower()
+
+
+def company_key(name: str) -> str:
+    return normalize_name(name)
+
+
+def location_key(city: str, country: str) -> Tuple[str, str]:
+    return normalize_name(city), normalize_name(country)
+
+
+def skill_key(name: str) -> str:
+    return normalize_name(name)
+
+
+class DimensionCache:
+    """In-memory map from normalized dimension names to database ids.
+
+    One cache is created per scrape run, preloaded from the companies,
+    locations and skills tables and shared by every scraper in the run.
+    Only ids are stored, never ORM instances, so the cache is not tied to
+    a session. Scrapers only publish ids for rows that have been committed.
+    Access is guarded by a lock so scrapers on other threads can share it.
+    """
+
+    KINDS = ("company", "location", "skill")
+
+    def __init__(self):
+        self._ids: Dict[str, Dict[Hashable, int]] = {kind: {} for kind in self.KINDS}
+        self._hits: Dict[str, int] = {kind: 0 for kind in self.KINDS}
+        self._misses: Dict[str, int] = {kind: 0 for kind in self.KINDS}
+        self._lock = threading.Lock()
+
+    def preload(self, session: Session) -> None:
+        """Load every existing company, location and skill."""
+        companies = session.exec(select(Company.name, Company.id).order_by(Company.id)).all()
+        locations = session.exec(
+            select(Location.city, Location.country, Location.id).order_by(Location.id)
+        ).all()
+        skills = session.exec(select(Skill.name, Skill.id).order_by(Skill.id)).all()
+
+        with self._lock:
+            # setdefault keeps the oldest row when names collide after normalizing
+            for name, company_id in companies:
+                self._ids["company"].setdefault(company_key(name), company_id)
+            for city, country, location_id in locations:
+                self._ids["location"].setdefault(location_key(city, country), location_id)
+            for name, skill_id in skills:
+                self._ids["skill"].setdefault(skill_key(name), skill_id)
+
+        logger.info(
+            f"Preloaded dimension cache: {len(companies)} companies, "
+            f"{len(locations)} locations, {len(skills)} skills"
+        )
+
+    def get(self, kind: str, key: Hashable) -> Optional[int]:
+        """Return the cached id for key, counting the hit or miss."""
+        with self._lock:
+            entity_id = self._ids[kind].get(key)
+            if entity_id is None:
+                self._misses[kind] += 1
+            else:
+                self._hits[kind] += 1
+            return entity_id
+
+    def put(self, kind: str, key: Hashable, entity_id: int) -> None:
+        """Record the id of a committed row."""
+        with self._lock:
+            self._ids[kind].setdefault(key, entity_id)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit, miss and size counters per dimension."""
+        with self._lock:
+            return {
+                kind: {
+                    "hits": self._hits[kind],
+                    "misses": self._misses[kind],
+                    "size": len(self._ids[kind]),
+                }
+                for kind in self.KINDS
+            }
@@ -0,0 +1,54 @@
+"""Per-day checkpoints of scrape units, for resumable runs."""
+
+import logging
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from app.models import ScrapeCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+def load_checkpoints(session: Session, run_date: date) -> Dict[Tuple[str, str], ScrapeCheckpoint]:
+    """Checkpoints recorded on run_date, keyed by (source, query)."""
+    checkpoints = session.exec(
+        select(ScrapeCheckpoint).where(ScrapeCheckpoint.run_date == run_date)
+    ).all()
+    return {(checkpoint.source, checkpoint.query): checkpoint for checkpoint in checkpoints}
+
+
+def save_checkpoint(
+    session: Session,
+    run_date: date,
+    source: str,
+    query: str,
+    status: str,
+    jobs_saved: int = 0,
+    error: Optional[str] = None,
+) -> None:
+    """Record one attempt of a unit. A unit that already succeeded on
+    run_date keeps its success."""
+    checkpoint = session.exec(
+        select(ScrapeCheckpoint).where(
+            ScrapeCheckpoint.run_date == run_date,
+            ScrapeCheckpoint.source == source,
+            ScrapeCheckpoint.query == query,
+        )
+    ).first()
+    if checkpoint is None:
+        checkpoint = ScrapeCheckpoint(run_date=run_date, source=source, query=query, status=status)
+    elif checkpoint.status == "success":
+        return
+
+    now = datetime.utcnow()
+    checkpoint.status = status
+    checkpoint.attempts += 1
+    checkpoint.jobs_saved += jobs_saved
+    checkpoint.error = error
+    checkpoint.updated_at = now
+    if status == "success":
+        checkpoint.completed_at = now
+    session.add(checkpoint)
+    session.commit()
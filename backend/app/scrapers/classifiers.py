@@ -0,0 +1,107 @@
+"""Rule tables and compiled classifiers for employment type, seniority and remote type."""
+
+import re
+from typing import Iterable, List, NamedTuple, Pattern, Tuple
+
+from app.models import EmploymentType, RemoteType, SeniorityLevel
+from .skills import _bounded
+
+
+# Each table lists (label, terms) in priority order: when terms of several
+# labels occur in a text, the label listed first wins, and a text with no
+# match gets the table's default. Terms match case-insensitively and only
+# as whole words; a space in a term also matches a hyphen ("full time"
+# matches "Full-Time").
+EMPLOYMENT_TYPE_RULES: List[Tuple[EmploymentType, List[str]]] = [
+    (EmploymentType.FULL_TIME, ["full time", "fulltime"]),
+    (EmploymentType.PART_TIME, ["part time", "parttime"]),
+    (EmploymentType.CONTRACT, ["contract", "contractor", "contracts"]),
+    (EmploymentType.FREELANCE, ["freelance", "freelancer"]),
+    (EmploymentType.INTERNSHIP, ["intern", "interns", "internship", "internships"]),
+]
+
+SENIORITY_RULES: List[Tuple[SeniorityLevel, List[str]]] = [
+    (SeniorityLevel.C_LEVEL, ["cto", "ceo", "cfo", "chief"]),
+    (SeniorityLevel.VP, ["vp", "vice president"]),
+    (SeniorityLevel.DIRECTOR, ["director", "directors"]),
+    (SeniorityLevel.MANAGER, ["manager", "managers", "lead"]),
+    (SeniorityLevel.PRINCIPAL, ["principal", "staff"]),
+    (SeniorityLevel.SENIOR, ["senior", "sr"]),
+    (SeniorityLevel.JUNIOR, ["junior", "jr", "entry level"]),
+]
+
+REMOTE_TYPE_RULES: List[Tuple[RemoteType, List[str]]] = [
+    (RemoteType.HYBRID, ["hybrid"]),
+    (RemoteType.REMOTE, ["remote", "remotely", "work from home", "wfh"]),
+]
+
+
+class Classification(NamedTuple):
+    employment_type: EmploymentType
+    seniority: SeniorityLevel
+    remote_type: RemoteType
+
+
+class RuleTable:
+    """One rule table, compiled to a word-boundary regex per rule.
+
+    A regex scan of a whole description costs more than a plain substring
+    search, so each rule is first located with str.find on its anchors
+    (the distinct leading words of its terms, so "full time" and
+    "fulltime" share the anchor "full") and its compiled pattern is only
+    matched, anchored, at the positions found. Rules are tried in
+    priority order and the first label with a whole-word match wins.
+    """
+
+    def __init__(self, rules: List[Tuple[object, List[str]]], default: object):
+        self.default = default
+        self._rules: List[Tuple[object, List[str], Pattern[str]]] = []
+        for label, terms in rules:
+            variants = {variant for term in terms for variant in (term.lower(), term.lower().replace(" ", "-"))}
+            # Longest first, so the alternation prefers "contractor" to "contract"
+            pattern = re.compile("|".join(_bounded(variant) for variant in sorted(variants, key=len, reverse=True)))
+            words = {variant.split(" ")[0].split("-")[0] for variant in variants}
+            anchors = sorted(word for word in words if not any(word != other and word.startswith(other) for other in words))
+            self._rules.append((label, anchors, pattern))
+
+    def classify(self, text: str) -> object:
+        """Label of an already lowercased text."""
+        for label, anchors, pattern in self._rules:
+            for anchor in anchors:
+                position = text.find(anchor)
+                while position != -1:
+                    if pattern.match(text, position):
+                        return label
+                    position = text.find(anchor, position + 1)
+        return self.default
+
+
+employment_type_rules = RuleTable(EMPLOYMENT_TYPE_RULES, EmploymentType.FULL_TIME)
+seniority_rules = RuleTable(SENIORITY_RULES, SeniorityLevel.MID)
+remote_type_rules = RuleTable(REMOTE_TYPE_RULES, RemoteType.ONSITE)
+
+
+def classify_employment_type(text: str) -> EmploymentType:
+    return employment_type_rules.classify(text.lower())
+
+
+def classify_seniority(title: str, description: str = "") -> SeniorityLevel:
+    return seniority_rules.classify((title + " " + description).lower())
+
+
+def classify_remote_type(text: str) -> RemoteType:
+    return remote_type_rules.classify(text.lower())
+
+
+def classify_batch(jobs: Iterable[Tuple[str, str]]) -> List[Classification]:
+    """Employment type, seniority and remote type of each (title,
+    description) pair, lowercasing each posting's text once for all three."""
+    results = []
+    for title, description in jobs:
+        text = (title + " " + (description or "")).lower()
+        results.append(Classification(
+            employment_type_rules.classify(text),
+            seniority_rules.classify(text),
+            remote_type_rules.classify(text),
+        ))
+    return results
@@ -0,0 +1,133 @@
+"""CPU-bound enrichment of raw scraped jobs, optionally in worker processes."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Type
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Shared by every enrichment call in this process; see get_enrich_pool.
+# Threads of a threads-pool Celery worker share it, hence the lock.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def enrich_workers() -> int:
+    """Configured worker count; 0 means one per CPU."""
+    workers = get_settings().enrich_workers
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def _enrich_one(scraper_class: Type, raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    try:
+        return scraper_class.enrich(raw)
+    except Exception as e:
+        logger.error(f"Error enriching {scraper_class.__name__} job {raw.get('external_id')}: {str(e)}")
+        return None
+
+
+def _enrich_chunk(scraper_class: Type, chunk: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """Runs in a worker process."""
+    return [_enrich_one(scraper_class, raw) for raw in chunk]
+
+
+def get_enrich_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool with the given worker count, created on first use.
+
+    Workers are spawned rather than forked, so they never inherit the
+    event loop, threads or open database connections of the caller.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers == workers:
+            return _pool
+        previous, _pool = _pool, ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        _pool_workers = workers
+    if previous is not None:
+        previous.shutdown(wait=True)
+    return _pool
+
+
+def shutdown_enrich_pool() -> None:
+    """Shut the pool down once its queued chunks finish. A caller in another
+    thread that still holds it gets a RuntimeError on its next submit and
+    enriches serially."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _chunks(raw_jobs: List[Dict[str, Any]], chunk_size: int) -> List[List[Dict[str, Any]]]:
+    return [raw_jobs[i:i + chunk_size] for i in range(0, len(raw_jobs), chunk_size)]
+
+
+def _plan(raw_jobs: List[Dict[str, Any]], workers: Optional[int], chunk_size: Optional[int]):
+    workers = enrich_workers() if workers is None else workers
+    chunk_size = chunk_size or get_settings().enrich_chunk_size
+    # A single chunk gains nothing from a pool, so small batches stay serial
+    parallel = workers > 1 and len(raw_jobs) > chunk_size
+    return workers, chunk_size, parallel
+
+
+def _collect(results: List[List[Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    return [job for chunk in results for job in chunk if job is not None]
+
+
+def enrich_jobs(
+    scraper_class: Type,
+    raw_jobs: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Run scraper_class.enrich over raw jobs, in chunks across worker
+    processes when there are enough of them. Order is preserved and the
+    result is the same as the serial path; jobs that fail to enrich are
+    logged and dropped. Falls back to serial when no pool can be started
+    (e.g. inside a daemonic Celery prefork child) or it was shut down or
+    broken meanwhile (RuntimeError covers BrokenProcessPool).
+    """
+    workers, chunk_size, parallel = _plan(raw_jobs, workers, chunk_size)
+    if parallel:
+        try:
+            pool = get_enrich_pool(workers)
+            chunks = _chunks(raw_jobs, chunk_size)
+            return _collect(list(pool.map(_enrich_chunk, [scraper_class] * len(chunks), chunks)))
+        except (AssertionError, OSError, RuntimeError) as e:
+            logger.warning(f"Enrichment pool unavailable, enriching serially: {str(e)}")
+            shutdown_enrich_pool()
+    return _collect([_enrich_chunk(scraper_class, raw_jobs)])
+
+
+async def enrich_jobs_async(
+    scraper_class: Type,
+    raw_jobs: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """enrich_jobs for the event loop: chunks run in the process pool while
+    the loop keeps serving network I/O."""
+    workers, chunk_size, parallel = _plan(raw_jobs, workers, chunk_size)
+    if parallel:
+        try:
+            pool = get_enrich_pool(workers)
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(*[
+                loop.run_in_executor(pool, _enrich_chunk, scraper_class, chunk)
+                for chunk in _chunks(raw_jobs, chunk_size)
+            ])
+            return _collect(results)
+        except (AssertionError, OSError, RuntimeError) as e:
+            logger.warning(f"Enrichment pool unavailable, enriching serially: {str(e)}")
+            shutdown_enrich_pool()
+    return _collect([_enrich_chunk(scraper_class, raw_jobs)])
@@ -0,0 +1,27 @@
+"""Content fingerprints for spotting the same posting across sources."""
+
+import hashlib
+import re
+
+_NON_WORD = re.compile(r"[^\w+#]+")
+
+# Legal-form suffixes dropped from company names ("Acme, Inc." == "Acme")
+_COMPANY_SUFFIXES = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "gmbh", "plc"}
+
+
+def _words(value: str) -> list:
+    return _NON_WORD.sub(" ", (value or "").lower()).split()
+
+
+def job_fingerprint(title: str, company: str, city: str) -> str:
+    """Hash of the normalized title, company and city of a posting.
+
+    Case, punctuation, whitespace and company legal suffixes are ignored.
+    Only the city is used for the location, because sources name the
+    country differently ("USA" on Indeed, "Remote" on RemoteOK).
+    """
+    company_words = _words(company)
+    while len(company_words) > 1 and company_words[-1] in _COMPANY_SUFFIXES:
+        company_words.pop()
+    key = "|".join([" ".join(_words(title)), " ".join(company_words), " ".join(_words(city))])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
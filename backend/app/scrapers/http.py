@@ -0,0 +1,135 @@
+"""Shared async HTTP client for API-based scrapers."""
+
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Validators (ETag / Last-Modified) of the last successfully processed
+# response per URL, for the life of the worker process. Scrapers seed them
+# from the validators stored on source_configs, which survive restarts.
+_validators: Dict[str, Dict[str, str]] = {}
+
+
+class HTTPClient:
+    """Pooled, keep-alive async HTTP client with conditional GET support.
+
+    Connections are reused across requests and HTTP/2 is used when the
+    h2 package is installed. Pass an httpx transport (for example
+    httpx.MockTransport) to run against a local stub instead of the network.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        max_connections: int = 10,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        validators: Optional[Dict[str, Dict[str, str]]] = None,
+    ):
+        self.validators = _validators if validators is None else validators
+        self._client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE if http2 is None else http2,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers that turn a GET of an unchanged URL into a 304."""
+        validators = self.validators.get(url, {})
+        headers = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    @staticmethod
+    def response_validators(response: httpx.Response) -> Dict[str, str]:
+        """A response's ETag and Last-Modified, for remember_validators."""
+        validators = {}
+        if response.headers.get("etag"):
+            validators["etag"] = response.headers["etag"]
+        if response.headers.get("last-modified"):
+            validators["last_modified"] = response.headers["last-modified"]
+        return validators
+
+    def remember_validators(self, url: str, validators: Dict[str, str]) -> None:
+        """Send validators with the next conditional GET of url.
+
+        Callers remember validators only once the response's content has
+        been saved, so a failed run is never skipped as "unchanged" on the
+        next one.
+        """
+        if validators:
+            self.validators[url] = validators
+
+    async def get(self, url: str, conditional: bool = True, **kwargs) -> httpx.Response:
+        """GET a URL, sending stored validators when conditional is set.
+
+        A 304 response means the resource is unchanged since it was last
+        processed; the body is empty.
+        """
+        headers = self._headers(url, conditional, kwargs.pop("headers", None))
+        return await self._client.get(url, headers=headers, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, url: str, conditional: bool = True, **kwargs) -> AsyncIterator[httpx.Response]:
+        """GET a URL without reading the body up front.
+
+        Read it with response.aiter_bytes(). Leaving the block early closes
+        the response, so the rest of the body is never downloaded.
+        """
+        headers = self._headers(url, conditional, kwargs.pop("headers", None))
+        async with self._client.stream("GET", url, headers=headers, **kwargs) as response:
+            yield response
+
+    def _headers(self, url: str, conditional: bool, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+        headers = dict(headers or {})
+        if conditional:
+            headers.update(self.conditional_headers(url))
+        return headers
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# One client per event loop: an httpx client cannot outlive the loop it
+# was created on, and every asyncio.run starts a new loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HTTPClient]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> HTTPClient:
+    """Return the shared client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = HTTPClient()
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the shared client of the running event loop, if any."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -1,133 +1,267 @@
 """Indeed job scraper using Playwright."""
 
-import asyncio
 import re
-from typing import List, Dict, Any
-from playwright.async_api import async_playwright, Page
+from datetime import datetime
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, AsyncIterator, Optional
+from bs4 import BeautifulSoup
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 import logging
 
+from app.config import get_settings
 from .base import BaseScraper
+from .browser import BrowserPool, PageMetrics, ResourcePolicy
+from .watermark import HighWaterMark
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+CARD_SELECTOR = ".job_seen_beacon, .jobsearch-ResultsList > li"
+
+# Field name -> (CSS selector within the card, attribute to read or None for text)
+CARD_FIELDS = {
+    "title": ("h2.jobTitle, .jobTitle", None),
+    "company": ("[data-testid='company-name'], .companyName", None),
+    "location": ("[data-testid='text-location'], .companyLocation", None),
+    "link": ("h2.jobTitle a, .jobTitle a", "href"),
+    "salary": (".salary-snippet, [data-testid='attribute_snippet_testid']", None),
+    "metadata": (".metadata, .job-snippet", None),
+    "snippet": (".job-snippet, [data-testid='job-snippet']", None),
+}
+
+# Values Indeed accepts for its "posted within N days" filter
+FROMAGE_DAYS = [1, 3, 7, 14]
+
+# Runs in the page: reads every field of the first `limit` cards and
+# returns them as one array, instead of one IPC round trip per field.
+# With withHtml set, each card's outerHTML comes back too, for the archive
+EXTRACT_CARDS_JS = """
+(cards, [limit, fields, withHtml]) => cards.slice(0, limit).map(card => {
+    const result = withHtml ? {html: card.outerHTML} : {};
+    for (const [name, [selector, attribute]] of Object.entries(fields)) {
+        const element = card.querySelector(selector);
+        if (!element) {
+            result[name] = null;
+        } else if (attribute) {
+            result[name] = element.getAttribute(attribute);
+        } else {
+            result[name] = element.innerText;
+        }
+    }
+    return result;
+})
+"""
 
 
 class IndeedScraper(BaseScraper):
     """Scraper for Indeed.com job postings."""
     
-    def __init__(self, session):
-        super().__init__(session)
+    uses_browser = True
+    source_type = "html_scraper"
+    
+    def __init__(self, session, cache=None, browser_pool: Optional[BrowserPool] = None):
+        super().__init__(session, cache)
         self.source_name = "indeed"
         self.base_url = "https://www.indeed.com"
+        self.browser_pool = browser_pool
+        self.resource_policy = ResourcePolicy(allowed_domains=["indeed.com"])
+    
+    @asynccontextmanager
+    async def _page(self) -> AsyncIterator[Page]:
+        """Page from the shared browser pool, or from a one-off pool."""
+        if self.browser_pool is not None:
+            async with self.browser_pool.page() as page:
+                yield page
+        else:
+            async with BrowserPool(max_pages=1) as pool:
+                async with pool.page() as page:
+                    yield page
     
     async def scrape(self, search_query: str = "software engineer", limit: int = 50) -> List[Dict[str, Any]]:
-        """Scrape job postings from Indeed."""
+        """Scrape job postings from Indeed.
+        
+        Navigation failures are raised, so the unit is reported as failed
+        and retried; a page that loads without job cards is an empty result.
+        """
         jobs = []
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            )
-            page = await context.new_page()
-            
+        async with self._page() as page:
             try:
                 # Search for jobs
-                search_url = f"{self.base_url}/jobs?q={search_query.replace(' ', '+')}&l=United+States"
+                search_url = self.search_url(search_query)
+                started_at = datetime.utcnow()
                 logger.info(f"Scraping Indeed: {search_url}")
                 
+                # Skip images, fonts, styles and third-party trackers
+                metrics = PageMetrics(self.resource_policy)
+                await metrics.attach(page)
+                
+                rate_wait = await self.throttle()
                 await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-                await page.wait_for_timeout(2000)
                 
-                # Extract job cards
-                job_cards = await page.locator(".job_seen_beacon, .jobsearch-ResultsList > li").all()
-                logger.info(f"Found {len(job_cards)} job cards")
+                # Wait for the job cards instead of sleeping a fixed time
+                cards = []
+                try:
+                    await page.wait_for_selector(CARD_SELECTOR, timeout=settings.browser_content_timeout_ms)
+                    metrics.mark_ready()
+                    
+                    # Extract every card's fields in one round trip to the browser
+                    cards = await page.locator(CARD_SELECTOR).evaluate_all(
+                        EXTRACT_CARDS_JS, [limit, CARD_FIELDS, self.archive is not None]
+                    )
+                except PlaywrightTimeoutError:
+                    logger.warning(f"No job cards rendered for '{search_query}'")
+                
+                page_metrics = {
+                    "url": search_url,
+                    "cards": len(cards),
+                    "rate_wait": round(rate_wait, 3),
+                    **await metrics.summary(),
+                }
+                self.fetch_metrics.append(page_metrics)
+                logger.info(
+                    f"Extracted {len(cards)} job cards: {page_metrics['bytes']} bytes, "
+                    f"{page_metrics['blocked']} requests blocked, "
+                    f"time to cards {page_metrics['time_to_content']}s"
+                )
+                
+                # Cards carry no exact posting time, so the mark is the newest
+                # card's id and the time of this run
+                first_id = self.card_job_id(cards[0].get("link")) if cards else None
+                if first_id and (self.newest_seen.seen_at is None or started_at > self.newest_seen.seen_at):
+                    self.newest_seen = HighWaterMark(first_id, started_at)
                 
-                for i, card in enumerate(job_cards[:limit]):
+                for i, fields in enumerate(cards):
+                    # Sponsored cards are not date ordered, so known ids are
+                    # skipped rather than ending the scan
+                    if self.card_job_id(fields.get("link")) in self.known_ids:
+                        continue
+                    if "html" in fields:
+                        self.archive_payload(fields.pop("html"), query=search_query, url=search_url, index=i)
                     try:
-                        # Extract basic info
-                        title_elem = card.locator("h2.jobTitle, .jobTitle")
-                        title = await title_elem.inner_text() if await title_elem.count() > 0 else None
-                        
-                        if not title:
-                            continue
-                        
-                        company_elem = card.locator("[data-testid='company-name'], .companyName")
-                        company = await company_elem.inner_text() if await company_elem.count() > 0 else "Unknown"
-                        
-                        location_elem = card.locator("[data-testid='text-location'], .companyLocation")
-                        location = await location_elem.inner_text() if await location_elem.count() > 0 else "Remote"
-                        
-                        # Parse location
-                        city = location.split(",")[0].strip() if "," in location else location
-                        
-                        # Get job link
-                        link_elem = card.locator("h2.jobTitle a, .jobTitle a")
-                        job_link = await link_elem.get_attribute("href") if await link_elem.count() > 0 else None
-                        
-                        if job_link and not job_link.startswith("http"):
-                            job_link = self.base_url + job_link
-                        
-                        # Extract job ID from link
-                        job_id = None
-                        if job_link:
-                            match = re.search(r"jk=([a-zA-Z0-9]+)", job_link)
-                            if match:
-                                job_id = match.group(1)
-                        
-                        # Get salary if available
-                        salary_elem = card.locator(".salary-snippet, [data-testid='attribute_snippet_testid']")
-                        salary_text = await salary_elem.inner_text() if await salary_elem.count() > 0 else None
-                        
-                        salary_min, salary_max = self.parse_salary(salary_text)
-                        
-                        # Get job type
-                        job_type_elem = card.locator(".metadata, .job-snippet")
-                        job_type_text = await job_type_elem.inner_text() if await job_type_elem.count() > 0 else ""
-                        
-                        # Extract description snippet
-                        desc_elem = card.locator(".job-snippet, [data-testid='job-snippet']")
-                        description = await desc_elem.inner_text() if await desc_elem.count() > 0 else ""
-                        
-                        employment_type = self.parse_employment_type(job_type_text + " " + description)
-                        seniority = self.parse_seniority(title, description)
-                        remote_type = self.parse_remote_type(location + " " + description)
-                        
-                        # Extract skills
-                        skills = self.extract_skills(title, description)
-                        
-                        job_data = {
-                            "external_id": job_id or f"indeed_{i}",
-                            "title": title.strip(),
-                            "company_name": company.strip(),
-                            "location_city": city,
-                            "location_country": "USA",
-                            "description": description.strip(),
-                            "salary_min": salary_min,
-                            "salary_max": salary_max,
-                            "salary_currency": "USD",
-                            "salary_period": "year",
-                            "employment_type": employment_type,
-                            "seniority": seniority,
-                            "remote_type": remote_type,
-                            "url": job_link,
-                            "skills": skills
-                        }
-                        
-                        jobs.append(job_data)
-                        logger.info(f"Scraped: {title} at {company}")
-                        
+                        job_data = self.parse_card(fields, i)
+                        if job_data:
+                            jobs.append(job_data)
+                            logger.info(f"Scraped: {job_data['title']} at {job_data['company_name']}")
                     except Exception as e:
-                        logger.error(f"Error scraping job card: {str(e)}")
+                        logger.error(f"Error parsing job card: {str(e)}")
                         continue
                 
             except Exception as e:
                 logger.error(f"Error scraping Indeed: {str(e)}")
-            finally:
-                await browser.close()
+                raise
+        
+        # Skill extraction and classification, after the page is released
+        return await self.enrich_jobs(jobs)
+    
+    def search_url(self, search_query: str) -> str:
+        """Newest-first search URL; with a high-water mark, only postings from
+        the smallest date window Indeed offers that still covers the mark."""
+        url = f"{self.base_url}/jobs?q={search_query.replace(' ', '+')}&l=United+States&sort=date"
+        if self.high_water.seen_at is not None:
+            age_days = (datetime.utcnow() - self.high_water.seen_at).days + 1
+            fromage = next((days for days in FROMAGE_DAYS if days >= age_days), None)
+            if fromage is not None:
+                url += f"&fromage={fromage}"
+        return url
+    
+    @staticmethod
+    def card_job_id(link: Optional[str]) -> Optional[str]:
+        """Indeed job key (jk) from a card's link."""
+        if not link:
+            return None
+        match = re.search(r"jk=([a-zA-Z0-9]+)", link)
+        return match.group(1) if match else None
+    
+    @staticmethod
+    def card_fields_from_html(html: str) -> Dict[str, Optional[str]]:
+        """Read CARD_FIELDS from a card's archived HTML, as EXTRACT_CARDS_JS
+        reads them in the page."""
+        card = BeautifulSoup(html, "lxml")
+        fields: Dict[str, Optional[str]] = {}
+        for name, (selector, attribute) in CARD_FIELDS.items():
+            element = card.select_one(selector)
+            if element is None:
+                fields[name] = None
+            elif attribute:
+                fields[name] = element.get(attribute)
+            else:
+                fields[name] = element.get_text(" ", strip=True)
+        return fields
+    
+    def parse_archived(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Rebuild a raw job from an archived card's HTML."""
+        return self.parse_card(self.card_fields_from_html(record["payload"]), record.get("index") or 0)
+    
+    def parse_card(self, fields: Dict[str, Optional[str]], index: int) -> Optional[Dict[str, Any]]:
+        """Build a raw job dict from the text fields of one job card; see enrich()."""
+        title = fields.get("title")
+        if not title:
+            return None
+        
+        company = fields.get("company") or "Unknown"
+        location = fields.get("location") or "Remote"
+        
+        # Parse location
+        city = location.split(",")[0].strip() if "," in location else location
+        
+        # Get job link
+        job_link = fields.get("link")
+        if job_link and not job_link.startswith("http"):
+            job_link = self.base_url + job_link
+        
+        # Extract job ID from link
+        job_id = self.card_job_id(job_link)
+        
+        return {
+            "external_id": job_id or f"indeed_{index}",
+            "title": title,
+            "company_name": company,
+            "location_city": city,
+            "location_country": "USA",
+            "description": fields.get("snippet") or "",
+            "salary_currency": "USD",
+            "salary_period": "year",
+            "url": job_link,
+            # Raw card text consumed by enrich()
+            "location": location,
+            "salary_text": fields.get("salary"),
+            "job_type_text": fields.get("metadata") or "",
+        }
+    
+    @classmethod
+    def enrich(cls, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse salary, classify and extract skills of a raw card."""
+        job = dict(raw)
+        location = job.pop("location")
+        salary_text = job.pop("salary_text")
+        job_type_text = job.pop("job_type_text")
+        title, description = job["title"], job["description"]
+        
+        salary_min, salary_max = cls.parse_salary(salary_text)
+        
+        employment_type = cls.parse_employment_type(job_type_text + " " + description)
+        seniority = cls.parse_seniority(title, description)
+        remote_type = cls.parse_remote_type(location + " " + description)
+        
+        # Extract skills
+        skills = cls.extract_skills(title, description)
         
-        return jobs
+        job.update(
+            title=title.strip(),
+            company_name=job["company_name"].strip(),
+            description=description.strip(),
+            salary_min=salary_min,
+            salary_max=salary_max,
+            employment_type=employment_type,
+            seniority=seniority,
+            remote_type=remote_type,
+            skills=skills,
+        )
+        return job
     
-    def parse_salary(self, salary_text: str) -> tuple[float | None, float | None]:
+    @staticmethod
+    def parse_salary(salary_text: str) -> tuple[float | None, float | None]:
         """Parse salary from text."""
         if not salary_text:
             return None, None
@@ -0,0 +1,93 @@
+"""Incremental parsing of large JSON array feeds."""
+
+import codecs
+import json
+from typing import Any, AsyncIterator, List
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayParser:
+    """Parse one top-level JSON array fed in arbitrary byte chunks.
+
+    feed() returns the array elements completed by each chunk, so only the
+    unparsed tail of the input is held between calls: memory stays bounded
+    by the chunk size plus the largest single element, however long the
+    array is. Elements are decoded with the stdlib decoder, one at a time.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self._expect_item = True
+        self.count = 0
+        self.finished = False
+
+    def feed(self, data: bytes, final: bool = False) -> List[Any]:
+        """Add a chunk and return the elements it completed.
+
+        Pass final=True with the last chunk (or b"") to check that the
+        array was closed. Anything after the closing bracket is ignored.
+        """
+        buffer = self._buffer + self._text.decode(data, final)
+        pos = 0
+        items: List[Any] = []
+
+        while not self.finished:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+            if not self._started:
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array, found {char!r}")
+                self._started = True
+                pos += 1
+            elif char == "]" and (not self._expect_item or self.count == 0):
+                self.finished = True
+                pos += 1
+            elif char == "," and not self._expect_item:
+                self._expect_item = True
+                pos += 1
+            elif self._expect_item:
+                try:
+                    item, end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    # Element continues in the next chunk
+                    break
+                if not final and (end == len(buffer) or self._number_continues(item, buffer[end])):
+                    # "12" or "12." may be the start of "12.5e3" in the next chunk
+                    break
+                items.append(item)
+                self.count += 1
+                self._expect_item = False
+                pos = end
+            else:
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {char!r}")
+
+        self._buffer = buffer[pos:]
+        if final and not self.finished:
+            raise ValueError("JSON array ended before its closing bracket")
+        return items
+
+    @staticmethod
+    def _number_continues(item: Any, next_char: str) -> bool:
+        return isinstance(item, (int, float)) and not isinstance(item, bool) and next_char in ".eE+-"
+
+
+async def aiter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Yield the elements of a JSON array as its bytes arrive."""
+    parser = JSONArrayParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+        if parser.finished:
+            return
+    for item in parser.feed(b"", final=True):
+        yield item
@@ -0,0 +1,357 @@
+"""Concurrent orchestration of scrape units."""
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlmodel import Session
+
+from app.config import get_settings
+from .archive import PayloadArchive
+from .base import BaseScraper
+from .cache import DimensionCache
+from .checkpoint import load_checkpoints, save_checkpoint
+from .enrich import shutdown_enrich_pool
+from .http import close_http_client
+from .ratelimit import RateLimiter, create_rate_limiter, load_rate_limits
+from .registry import SCRAPERS
+from .slots import SourceSlots, create_source_slots
+from .watermark import (
+    HighWaterMark, load_high_water_marks, load_known_ids, load_validators, save_high_water_mark, save_validators
+)
+
+if TYPE_CHECKING:
+    from .browser import BrowserPool
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapeUnit(NamedTuple):
+    """One scrape of one source for one search query."""
+    source: str
+    query: str = "software engineer"
+    limit: int = 50
+
+    @property
+    def name(self) -> str:
+        return f"{self.source}:{self.query}"
+
+
+def parse_concurrency(spec: str) -> Dict[str, int]:
+    """Parse "remoteok=1,indeed=2" into per-source limits."""
+    limits = {}
+    for item in spec.split(","):
+        if "=" in item:
+            source, limit = item.split("=", 1)
+            limits[source.strip()] = max(1, int(limit))
+    return limits
+
+
+class ScrapeOrchestrator:
+    """Run scrape units concurrently and save their results through one writer.
+
+    Each unit holds one of its source's slots while it runs, which caps
+    how many units of a source run at once (SCRAPE_SOURCE_CONCURRENCY).
+    With the redis backend the slots are shared by every worker, so the
+    cap holds across Celery tasks too. Fetching and parsing happen concurrently on the event loop, but
+    every database write goes through a single writer coroutine that owns
+    the session, so the session is never used from two places at once.
+    Units still running when the deadline passes are cancelled and
+    reported as timed out.
+
+    Unless full_refresh is set, each scraper gets its source's high-water
+    mark and the ids already ingested near it, and stops or skips once it
+    reaches them. A source's mark only advances when all of its units
+    succeeded, so a failed unit is retried from the old mark next run.
+    The source's stored HTTP validators are loaded with the mark, and
+    replaced on source_configs once a unit's jobs are all saved.
+    With save_high_water off the marks are only reported in the summary,
+    for a caller that runs a source's units in several orchestrators.
+
+    Every scraper request takes a token from its source's rate limiter,
+    whose per-minute rates come from source_configs. Wait times are
+    reported in the summary under rate_limits.
+
+    Each unit's outcome is checkpointed per day in scrape_checkpoints as
+    soon as it is known. With resume (the default), units that already
+    succeeded on run_date are skipped, so a retry after a partial failure
+    only scrapes what is left. The summary lists skipped units, and units
+    resumed after an earlier failed attempt that day.
+    
+    Browser-based units share the event loop's browser pool. A persistent
+    orchestrator runs on a long-lived loop shared with other runs (the
+    Celery worker loop) and leaves the loop's browser pool, HTTP client
+    and the enrich pool open for them; otherwise they are closed at the
+    end of the run.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        units: List[ScrapeUnit],
+        concurrency: Optional[Dict[str, int]] = None,
+        deadline: Optional[float] = None,
+        cache: Optional[DimensionCache] = None,
+        full_refresh: Optional[bool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        resume: Optional[bool] = None,
+        run_date: Optional[date] = None,
+        save_high_water: bool = True,
+        slots: Optional[SourceSlots] = None,
+        persistent: bool = False,
+    ):
+        settings = get_settings()
+        self.session = session
+        self.units = units
+        self.concurrency = concurrency or parse_concurrency(settings.scrape_source_concurrency)
+        self.deadline = deadline if deadline is not None else settings.scrape_deadline_seconds
+        self.cache = cache
+        self.full_refresh = settings.scrape_full_refresh if full_refresh is None else full_refresh
+        self.high_water: Dict[str, HighWaterMark] = {}
+        self.known_ids: Dict[str, set] = {}
+        self.validators: Dict[str, Dict[str, str]] = {}
+        self.browser_pool: Optional["BrowserPool"] = None
+        self.rate_limiter = rate_limiter
+        self.archive = PayloadArchive() if settings.archive_enabled else None
+        # A full refresh rescans everything unless resume is asked for explicitly
+        self.resume = (settings.scrape_resume and not self.full_refresh) if resume is None else resume
+        self.run_date = run_date or datetime.utcnow().date()
+        # Off when the caller combines marks of several runs (see scrape_summary_task)
+        self.save_high_water = save_high_water
+        self.slots = slots
+        self.persistent = persistent
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every unit and return a per-unit summary."""
+        start = time.monotonic()
+        owns_slots = self.slots is None
+        if owns_slots:
+            self.slots = create_source_slots(self.concurrency)
+        for unit in self.units:
+            self.results[unit.name] = {
+                "unit": unit.name,
+                "source": unit.source,
+                "query": unit.query,
+                "status": "pending",
+                "fetched": 0,
+                "inserted": 0,
+                "duplicates": 0,
+                "fingerprint_duplicates": 0,
+                "failed": 0,
+                "invalid": 0,
+                "elapsed": 0.0,
+                "error": None,
+                "fetch_metrics": [],
+            }
+        # Database work before and after the units runs in a thread, like
+        # the writer's, so it never stalls other runs sharing the loop
+        skipped, resumed = await asyncio.to_thread(self._apply_checkpoints)
+        pending_units = [unit for unit in self.units if unit.name not in skipped]
+        sources = sorted({unit.source for unit in pending_units})
+        if not self.full_refresh:
+            await asyncio.to_thread(self._load_marks, sources)
+        newest: Dict[str, HighWaterMark] = {}
+        if self.rate_limiter is None:
+            rates = await asyncio.to_thread(load_rate_limits, self.session, sources)
+            self.rate_limiter = create_rate_limiter(rates)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        writer = asyncio.create_task(self._writer(queue, newest))
+
+        tasks = {
+            asyncio.create_task(self._run_unit(unit, queue)): unit
+            for unit in pending_units
+        }
+        pending = set()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=self.deadline)
+
+        for task in pending:
+            task.cancel()
+            unit = tasks[task]
+            self.results[unit.name].update(status="timeout", error=f"Deadline of {self.deadline}s exceeded")
+            logger.warning(f"Scrape unit {unit.name} cancelled at deadline")
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        # Let the writer drain whatever was already scraped
+        await queue.put(None)
+        await writer
+        await asyncio.to_thread(self._save_failed_checkpoints)
+        if self.save_high_water:
+            await asyncio.to_thread(self._save_high_water_marks, newest)
+        rate_limits = self.rate_limiter.stats()
+        logger.info(f"Rate limiter stats: {rate_limits}")
+        await self.rate_limiter.aclose()
+        if owns_slots:
+            await self.slots.aclose()
+        if self.archive is not None:
+            self.archive.close()
+        if self.persistent:
+            if self.browser_pool is not None:
+                logger.info(f"Browser pool stats: {self.browser_pool.stats()}")
+        else:
+            await close_http_client()
+            await asyncio.to_thread(shutdown_enrich_pool)
+            if self.browser_pool is not None:
+                from .browser import close_browser_pool
+                await close_browser_pool()
+
+        units = [self.results[unit.name] for unit in self.units]
+        return {
+            "jobs_saved": sum(result["inserted"] for result in units),
+            "elapsed": round(time.monotonic() - start, 2),
+            "full_refresh": self.full_refresh,
+            "rate_limits": rate_limits,
+            "archived": self.archive.records_written if self.archive is not None else 0,
+            "run_date": self.run_date.isoformat(),
+            "skipped": skipped,
+            "resumed": resumed,
+            "high_water": {
+                source: {"external_id": mark.external_id, "seen_at": mark.seen_at.isoformat()}
+                for source, mark in newest.items()
+            },
+            "units": units,
+        }
+
+    async def _run_unit(self, unit: ScrapeUnit, queue: asyncio.Queue) -> None:
+        """Scrape one unit and hand its jobs to the writer."""
+        result = self.results[unit.name]
+        async with self.slots.hold(unit.source):
+            start = time.monotonic()
+            try:
+                logger.info(f"Running scrape unit {unit.name}")
+                scraper = self._make_scraper(unit.source)
+                jobs = await scraper.scrape(search_query=unit.query, limit=unit.limit)
+                result.update(status="scraped", fetched=len(jobs), fetch_metrics=scraper.fetch_metrics)
+                await queue.put((unit, scraper, jobs))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scrape unit {unit.name} failed: {str(e)}")
+                result.update(status="error", error=str(e))
+            finally:
+                result["elapsed"] = round(time.monotonic() - start, 2)
+
+    def _make_scraper(self, source: str) -> BaseScraper:
+        """Build a scraper, sharing the loop's browser pool across browser-based units."""
+        scraper_class = SCRAPERS[source]
+        if scraper_class.uses_browser:
+            if self.browser_pool is None:
+                # Imported here so runs without a browser source never load Playwright
+                from .browser import get_browser_pool
+                self.browser_pool = get_browser_pool()
+            scraper = scraper_class(self.session, self.cache, browser_pool=self.browser_pool)
+        else:
+            scraper = scraper_class(self.session, self.cache)
+        scraper.high_water = self.high_water.get(source, HighWaterMark())
+        scraper.known_ids = self.known_ids.get(source, set())
+        scraper.validators = dict(self.validators.get(source, {}))
+        scraper.rate_limiter = self.rate_limiter
+        scraper.archive = self.archive
+        return scraper
+
+    def _load_marks(self, sources: List[str]) -> None:
+        """High-water marks of sources, the ids ingested near them and the
+        sources' stored HTTP validators."""
+        self.high_water = load_high_water_marks(self.session, sources)
+        self.validators = load_validators(self.session, sources)
+        for source in sources:
+            self.known_ids[source] = load_known_ids(
+                self.session, source, self.high_water.get(source, HighWaterMark())
+            )
+
+    def _apply_checkpoints(self) -> Tuple[List[str], List[str]]:
+        """Mark units that already succeeded on run_date as skipped; return
+        the skipped units and those resuming after a failed attempt."""
+        skipped, resumed = [], []
+        if not self.resume:
+            return skipped, resumed
+        checkpoints = load_checkpoints(self.session, self.run_date)
+        for unit in self.units:
+            checkpoint = checkpoints.get((unit.source, unit.query))
+            if checkpoint is None:
+                continue
+            if checkpoint.status == "success":
+                self.results[unit.name].update(status="skipped", checkpoint_jobs_saved=checkpoint.jobs_saved)
+                skipped.append(unit.name)
+            else:
+                resumed.append(unit.name)
+        if skipped:
+            logger.info(f"Skipping {len(skipped)} unit(s) already finished on {self.run_date}: {skipped}")
+        return skipped, resumed
+
+    def _checkpoint(self, unit: ScrapeUnit, result: Dict[str, Any]) -> None:
+        try:
+            save_checkpoint(
+                self.session, self.run_date, unit.source, unit.query,
+                result["status"], jobs_saved=result["inserted"], error=result["error"],
+            )
+        except Exception as e:
+            logger.error(f"Saving checkpoint of unit {unit.name} failed: {str(e)}")
+            self.session.rollback()
+
+    def _save_validators(self, source: str, validators: Dict[str, str]) -> None:
+        try:
+            save_validators(self.session, source, validators, source_type=SCRAPERS[source].source_type)
+        except Exception as e:
+            logger.error(f"Saving {source} HTTP validators failed: {str(e)}")
+            self.session.rollback()
+
+    def _save_failed_checkpoints(self) -> None:
+        """Record the units of this run that did not succeed."""
+        for unit in self.units:
+            result = self.results[unit.name]
+            if result["status"] not in ("success", "skipped"):
+                self._checkpoint(unit, result)
+
+    def _save_high_water_marks(self, newest: Dict[str, HighWaterMark]) -> None:
+        """Advance the mark of every source whose units all succeeded."""
+        for source, mark in newest.items():
+            statuses = [result["status"] for result in self.results.values() if result["source"] == source]
+            if any(status not in ("success", "skipped") for status in statuses):
+                logger.info(f"Keeping {source} high-water mark: not every unit succeeded")
+                continue
+            try:
+                save_high_water_mark(
+                    self.session, source, mark,
+                    source_type=SCRAPERS[source].source_type,
+                )
+            except Exception as e:
+                logger.error(f"Saving {source} high-water mark failed: {str(e)}")
+                self.session.rollback()
+
+    async def _writer(self, queue: asyncio.Queue, newest: Dict[str, HighWaterMark]) -> None:
+        """Save scraped jobs one unit at a time."""
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            unit, scraper, jobs = item
+            result = self.results[unit.name]
+            try:
+                # Off the event loop so scrapers keep fetching meanwhile
+                counts = await asyncio.to_thread(scraper.save_jobs, jobs)
+                result.update(counts)
+                if counts["failed"]:
+                    # Checkpointed as an error at the end of the run, so the
+                    # unit is retried; fetch state and mark stay behind, so
+                    # the retry reads these jobs again
+                    result.update(status="error", error=f"{counts['failed']} job(s) failed to save")
+                    continue
+                if result["status"] == "scraped":
+                    result["status"] = "success"
+                    await asyncio.to_thread(self._checkpoint, unit, result)
+                scraper.confirm_saved()
+                if scraper.validators and scraper.validators != self.validators.get(unit.source):
+                    self.validators[unit.source] = scraper.validators
+                    await asyncio.to_thread(self._save_validators, unit.source, scraper.validators)
+                mark = scraper.newest_seen
+                current = newest.get(unit.source)
+                if mark.seen_at is not None and (current is None or mark.seen_at > current.seen_at):
+                    newest[unit.source] = mark
+            except Exception as e:
+                logger.error(f"Saving unit {unit.name} failed: {str(e)}")
+                result.update(status="error", error=str(e))
@@ -0,0 +1,178 @@
+"""Per-source token-bucket rate limiting for scraper requests."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlmodel import Session, select
+
+from app.config import get_settings
+from app.models import SourceConfig
+
+logger = logging.getLogger(__name__)
+
+# Used for sources without a source_configs row; matches the column default
+DEFAULT_RATE_PER_MINUTE = 60
+
+# Takes one token from the bucket in KEYS[1] if it has one. Returns 0 on
+# success, otherwise the milliseconds until a token will be available.
+# The bucket refills at ARGV[2] tokens per second up to ARGV[1] tokens.
+# Redis's own clock is used, so workers with skewed clocks agree.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1])
+local updated = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+    updated = now
+end
+
+tokens = math.min(capacity, tokens + (now - updated) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity * 1000 / rate) + 1000)
+return wait
+"""
+
+
+def load_rate_limits(session: Session, sources: Iterable[str]) -> Dict[str, int]:
+    """Requests per minute of each source, from source_configs."""
+    sources = list(sources)
+    configured = dict(session.exec(
+        select(SourceConfig.name, SourceConfig.rate_limit_per_minute)
+        .where(SourceConfig.name.in_(sources))
+    ).all())
+    return {source: configured.get(source) or DEFAULT_RATE_PER_MINUTE for source in sources}
+
+
+class RateLimiter:
+    """Token bucket per source, holding at most `burst` tokens and refilled
+    at the source's rate_limit_per_minute.
+
+    acquire() waits until the source's bucket has a token and takes it.
+    This base class keeps the buckets in process memory, which limits a
+    single worker only; RedisRateLimiter shares them across workers. Time
+    spent waiting is recorded per source, see stats().
+    """
+
+    def __init__(self, rates: Dict[str, int], burst: Optional[int] = None):
+        self.rates = rates
+        self.burst = max(1, burst or get_settings().rate_limit_burst)
+        self._buckets: Dict[str, list] = {}
+        self._lock = asyncio.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    async def acquire(self, source: str) -> float:
+        """Take one token for source, waiting as needed; returns seconds waited."""
+        start = time.monotonic()
+        while True:
+            wait = await self._try_acquire(source)
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+
+        waited = time.monotonic() - start
+        stats = self._stats.setdefault(source, {"acquired": 0, "waited": 0, "wait_seconds": 0.0, "max_wait": 0.0})
+        stats["acquired"] += 1
+        if waited > 0.001:
+            stats["waited"] += 1
+            stats["wait_seconds"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+        return waited
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Tokens acquired, how many had to wait, and total and max wait per source."""
+        return {
+            source: {
+                "rate_per_minute": self.rates.get(source, DEFAULT_RATE_PER_MINUTE),
+                "acquired": int(stats["acquired"]),
+                "waited": int(stats["waited"]),
+                "wait_seconds": round(stats["wait_seconds"], 3),
+                "max_wait": round(stats["max_wait"], 3),
+            }
+            for source, stats in self._stats.items()
+        }
+
+    async def aclose(self) -> None:
+        pass
+
+    def rate_per_second(self, source: str) -> float:
+        return self.rates.get(source, DEFAULT_RATE_PER_MINUTE) / 60
+
+    async def _try_acquire(self, source: str) -> float:
+        """Take a token if one is available; otherwise return seconds until one is."""
+        async with self._lock:
+            return self._take_local(source)
+
+    def _take_local(self, source: str) -> float:
+        rate = self.rate_per_second(source)
+        now = time.monotonic()
+        bucket = self._buckets.setdefault(source, [float(self.burst), now])
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / rate
+
+
+class RedisRateLimiter(RateLimiter):
+    """Token buckets held in Redis, shared by every worker.
+
+    Each bucket is a hash updated atomically by a Lua script. If Redis
+    cannot be reached, the limiter logs a warning and falls back to the
+    in-process buckets for the rest of the run.
+    """
+
+    KEY_PREFIX = "ratelimit:"
+
+    def __init__(self, rates: Dict[str, int], burst: Optional[int] = None, client=None):
+        super().__init__(rates, burst)
+        self.client = client or Redis.from_url(get_settings().redis_url)
+        self._script = self.client.register_script(TOKEN_BUCKET_LUA)
+        self.fallback = False
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def _try_acquire(self, source: str) -> float:
+        if not self.fallback:
+            try:
+                wait_ms = await self._script(
+                    keys=[self.KEY_PREFIX + source],
+                    args=[self.burst, self.rate_per_second(source)],
+                )
+                return int(wait_ms) / 1000
+            except (RedisError, OSError) as e:
+                logger.warning(f"Redis rate limiter unavailable, limiting per process: {str(e)}")
+                self.fallback = True
+        return await super()._try_acquire(source)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = super().stats()
+        for source_stats in stats.values():
+            source_stats["backend"] = "local" if self.fallback else "redis"
+        return stats
+
+
+def create_rate_limiter(rates: Dict[str, int], backend: Optional[str] = None) -> RateLimiter:
+    """Limiter for the configured backend: "redis" (shared) or "local"."""
+    backend = backend or get_settings().rate_limit_backend
+    if backend == "redis":
+        return RedisRateLimiter(rates)
+    return RateLimiter(rates)
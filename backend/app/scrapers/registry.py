@@ -0,0 +1,99 @@
+"""Registry of scraper classes by source name, imported on first use."""
+
+import importlib
+import logging
+from importlib.metadata import entry_points
+from typing import Dict, Iterator, Mapping, Type, Union
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Built-in sources as "module:Class" paths
+BUILTIN_SCRAPERS: Dict[str, str] = {
+    "remoteok": "app.scrapers.remoteok:RemoteOKScraper",
+    "indeed": "app.scrapers.indeed:IndeedScraper",
+}
+
+# Installed packages add sources by declaring entry points in this group, e.g.
+# [project.entry-points."devmarket_pulse.scrapers"] linkedin = "pkg.linkedin:LinkedInScraper"
+ENTRY_POINT_GROUP = "devmarket_pulse.scrapers"
+
+
+def parse_scraper_plugins(spec: str) -> Dict[str, str]:
+    """Parse "name=module:Class,..." into source name -> class path."""
+    plugins = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, path = item.split("=", 1)
+            plugins[name.strip()] = path.strip()
+    return plugins
+
+
+def import_scraper(path: str) -> type:
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class ScraperRegistry(Mapping[str, Type]):
+    """Scraper classes by source name, imported only when first looked up.
+
+    Listing or checking names never imports a scraper module, so processes
+    that only need the names (the API, analytics workers, beat) do not pay
+    for Playwright. Sources come from BUILTIN_SCRAPERS, then entry points in
+    ENTRY_POINT_GROUP, then the SCRAPER_PLUGINS setting; a later definition
+    of a name replaces an earlier one. Plugins are discovered on first use.
+    """
+
+    def __init__(self, paths: Mapping[str, str], discover: bool = True):
+        self._paths: Dict[str, Union[str, type]] = dict(paths)
+        self._classes: Dict[str, type] = {}
+        self._discovered = not discover
+
+    def register(self, name: str, target: Union[str, type]) -> None:
+        """Add or replace a source, as a "module:Class" path or a class."""
+        self._discover()
+        self._paths[name] = target
+        self._classes.pop(name, None)
+
+    def path(self, name: str) -> str:
+        self._discover()
+        target = self._paths[name]
+        return target if isinstance(target, str) else f"{target.__module__}:{target.__qualname__}"
+
+    def loaded(self) -> Dict[str, type]:
+        """Classes imported so far."""
+        return dict(self._classes)
+
+    def __getitem__(self, name: str) -> Type:
+        if name not in self._classes:
+            self._discover()
+            target = self._paths[name]
+            self._classes[name] = import_scraper(target) if isinstance(target, str) else target
+        return self._classes[name]
+
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._paths)
+
+    def __contains__(self, name: object) -> bool:
+        self._discover()
+        return name in self._paths
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+        self._discovered = True
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            self._paths[entry_point.name] = entry_point.value
+            logger.info(f"Registered scraper plugin {entry_point.name} from entry point {entry_point.value}")
+        for name, path in parse_scraper_plugins(get_settings().scraper_plugins).items():
+            self._paths[name] = path
+            logger.info(f"Registered scraper plugin {name} from settings: {path}")
+
+
+SCRAPERS = ScraperRegistry(BUILTIN_SCRAPERS)
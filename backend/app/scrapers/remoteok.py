@@ -1,11 +1,15 @@
 """RemoteOK API scraper."""
 
-import requests
 import logging
-from typing import List, Dict, Any
+import time
+from contextlib import aclosing
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
 from datetime import datetime
 
 from .base import BaseScraper
+from .http import HTTPClient, get_http_client
+from .jsonstream import aiter_json_array
+from .watermark import MARK_STREAK, HighWaterMark
 
 logger = logging.getLogger(__name__)
 
@@ -13,112 +17,206 @@ logger = logging.getLogger(__name__)
 class RemoteOKScraper(BaseScraper):
     """Scraper for RemoteOK.com API."""
     
-    def __init__(self, session):
-        super().__init__(session)
+    source_type = "api"
+    
+    def __init__(self, session, cache=None, http_client: Optional[HTTPClient] = None):
+        super().__init__(session, cache)
         self.source_name = "remoteok"
         self.base_url = "https://remoteok.com/api"
+        self.http_client = http_client
+        # Client and validators of the last fetched feed, kept until its jobs are saved
+        self._fetched: Optional[Tuple[HTTPClient, Dict[str, str]]] = None
     
     async def scrape(self, search_query: str = "software engineer", limit: int = 50) -> List[Dict[str, Any]]:
-        """Scrape job postings from RemoteOK API."""
+        """Scrape job postings from RemoteOK API.
+        
+        The feed is parsed as it streams in, one listing at a time, and the
+        download stops once limit jobs are collected or the high-water mark
+        is reached, so the full feed is never held in memory.
+        
+        A failed fetch is raised, so the unit is reported as failed and
+        retried rather than checkpointed as done with no jobs.
+        """
         jobs = []
         
         try:
             logger.info(f"Scraping RemoteOK API")
             
-            # RemoteOK has a public API
-            response = requests.get(
-                self.base_url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                },
-                timeout=30
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to fetch RemoteOK API: {response.status_code}")
-                return jobs
+            # RemoteOK has a public API; an unchanged feed answers 304. Without
+            # a high-water mark (first run or full refresh) it is always read
+            client = self.http_client or get_http_client()
+            conditional = self.high_water != HighWaterMark()
+            rate_wait = await self.throttle()
+            start = time.monotonic()
+            if conditional:
+                client.remember_validators(self.base_url, self.validators)
+            async with client.stream(self.base_url, conditional=conditional) as response:
+                if response.status_code == 304:
+                    logger.info("RemoteOK feed unchanged since last run")
+                elif response.status_code != 200:
+                    raise RuntimeError(f"Failed to fetch RemoteOK API: HTTP {response.status_code}")
+                else:
+                    async with aclosing(aiter_json_array(response.aiter_bytes())) as listings:
+                        await self._collect(listings, jobs, limit, search_query)
+                    self._fetched = (client, client.response_validators(response))
+                    logger.info(f"Successfully scraped {len(jobs)} jobs from RemoteOK")
+                
+                # Timed here: response.elapsed is unset for stubbed transports
+                self.fetch_metrics.append({
+                    "url": self.base_url,
+                    "status": response.status_code,
+                    "bytes": response.num_bytes_downloaded,
+                    "elapsed": round(time.monotonic() - start, 3),
+                    "rate_wait": round(rate_wait, 3),
+                })
             
-            data = response.json()
+            # Skill extraction and classification, off the event loop for large feeds
+            jobs = await self.enrich_jobs(jobs)
             
+        except Exception as e:
+            logger.error(f"Error scraping RemoteOK: {str(e)}")
+            raise
+        
+        return jobs
+    
+    def confirm_saved(self) -> None:
+        """Keep the fetched feed's validators now that its jobs are saved; the
+        orchestrator stores them on source_configs."""
+        if self._fetched is not None:
+            client, validators = self._fetched
+            client.remember_validators(self.base_url, validators)
+            if validators:
+                self.validators = validators
+            self._fetched = None
+    
+    async def _collect(self, listings: AsyncIterator[Any], jobs: List[Dict[str, Any]], limit: int, search_query: str) -> None:
+        """Parse streamed listings into jobs until limit or the high-water mark."""
+        mark = self.high_water
+        index = -1
+        streak = 0
+        
+        async for job_data in listings:
+            index += 1
             # First item is metadata, skip it
-            job_listings = data[1:limit+1]
+            if index == 0 or not isinstance(job_data, dict):
+                continue
+            
+            job_id = str(job_data.get("id", ""))
+            posted_at = self.parse_epoch(job_data.get("epoch"))
             
-            for job_data in job_listings:
-                try:
-                    # Extract job details
-                    title = job_data.get("position", "")
-                    company = job_data.get("company", "Unknown")
-                    description = job_data.get("description", "")
-                    
-                    # Location - RemoteOK shows location tags
-                    location = job_data.get("location", "Remote")
-                    if not location or location == "false":
-                        location = "Remote"
-                    
-                    city = location.split(",")[0].strip() if "," in location else location
-                    
-                    # Salary
-                    salary_min = job_data.get("salary_min")
-                    salary_max = job_data.get("salary_max")
-                    
-                    # Job ID
-                    job_id = job_data.get("id", "")
-                    
-                    # URL
-                    job_url = job_data.get("url", f"https://remoteok.com/remote-jobs/{job_id}")
-                    
-                    # Tags (often include skills and job type)
-                    tags = job_data.get("tags", [])
-                    
-                    # Determine employment type from tags
-                    employment_type = self.parse_employment_type(" ".join(tags))
-                    
-                    # Determine seniority
-                    seniority = self.parse_seniority(title, description)
-                    
-                    # Remote type (RemoteOK is all remote)
-                    remote_type = self.parse_remote_type("remote")
-                    
-                    # Extract skills from tags and description
-                    skills = self.extract_skills(title, description + " " + " ".join(tags))
-                    
-                    # Add relevant tags as skills
-                    tech_tags = [
-                        tag for tag in tags 
-                        if tag.lower() not in ["remote", "full-time", "contract", "freelance"]
-                    ]
-                    for tag in tech_tags[:5]:  # Limit to 5 tags
-                        if tag.title() not in skills:
-                            skills.append(tag.title())
-                    
-                    job_info = {
-                        "external_id": str(job_id),
-                        "title": title,
-                        "company_name": company,
-                        "location_city": city,
-                        "location_country": "Remote",
-                        "description": description[:1000],  # Limit description length
-                        "salary_min": salary_min,
-                        "salary_max": salary_max,
-                        "salary_currency": "USD",
-                        "salary_period": "year",
-                        "employment_type": employment_type,
-                        "seniority": seniority,
-                        "remote_type": remote_type,
-                        "url": job_url,
-                        "skills": skills
-                    }
-                    
-                    jobs.append(job_info)
-                    logger.info(f"Scraped: {title} at {company}")
-                    
-                except Exception as e:
-                    logger.error(f"Error parsing RemoteOK job: {str(e)}")
-                    continue
+            # Listings come newest first, but pinned ones sit above newer
+            # posts: listings at or behind the high-water mark, or already
+            # ingested, are skipped, and the scan stops after MARK_STREAK in a row
+            behind = (mark.external_id is not None and job_id == mark.external_id) or (
+                mark.seen_at is not None and posted_at is not None and posted_at <= mark.seen_at
+            )
             
-            logger.info(f"Successfully scraped {len(jobs)} jobs from RemoteOK")
+            if not behind and posted_at is not None and (
+                self.newest_seen.seen_at is None or posted_at > self.newest_seen.seen_at
+            ):
+                self.newest_seen = HighWaterMark(job_id, posted_at)
             
-        except Exception as e:
-            logger.error(f"Error scraping RemoteOK: {str(e)}")
+            if behind or job_id in self.known_ids:
+                streak += 1
+                if streak >= MARK_STREAK:
+                    break
+                continue
+            streak = 0
+            
+            self.archive_payload(job_data, query=search_query, url=self.base_url, index=index)
+            
+            try:
+                job_info = self.parse_listing(job_data, job_id, posted_at)
+                jobs.append(job_info)
+                logger.info(f"Scraped: {job_info['title']} at {job_info['company_name']}")
+            except Exception as e:
+                logger.error(f"Error parsing RemoteOK job: {str(e)}")
+                continue
+            
+            # Stop reading the feed as soon as the limit is reached
+            if len(jobs) >= limit:
+                break
+    
+    def parse_listing(self, job_data: Dict[str, Any], job_id: str, posted_at: Optional[datetime]) -> Dict[str, Any]:
+        """Build a raw job dict from one feed listing; see enrich()."""
+        # Extract job details
+        title = job_data.get("position", "")
+        company = job_data.get("company", "Unknown")
+        description = job_data.get("description", "")
         
-        return jobs
+        # Location - RemoteOK shows location tags
+        location = job_data.get("location", "Remote")
+        if not location or location == "false":
+            location = "Remote"
+        
+        city = location.split(",")[0].strip() if "," in location else location
+        
+        # URL
+        job_url = job_data.get("url", f"https://remoteok.com/remote-jobs/{job_id}")
+        
+        return {
+            "external_id": job_id,
+            "title": title,
+            "company_name": company,
+            "location_city": city,
+            "location_country": "Remote",
+            "description": description,
+            "salary_min": job_data.get("salary_min"),
+            "salary_max": job_data.get("salary_max"),
+            "salary_currency": "USD",
+            "salary_period": "year",
+            "url": job_url,
+            "posted_at": posted_at,
+            # Tags (often include skills and job type); consumed by enrich()
+            "tags": job_data.get("tags", []),
+        }
+    
+    @classmethod
+    def enrich(cls, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Classify a raw listing and extract its skills."""
+        job = dict(raw)
+        tags = job.pop("tags")
+        title, description = job["title"], job["description"]
+        
+        # Determine employment type from tags
+        employment_type = cls.parse_employment_type(" ".join(tags))
+        
+        # Determine seniority
+        seniority = cls.parse_seniority(title, description)
+        
+        # Remote type (RemoteOK is all remote)
+        remote_type = cls.parse_remote_type("remote")
+        
+        # Extract skills from tags and description
+        skills = cls.extract_skills(title, description + " " + " ".join(tags))
+        
+        # Add relevant tags as skills
+        tech_tags = [
+            tag for tag in tags 
+            if tag.lower() not in ["remote", "full-time", "contract", "freelance"]
+        ]
+        for tag in tech_tags[:5]:  # Limit to 5 tags
+            if tag.title() not in skills:
+                skills.append(tag.title())
+        
+        job.update(
+            description=description[:1000],  # Limit description length
+            employment_type=employment_type,
+            seniority=seniority,
+            remote_type=remote_type,
+            skills=skills,
+        )
+        return job
+    
+    def parse_archived(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Rebuild a raw job from an archived feed listing."""
+        listing = record["payload"]
+        return self.parse_listing(listing, str(listing.get("id", "")), self.parse_epoch(listing.get("epoch")))
+    
+    @staticmethod
+    def parse_epoch(value: Any) -> Optional[datetime]:
+        """Convert a listing's epoch seconds to a naive UTC datetime."""
+        try:
+            return datetime.utcfromtimestamp(int(value))
+        except (TypeError, ValueError, OverflowError, OSError):
+            return None
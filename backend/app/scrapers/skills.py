@@ -0,0 +1,196 @@
+"""Skill dictionary and compiled single-pass skill matcher."""
+
+import re
+from typing import Dict, List, Pattern
+
+from app.models import SkillCategory
+
+
+# Common tech skills to look for
+SKILL_PATTERNS: Dict[str, SkillCategory] = {
+    # Languages
+    "python": SkillCategory.LANGUAGE,
+    "javascript": SkillCategory.LANGUAGE,
+    "typescript": SkillCategory.LANGUAGE,
+    "java": SkillCategory.LANGUAGE,
+    "c++": SkillCategory.LANGUAGE,
+    "c#": SkillCategory.LANGUAGE,
+    "go": SkillCategory.LANGUAGE,
+    "golang": SkillCategory.LANGUAGE,
+    "rust": SkillCategory.LANGUAGE,
+    "php": SkillCategory.LANGUAGE,
+    "ruby": SkillCategory.LANGUAGE,
+    "swift": SkillCategory.LANGUAGE,
+    "kotlin": SkillCategory.LANGUAGE,
+    "scala": SkillCategory.LANGUAGE,
+    "r": SkillCategory.LANGUAGE,
+
+    # Frameworks
+    "react": SkillCategory.FRAMEWORK,
+    "reactjs": SkillCategory.FRAMEWORK,
+    "vue": SkillCategory.FRAMEWORK,
+    "vuejs": SkillCategory.FRAMEWORK,
+    "angular": SkillCategory.FRAMEWORK,
+    "node.js": SkillCategory.FRAMEWORK,
+    "nodejs": SkillCategory.FRAMEWORK,
+    "express": SkillCategory.FRAMEWORK,
+    "django": SkillCategory.FRAMEWORK,
+    "flask": SkillCategory.FRAMEWORK,
+    "fastapi": SkillCategory.FRAMEWORK,
+    "spring": SkillCategory.FRAMEWORK,
+    "spring boot": SkillCategory.FRAMEWORK,
+    ".net": SkillCategory.FRAMEWORK,
+    "asp.net": SkillCategory.FRAMEWORK,
+    "laravel": SkillCategory.FRAMEWORK,
+    "rails": SkillCategory.FRAMEWORK,
+    "next.js": SkillCategory.FRAMEWORK,
+    "nextjs": SkillCategory.FRAMEWORK,
+
+    # Cloud
+    "aws": SkillCategory.CLOUD,
+    "azure": SkillCategory.CLOUD,
+    "gcp": SkillCategory.CLOUD,
+    "google cloud": SkillCategory.CLOUD,
+    "kubernetes": SkillCategory.CLOUD,
+    "k8s": SkillCategory.CLOUD,
+    "docker": SkillCategory.TOOL,
+    "terraform": SkillCategory.CLOUD,
+
+    # Databases
+    "postgresql": SkillCategory.DATABASE,
+    "postgres": SkillCategory.DATABASE,
+    "mysql": SkillCategory.DATABASE,
+    "mongodb": SkillCategory.DATABASE,
+    "redis": SkillCategory.DATABASE,
+    "elasticsearch": SkillCategory.DATABASE,
+    "dynamodb": SkillCategory.DATABASE,
+    "oracle": SkillCategory.DATABASE,
+    "sql server": SkillCategory.DATABASE,
+    "cassandra": SkillCategory.DATABASE,
+
+    # Tools
+    "git": SkillCategory.TOOL,
+    "github": SkillCategory.TOOL,
+    "gitlab": SkillCategory.TOOL,
+    "jenkins": SkillCategory.TOOL,
+    "ci/cd": SkillCategory.TOOL,
+    "jira": SkillCategory.TOOL,
+    "linux": SkillCategory.TOOL,
+    "unix": SkillCategory.TOOL,
+    "bash": SkillCategory.TOOL,
+}
+
+
+def normalize_skill_name(skill: str) -> str:
+    """Normalize a dictionary skill key to the name stored in the skills table."""
+    return skill.title() if len(skill) > 3 else skill.upper()
+
+
+def _bounded(skill: str) -> str:
+    """Regex for a skill that must not touch word characters on either side.
+
+    A boundary is only required on an edge that is itself a word character,
+    so "c++" and ".net" still match next to punctuation and inside "asp.net".
+    """
+    pattern = re.escape(skill)
+    if re.match(r"\w", skill[0]):
+        pattern = r"(?<!\w)" + pattern
+    if re.match(r"\w", skill[-1]):
+        pattern = pattern + r"(?!\w)"
+    return pattern
+
+
+def legacy_pattern(skill: str) -> str:
+    """Regex of the original per-skill test: skills of up to three characters
+    need a word boundary (\\b) on both sides, longer ones match anywhere,
+    even inside another word ("java" in "javascript")."""
+    if len(skill) <= 3:
+        return r"\b" + re.escape(skill) + r"\b"
+    return re.escape(skill)
+
+
+def _boundary_checks(skill: str) -> str:
+    """legacy_pattern's boundaries, tested once the whole skill has matched.
+
+    The start boundary is a lookbehind over the skill itself, so it can sit
+    at the end of a trie branch shared with skills that need no boundary.
+    """
+    if len(skill) > 3:
+        return ""
+    before = r"\w[\s\S]{%d}" % len(skill)
+    start = f"(?<!{before})" if re.match(r"\w", skill[0]) else f"(?<={before})"
+    end = r"(?!\w)" if re.match(r"\w", skill[-1]) else r"(?=\w)"
+    return start + end
+
+
+def _trie_regex(skills: List[str]) -> str:
+    """Build one alternation factored by common prefix.
+
+    CPython's re tries every branch of a flat alternation at every position;
+    sharing prefixes lets a single failed character rule out a whole subtree.
+    Longer branches come before the end of a shorter skill, so the longest
+    skill at a position wins.
+    """
+    trie: Dict = {}
+    for skill in skills:
+        node = trie
+        for char in skill:
+            node = node.setdefault(char, {})
+        node[""] = skill
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if "" in node:
+            branches.append(_boundary_checks(node[""]))
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """Find every dictionary skill in a text with one regex scan.
+
+    The result is the same as testing legacy_pattern of each skill on its
+    own, as extract_skills originally did, so stats stay comparable with
+    history. All patterns are compiled into a single prefix-trie
+    alternation inside a lookahead, which reports the longest skill
+    starting at every position, overlapping or not. Shorter skills that
+    start at the same position ("spring" under "spring boot") are then
+    checked against their own pattern there.
+    """
+
+    def __init__(self, patterns: Dict[str, SkillCategory]):
+        self.skills: List[str] = [skill.lower() for skill in patterns]
+        self.names: List[str] = [normalize_skill_name(skill) for skill in self.skills]
+
+        self._index: Dict[str, int] = {skill: i for i, skill in enumerate(self.skills)}
+        self._regex: Pattern[str] = re.compile("(?=(" + _trie_regex(self.skills) + "))")
+        self._patterns: List[Pattern[str]] = [re.compile(legacy_pattern(skill)) for skill in self.skills]
+
+        # Shorter patterns that are prefixes of each pattern
+        self._prefixes: List[List[int]] = [
+            [self._index[other] for other in self.skills if other != skill and skill.startswith(other)]
+            for skill in self.skills
+        ]
+
+    def find(self, text: str) -> List[str]:
+        """Return normalized skill names found in text, in dictionary order."""
+        text = text.lower()
+        hits = set()
+        for match in self._regex.finditer(text):
+            i = self._index[match.group(1)]
+            hits.add(i)
+            for j in self._prefixes[i]:
+                if j not in hits and self._patterns[j].match(text, match.start()):
+                    hits.add(j)
+
+        found_skills: List[str] = []
+        for i in sorted(hits):
+            if self.names[i] not in found_skills:
+                found_skills.append(self.names[i])
+        return found_skills
+
+
+skill_matcher = SkillMatcher(SKILL_PATTERNS)
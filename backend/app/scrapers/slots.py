@@ -0,0 +1,144 @@
+"""Per-source limits on how many scrape units run at once."""
+
+import asyncio
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# A held slot expires unless renewed, so a worker that dies mid-unit
+# frees it for the others after at most this long
+LEASE_SECONDS = 60
+# How often a unit waiting for a slot asks Redis again
+POLL_SECONDS = 1.0
+
+# Takes a slot of the source whose holders are in the sorted set KEYS[1],
+# scored by lease expiry in milliseconds. Expired leases are dropped first.
+# ARGV: slot limit, holder token, lease milliseconds. Returns 1 if taken.
+ACQUIRE_LUA = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local lease = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + lease, ARGV[2])
+redis.call('PEXPIRE', KEYS[1], lease)
+return 1
+"""
+
+# Extends the lease of holder ARGV[1] by ARGV[2] milliseconds if it still
+# holds its slot. Returns 1 if it did.
+RENEW_LUA = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local lease = tonumber(ARGV[2])
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + lease, ARGV[1])
+redis.call('PEXPIRE', KEYS[1], lease)
+return 1
+"""
+
+
+class SourceSlots:
+    """At most limits[source] units of a source run at once (1 for sources
+    without a limit).
+
+    hold() waits for a free slot of the source and keeps it until the
+    block exits. This base class counts slots in process memory, which
+    limits the orchestrators sharing one instance only; RedisSourceSlots
+    shares them across workers.
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        self.limits = limits
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def limit(self, source: str) -> int:
+        return max(1, self.limits.get(source, 1))
+
+    @asynccontextmanager
+    async def hold(self, source: str) -> AsyncIterator[None]:
+        semaphore = self._semaphores.setdefault(source, asyncio.Semaphore(self.limit(source)))
+        async with semaphore:
+            yield
+
+    async def aclose(self) -> None:
+        pass
+
+
+class RedisSourceSlots(SourceSlots):
+    """Slots held as leases in Redis, shared by every worker.
+
+    Each source's holders are a sorted set updated atomically by Lua
+    scripts. A held lease is renewed every third of LEASE_SECONDS. If
+    Redis cannot be reached, the slots log a warning and fall back to
+    the in-process semaphores for the rest of their life.
+    """
+
+    KEY_PREFIX = "scrape-slots:"
+
+    def __init__(self, limits: Dict[str, int], client=None):
+        super().__init__(limits)
+        self.client = client or Redis.from_url(get_settings().redis_url)
+        self._acquire = self.client.register_script(ACQUIRE_LUA)
+        self._renew = self.client.register_script(RENEW_LUA)
+        self.fallback = False
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    @asynccontextmanager
+    async def hold(self, source: str) -> AsyncIterator[None]:
+        key = self.KEY_PREFIX + source
+        token = uuid.uuid4().hex
+        lease_ms = LEASE_SECONDS * 1000
+        try:
+            while not self.fallback and not int(await self._acquire(keys=[key], args=[self.limit(source), token, lease_ms])):
+                await asyncio.sleep(POLL_SECONDS)
+        except (RedisError, OSError) as e:
+            logger.warning(f"Redis scrape slots unavailable, limiting per process: {str(e)}")
+            self.fallback = True
+        if self.fallback:
+            async with super().hold(source):
+                yield
+            return
+
+        renewal = asyncio.create_task(self._keep_lease(key, token, lease_ms))
+        try:
+            yield
+        finally:
+            renewal.cancel()
+            try:
+                await self.client.zrem(key, token)
+            except (RedisError, OSError) as e:
+                logger.warning(f"Releasing {source} scrape slot failed, it expires in {LEASE_SECONDS}s: {str(e)}")
+
+    async def _keep_lease(self, key: str, token: str, lease_ms: int) -> None:
+        while True:
+            await asyncio.sleep(LEASE_SECONDS / 3)
+            try:
+                if not int(await self._renew(keys=[key], args=[token, lease_ms])):
+                    logger.warning(f"Scrape slot lease {key} expired before it was renewed")
+                    return
+            except (RedisError, OSError) as e:
+                logger.warning(f"Renewing scrape slot lease {key} failed: {str(e)}")
+
+
+def create_source_slots(limits: Dict[str, int], backend: Optional[str] = None) -> SourceSlots:
+    """Slots for the configured backend: "redis" (shared) or "local". They
+    use the rate limiter's backend, RATE_LIMIT_BACKEND."""
+    backend = backend or get_settings().rate_limit_backend
+    if backend == "redis":
+        return RedisSourceSlots(limits)
+    return SourceSlots(limits)
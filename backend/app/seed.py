@@ -7,6 +7,7 @@ from datetime import datetime, timedelta, date
 import random
 from sqlmodel import Session
 
+from app.counters import rebuild_counters
 from app.database import engine, init_db
 from app.models import (
     Location, Company, Skill, JobPosting, SourceConfig,
@@ -342,6 +343,10 @@ def main():
         jobs = seed_job_postings(session, companies, locations, skills)
         print(f"   Created {len(jobs)} job postings")
         
+        print("🔢 Counting jobs into the stat counters...")
+        rebuild_counters(session)
+        print("   Built stat counters")
+        
         print("⚙️  Seeding source configurations...")
         seed_source_configs(session)
         print("   Created source configs")
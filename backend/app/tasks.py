@@ -2,78 +2,270 @@
 
 import asyncio
 import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, date
-from typing import Dict, Any
+from typing import Any, Callable, Coroutine, Dict, Iterable, List, Optional, Tuple
+from celery import chord, group
+from celery.signals import worker_process_shutdown, worker_shutdown
+from sqlalchemy import Numeric, case, cast, insert
+from sqlalchemy.orm import aliased
 from sqlmodel import Session, select, func, and_
 
 from app.celery_app import celery_app
+from app.config import get_settings
+from app.counters import (
+    COMPANY, GLOBAL, LOCATION, SKILL, SKILL_COMPANY, SKILL_LOCATION,
+    counts, ensure_counters, load_job_keys, pair_counts, rebuild_counters, record_jobs
+)
 from app.database import engine
 from app.models import (
-    JobPosting, Skill, Company, Location, JobSkillLink,
-    DailySkillStats, DailyLocationStats, DailyCompanyStats, DailyGlobalStats
+    JobPosting, Skill, JobSkillLink,
+    DailySkillStats, DailyLocationStats, DailyCompanyStats, DailyGlobalStats, SourceConfig, StatCounter
 )
-from app.scrapers import IndeedScraper, RemoteOKScraper
+from app.percentiles import Percentiles, active_salaries, percentiles
+from app.scrapers.cache import DimensionCache
+from app.scrapers.enrich import shutdown_enrich_pool
+from app.scrapers.http import close_http_client
+from app.scrapers.orchestrator import ScrapeOrchestrator, ScrapeUnit, parse_concurrency
+from app.scrapers.registry import SCRAPERS
+from app.scrapers.slots import SourceSlots, create_source_slots
+from app.scrapers.watermark import HighWaterMark, save_high_water_mark
 
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task(name='app.tasks.scrape_jobs_task', bind=True, max_retries=3)
-def scrape_jobs_task(self) -> Dict[str, Any]:
+# RemoteOK feed plus Indeed searches with different queries
+SCRAPE_QUERIES = ["software engineer", "python developer", "frontend developer", "backend developer"]
+
+
+# Every scrape task of a worker process runs on this one event loop, in a
+# thread of its own, so the tasks share the loop's browser pool and HTTP
+# client (a threads-pool worker runs several tasks at once) and one set of
+# source slots. Created on first use, after a prefork child has forked.
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_slots: Optional[SourceSlots] = None
+_worker_lock = threading.Lock()
+
+
+def scrape_units() -> List[ScrapeUnit]:
+    """The units of the daily scrape."""
+    return [ScrapeUnit("remoteok", limit=50)] + [
+        ScrapeUnit("indeed", query=query, limit=20) for query in SCRAPE_QUERIES
+    ]
+
+
+@celery_app.task(name='app.tasks.scrape_jobs_task')
+def scrape_jobs_task(
+    full_refresh: Optional[bool] = None,
+    resume: Optional[bool] = None,
+    aggregate: Optional[bool] = None,
+) -> Dict[str, Any]:
     """
     Scrape jobs from all configured sources.
-    Runs daily at midnight.
+    Runs daily at midnight. Fans out one scrape_unit_task per (source, query)
+    as a group, so units run on as many scraping workers as are available;
+    scrape_summary_task totals them once all have finished. Pass
+    full_refresh=True to ignore the per-source high-water marks and rescan
+    everything.
     """
     logger.info("Starting daily job scraping task")
     
+    units = scrape_units()
+    header = group(
+        scrape_unit_task.s(unit.source, unit.query, unit.limit, full_refresh, resume)
+        for unit in units
+    )
+    summary = chord(header)(scrape_summary_task.s(aggregate=aggregate))
+    
+    logger.info(f"Dispatched {len(units)} scrape units; summary task {summary.id}")
+    
+    return {
+        'status': 'dispatched',
+        'units': [unit.name for unit in units],
+        'summary_task_id': summary.id,
+        'timestamp': datetime.utcnow().isoformat()
+    }
+
+
+@celery_app.task(name='app.tasks.scrape_unit_task', bind=True, max_retries=3)
+def scrape_unit_task(
+    self,
+    source: str,
+    query: str,
+    limit: int,
+    full_refresh: Optional[bool] = None,
+    resume: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Scrape one (source, query) unit.
+    A failed unit is retried after 5 minutes; units that already finished
+    today are skipped unless resume=False. Always returns the unit's result,
+    even after the last retry, so the chord callback still runs.
+    """
+    unit = ScrapeUnit(source, query, limit)
+    
     try:
-        # Run the async scraping function
-        total_saved = asyncio.run(run_all_scrapers())
-        
-        logger.info(f"✅ Daily scraping complete. Saved {total_saved} new jobs")
-        
-        return {
-            'status': 'success',
-            'jobs_saved': total_saved,
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        
+        summary = run_on_worker_loop(run_scrape_units([unit], full_refresh=full_refresh, resume=resume))
+        result = dict(summary['units'][0])
+        result['high_water'] = summary['high_water'].get(source)
+        result['skipped'] = unit.name in summary['skipped']
+        result['resumed'] = unit.name in summary['resumed']
     except Exception as e:
-        logger.error(f"Error in scraping task: {str(e)}")
-        # Retry the task
-        raise self.retry(exc=e, countdown=300)  # Retry after 5 minutes
+        logger.error(f"Error in scrape unit {unit.name}: {str(e)}")
+        result = {
+            'unit': unit.name, 'source': source, 'query': query, 'status': 'error',
+            'fetched': 0, 'inserted': 0, 'error': str(e), 'high_water': None,
+            'skipped': False, 'resumed': False,
+        }
+    
+    if result['status'] not in ('success', 'skipped') and self.request.retries < self.max_retries:
+        # Only this unit runs again; the others are unaffected
+        logger.warning(f"Scrape unit {unit.name} failed, retrying in 5 minutes: {result['error']}")
+        raise self.retry(countdown=300)
+    
+    return result
 
 
-async def run_all_scrapers() -> int:
-    """Run all scrapers and return total jobs saved."""
+@celery_app.task(name='app.tasks.scrape_summary_task')
+def scrape_summary_task(results: List[Dict[str, Any]], aggregate: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Chord callback of scrape_jobs_task: total the unit results, advance the
+    high-water mark of every source whose units all succeeded, record the
+    run on source_configs and optionally start the stats aggregation.
+    """
+    failed = [result['unit'] for result in results if result['status'] not in ('success', 'skipped')]
+    jobs_saved = sum(result['inserted'] for result in results)
+    
+    session = Session(engine)
+    try:
+        for source in sorted({result['source'] for result in results}):
+            record_source_run(session, source, [result for result in results if result['source'] == source])
+    finally:
+        session.close()
+    
+    logger.info(f"✅ Daily scraping complete. Saved {jobs_saved} new jobs")
+    if failed:
+        logger.warning(f"Scrape units failed after retries: {failed}")
+    
+    if aggregate is None:
+        aggregate = get_settings().scrape_trigger_aggregation
+    if aggregate:
+        aggregate_daily_stats_task.delay()
+    
+    return {
+        'status': 'partial' if failed else 'success',
+        'jobs_saved': jobs_saved,
+        'skipped': [result['unit'] for result in results if result.get('skipped')],
+        'resumed': [result['unit'] for result in results if result.get('resumed')],
+        'failed': failed,
+        'units': results,
+        'timestamp': datetime.utcnow().isoformat()
+    }
+
+
+def record_source_run(session: Session, source: str, results: List[Dict[str, Any]]) -> None:
+    """Save a source's newest high-water mark, if all its units succeeded,
+    and the outcome of its run on source_configs."""
+    errors = sum(1 for result in results if result['status'] not in ('success', 'skipped'))
+    source_type = SCRAPERS[source].source_type
+    
+    marks = [
+        HighWaterMark(result['high_water']['external_id'], datetime.fromisoformat(result['high_water']['seen_at']))
+        for result in results if result.get('high_water')
+    ]
+    if marks and not errors:
+        save_high_water_mark(session, source, max(marks, key=lambda mark: mark.seen_at), source_type=source_type)
+    
+    config = session.exec(select(SourceConfig).where(SourceConfig.name == source)).first()
+    if config is None:
+        config = SourceConfig(name=source, source_type=source_type)
+    config.last_run_at = datetime.utcnow()
+    config.last_run_status = 'success' if not errors else ('error' if errors == len(results) else 'partial')
+    config.last_run_jobs_fetched = sum(result['fetched'] for result in results)
+    config.last_run_errors = errors
+    config.updated_at = datetime.utcnow()
+    session.add(config)
+    session.commit()
+
+
+async def run_scrape_units(
+    units: List[ScrapeUnit],
+    full_refresh: Optional[bool] = None,
+    resume: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """Run scrape units on the worker loop and return a per-unit summary.
+    High-water marks are reported, not saved; see record_source_run."""
     session = Session(engine)
-    total_saved = 0
     
     try:
-        # RemoteOK scraper
-        logger.info("Running RemoteOK scraper...")
-        remoteok_scraper = RemoteOKScraper(session)
-        remoteok_jobs = await remoteok_scraper.scrape(limit=50)
-        for job_data in remoteok_jobs:
-            if remoteok_scraper.save_job(job_data):
-                total_saved += 1
+        # One dimension cache shared by every scraper in the run
+        cache = DimensionCache()
+        # In a thread: other tasks' units share this worker's event loop
+        await asyncio.to_thread(cache.preload, session)
         
-        # Indeed scrapers with different queries
-        queries = ["software engineer", "python developer", "frontend developer", "backend developer"]
+        summary = await ScrapeOrchestrator(
+            session, units, cache=cache, full_refresh=full_refresh, resume=resume, save_high_water=False,
+            slots=worker_slots(), persistent=True
+        ).run()
         
-        for query in queries:
-            logger.info(f"Running Indeed scraper for '{query}'...")
-            indeed_scraper = IndeedScraper(session)
-            indeed_jobs = await indeed_scraper.scrape(search_query=query, limit=20)
-            for job_data in indeed_jobs:
-                if indeed_scraper.save_job(job_data):
-                    total_saved += 1
-        
-        return total_saved
+        logger.info(f"Dimension cache stats: {cache.stats()}")
+        return summary
         
     finally:
         session.close()
 
 
+def run_on_worker_loop(coroutine: Coroutine) -> Any:
+    """Run a coroutine on this process's worker loop and return its result."""
+    global _worker_loop
+    with _worker_lock:
+        if _worker_loop is None:
+            _worker_loop = asyncio.new_event_loop()
+            threading.Thread(target=_worker_loop.run_forever, name="scrape-loop", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coroutine, _worker_loop).result()
+
+
+def worker_slots() -> SourceSlots:
+    """This process's source slots; with the redis backend they are shared
+    with every other worker too."""
+    global _worker_slots
+    with _worker_lock:
+        if _worker_slots is None:
+            _worker_slots = create_source_slots(parse_concurrency(get_settings().scrape_source_concurrency))
+    return _worker_slots
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_worker_loop(**kwargs) -> None:
+    """Close the browser pool, HTTP client and slots of the worker loop, then stop it."""
+    global _worker_loop, _worker_slots
+    with _worker_lock:
+        loop, _worker_loop = _worker_loop, None
+        slots, _worker_slots = _worker_slots, None
+    if loop is None:
+        return
+    
+    async def close() -> None:
+        if slots is not None:
+            await slots.aclose()
+        await close_http_client()
+        # Only loaded, with Playwright, once a browser-based unit has run
+        browser = sys.modules.get("app.scrapers.browser")
+        if browser is not None:
+            await browser.close_browser_pool()
+    
+    try:
+        asyncio.run_coroutine_threadsafe(close(), loop).result(timeout=30)
+    except Exception as e:
+        logger.warning(f"Closing the worker loop's scrape resources failed: {str(e)}")
+    loop.call_soon_threadsafe(loop.stop)
+    shutdown_enrich_pool()
+
+
 @celery_app.task(name='app.tasks.aggregate_daily_stats_task', bind=True)
 def aggregate_daily_stats_task(self, target_date: str = None) -> Dict[str, Any]:
     """
@@ -89,33 +281,21 @@ def aggregate_daily_stats_task(self, target_date: str = None) -> Dict[str, Any]:
             # Aggregate stats for yesterday
             stats_date = (datetime.utcnow() - timedelta(days=1)).date()
         
-        session = Session(engine)
-        
-        # Aggregate skill stats
-        skill_count = aggregate_skill_stats(session, stats_date)
-        
-        # Aggregate location stats
-        location_count = aggregate_location_stats(session, stats_date)
-        
-        # Aggregate company stats
-        company_count = aggregate_company_stats(session, stats_date)
-        
-        # Aggregate global stats
-        aggregate_global_stats(session, stats_date)
+        # Skill, location and company stats side by side, then global stats
+        counts, timings = run_aggregation_stages(stats_date)
         
-        session.close()
-        
-        logger.info(f"✅ Daily stats aggregation complete for {stats_date}")
-        logger.info(f"   - Skills: {skill_count}")
-        logger.info(f"   - Locations: {location_count}")
-        logger.info(f"   - Companies: {company_count}")
+        logger.info(f"✅ Daily stats aggregation complete for {stats_date} in {timings['total']}s")
+        logger.info(f"   - Skills: {counts['skills']} ({timings['skills']}s)")
+        logger.info(f"   - Locations: {counts['locations']} ({timings['locations']}s)")
+        logger.info(f"   - Companies: {counts['companies']} ({timings['companies']}s)")
         
         return {
             'status': 'success',
             'date': stats_date.isoformat(),
-            'skills_aggregated': skill_count,
-            'locations_aggregated': location_count,
-            'companies_aggregated': company_count,
+            'skills_aggregated': counts['skills'],
+            'locations_aggregated': counts['locations'],
+            'companies_aggregated': counts['companies'],
+            'timings': timings,
             'timestamp': datetime.utcnow().isoformat()
         }
         
@@ -125,101 +305,130 @@ def aggregate_daily_stats_task(self, target_date: str = None) -> Dict[str, Any]:
 
 
 def aggregate_skill_stats(session: Session, stats_date: date) -> int:
-    """Aggregate daily statistics for each skill."""
-    count = 0
-    
-    # Get all active skills
-    skills = session.exec(select(Skill).where(Skill.is_active == True)).all()
-    
-    for skill in skills:
-        # Check if stats already exist
-        existing = session.exec(
-            select(DailySkillStats).where(
-                and_(
-                    DailySkillStats.skill_id == skill.id,
-                    DailySkillStats.date == stats_date
-                )
-            )
-        ).first()
-        
-        if existing:
-            continue
-        
-        # Count jobs for this skill
-        job_count = session.exec(
-            select(func.count(JobSkillLink.job_id)).where(
-                JobSkillLink.skill_id == skill.id
-            ).join(JobPosting, JobPosting.id == JobSkillLink.job_id).where(
-                JobPosting.is_active == True
-            )
-        ).one() or 0
-        
-        if job_count == 0:
-            continue
-        
-        # Count unique companies
-        unique_companies = session.exec(
-            select(func.count(func.distinct(JobPosting.company_id))).where(
-                JobPosting.id.in_(
-                    select(JobSkillLink.job_id).where(JobSkillLink.skill_id == skill.id)
-                ),
-                JobPosting.is_active == True
-            )
-        ).one() or 0
-        
-        # Count unique locations
-        unique_locations = session.exec(
-            select(func.count(func.distinct(JobPosting.location_id))).where(
-                JobPosting.id.in_(
-                    select(JobSkillLink.job_id).where(JobSkillLink.skill_id == skill.id)
-                ),
-                JobPosting.is_active == True
-            )
-        ).one() or 0
-        
-        # Calculate median salary
-        salaries = session.exec(
-            select(JobPosting.salary_max).where(
-                JobPosting.id.in_(
-                    select(JobSkillLink.job_id).where(JobSkillLink.skill_id == skill.id)
-                ),
-                JobPosting.salary_max.isnot(None),
-                JobPosting.is_active == True
-            )
-        ).all()
-        
-        median_salary = None
-        if salaries:
-            sorted_salaries = sorted(salaries)
-            mid = len(sorted_salaries) // 2
-            median_salary = sorted_salaries[mid]
-        
-        # Calculate growth rates (7d and 30d)
-        growth_7d = calculate_growth_rate(session, skill.id, stats_date, 7)
-        growth_30d = calculate_growth_rate(session, skill.id, stats_date, 30)
-        
-        # Create daily stat
-        daily_stat = DailySkillStats(
-            skill_id=skill.id,
-            date=stats_date,
-            job_count=job_count,
-            unique_companies=unique_companies,
-            unique_locations=unique_locations,
-            median_salary=median_salary,
-            growth_rate_7d=growth_7d,
-            growth_rate_30d=growth_30d,
-            created_at=datetime.utcnow()
-        )
-        
-        session.add(daily_stat)
-        count += 1
+    """Aggregate daily statistics for each skill.
+    
+    Job counts, distinct companies, distinct locations and 7/30-day growth
+    rates of every active skill come from one statement over the running
+    job counters (see skill_growth_statement and app.counters), median
+    salaries from one percentile query (see app.percentiles), and the new
+    rows are written in one bulk insert, so the number of queries does not
+    grow with the number of skills.
+    """
+    ensure_counters(session)
+    
+    # Skills that already have stats for this date
+    existing = set(session.exec(
+        select(DailySkillStats.skill_id).where(DailySkillStats.date == stats_date)
+    ).all())
+    
+    # Per-skill counts over active jobs, with growth rates
+    rows = [
+        row for row in session.execute(skill_growth_statement(stats_date, GROWTH_WINDOWS)).all()
+        if row.skill_id not in existing
+    ]
+    
+    if not rows:
+        return 0
+    
+    # Salary percentiles per skill, computed in the database
+    salaries = percentiles(
+        session,
+        active_salaries(JobSkillLink.skill_id).join(JobSkillLink, JobSkillLink.job_id == JobPosting.id)
+    )
     
+    now = datetime.utcnow()
+    daily_stats = []
+    for row in rows:
+        daily_stats.append({
+            "skill_id": row.skill_id,
+            "date": stats_date,
+            "job_count": row.job_count,
+            "unique_companies": row.unique_companies,
+            "unique_locations": row.unique_locations,
+            "median_salary": salaries.get(row.skill_id, Percentiles()).p50,
+            "growth_rate_7d": float(row.growth_7d),
+            "growth_rate_30d": float(row.growth_30d),
+            "created_at": now,
+        })
+    
+    session.execute(insert(DailySkillStats), daily_stats)
     session.commit()
-    return count
+    return len(daily_stats)
+
+
+# Growth windows in days stored on daily_skill_stats (growth_rate_7d, growth_rate_30d)
+GROWTH_WINDOWS = (7, 30)
+
+
+def skill_counts():
+    """Job count, distinct companies and distinct locations of each active
+    skill over active jobs, as one select over the running job counters."""
+    companies = pair_counts(SKILL_COMPANY)
+    locations = pair_counts(SKILL_LOCATION)
+    return (
+        select(
+            StatCounter.key_id.label("skill_id"),
+            StatCounter.job_count.label("job_count"),
+            func.coalesce(companies.c.n, 0).label("unique_companies"),
+            func.coalesce(locations.c.n, 0).label("unique_locations"),
+        )
+        .join(Skill, Skill.id == StatCounter.key_id)
+        .outerjoin(companies, companies.c.key_id == StatCounter.key_id)
+        .outerjoin(locations, locations.c.key_id == StatCounter.key_id)
+        .where(StatCounter.scope == SKILL, StatCounter.job_count > 0, Skill.is_active == True)
+    )
+
+
+def skill_growth_statement(stats_date: date, windows: Iterable[int]):
+    """skill_counts with a growth_<days>d column per window: the percentage
+    change from the job count stored for the skill <days> before
+    stats_date, or 0 when there is none.
+    
+    Each window left-joins daily_skill_stats once at its lag, so every
+    rate of every skill comes out of the same statement.
+    """
+    counts = skill_counts().subquery()
+    statement = select(counts).select_from(counts)
+    for days in windows:
+        past = aliased(DailySkillStats, name=f"past_{days}d")
+        statement = statement.outerjoin(past, and_(
+            past.skill_id == counts.c.skill_id,
+            past.date == stats_date - timedelta(days=days)
+        )).add_columns(
+            case(
+                (past.job_count > 0, func.round(
+                    cast((counts.c.job_count - past.job_count) * 100.0 / past.job_count, Numeric), 2
+                )),
+                else_=0.0
+            ).label(f"growth_{days}d")
+        )
+    return statement
 
 
-def calculate_growth_rate(session: Session, skill_id: int, current_date: date, days: int) -> float:
-    """Calculate growth rate for a skill over the specified period."""
+def skill_growth_rates(
+    session: Session, stats_date: date, windows: Iterable[int] = GROWTH_WINDOWS
+) -> Dict[int, Dict[int, float]]:
+    """Growth rate in percent of every active skill over each window (in
+    days) up to stats_date, keyed by skill id and then window."""
+    windows = list(windows)
+    return {
+        row.skill_id: {days: float(row[f"growth_{days}d"]) for days in windows}
+        for row in session.execute(skill_growth_statement(stats_date, windows)).mappings()
+    } if windows else {}
+
+
+def growth_rate(current_count: int, past_count: Optional[int]) -> float:
+    """Percentage change from past_count, or 0.0 without a usable past count."""
+    if not past_count:
+        return 0.0
+    return round(((current_count - past_count) / past_count) * 100, 2)
+
+
+def calculate_growth_rate(
+    session: Session, skill_id: int, current_date: date, days: int, current_count: Optional[int] = None
+) -> float:
+    """Calculate growth rate for a skill over the specified period.
+    Pass current_count when it is already known to skip recounting it."""
     past_date = current_date - timedelta(days=days)
     
     # Get past stat
@@ -232,125 +441,94 @@ def calculate_growth_rate(session: Session, skill_id: int, current_date: date, d
         )
     ).first()
     
-    # Get current count
-    current_count = session.exec(
-        select(func.count(JobSkillLink.job_id)).where(
-            JobSkillLink.skill_id == skill_id
-        ).join(JobPosting, JobPosting.id == JobSkillLink.job_id).where(
-            JobPosting.is_active == True
-        )
-    ).one() or 0
-    
     if not past_stat or past_stat.job_count == 0:
         return 0.0
     
-    # Calculate percentage change
-    growth = ((current_count - past_stat.job_count) / past_stat.job_count) * 100
-    return round(growth, 2)
-
-
-def aggregate_location_stats(session: Session, stats_date: date) -> int:
-    """Aggregate daily statistics for each location."""
-    count = 0
-    
-    locations = session.exec(select(Location)).all()
-    
-    for location in locations:
-        # Check if stats already exist
-        existing = session.exec(
-            select(DailyLocationStats).where(
-                and_(
-                    DailyLocationStats.location_id == location.id,
-                    DailyLocationStats.date == stats_date
-                )
-            )
-        ).first()
-        
-        if existing:
-            continue
-        
-        # Count active jobs
-        job_count = session.exec(
-            select(func.count(JobPosting.id)).where(
-                JobPosting.location_id == location.id,
+    # Get current count
+    if current_count is None:
+        current_count = session.exec(
+            select(func.count(JobSkillLink.job_id)).where(
+                JobSkillLink.skill_id == skill_id
+            ).join(JobPosting, JobPosting.id == JobSkillLink.job_id).where(
                 JobPosting.is_active == True
             )
         ).one() or 0
-        
-        if job_count == 0:
-            continue
-        
-        # Calculate average salary
-        avg_salary = session.exec(
-            select(func.avg(JobPosting.salary_max)).where(
-                JobPosting.location_id == location.id,
-                JobPosting.salary_max.isnot(None),
-                JobPosting.is_active == True
-            )
-        ).first()
-        
-        daily_stat = DailyLocationStats(
-            location_id=location.id,
-            date=stats_date,
-            job_count=job_count,
-            avg_salary=avg_salary,
-            created_at=datetime.utcnow()
-        )
-        
-        session.add(daily_stat)
-        count += 1
     
+    return growth_rate(current_count, past_stat.job_count)
+
+
+def aggregate_location_stats(session: Session, stats_date: date) -> int:
+    """Aggregate daily statistics for each location from the running job
+    counters, in one bulk insert."""
+    ensure_counters(session)
+    
+    # Locations that already have stats for this date
+    existing = set(session.exec(
+        select(DailyLocationStats.location_id).where(DailyLocationStats.date == stats_date)
+    ).all())
+    
+    job_counts = {
+        location_id: job_count for location_id, job_count in counts(session, LOCATION).items()
+        if location_id not in existing
+    }
+    if not job_counts:
+        return 0
+    
+    salaries = percentiles(session, active_salaries(JobPosting.location_id))
+    
+    now = datetime.utcnow()
+    session.execute(insert(DailyLocationStats), [
+        {
+            "location_id": location_id,
+            "date": stats_date,
+            "job_count": job_count,
+            "median_salary": salaries.get(location_id, Percentiles()).p50,
+            "created_at": now,
+        }
+        for location_id, job_count in job_counts.items()
+    ])
     session.commit()
-    return count
+    return len(job_counts)
 
 
 def aggregate_company_stats(session: Session, stats_date: date) -> int:
-    """Aggregate daily statistics for each company."""
-    count = 0
-    
-    companies = session.exec(select(Company)).all()
-    
-    for company in companies:
-        # Check if stats already exist
-        existing = session.exec(
-            select(DailyCompanyStats).where(
-                and_(
-                    DailyCompanyStats.company_id == company.id,
-                    DailyCompanyStats.date == stats_date
-                )
-            )
-        ).first()
-        
-        if existing:
-            continue
-        
-        # Count active jobs
-        job_count = session.exec(
-            select(func.count(JobPosting.id)).where(
-                JobPosting.company_id == company.id,
-                JobPosting.is_active == True
-            )
-        ).one() or 0
-        
-        if job_count == 0:
-            continue
-        
-        daily_stat = DailyCompanyStats(
-            company_id=company.id,
-            date=stats_date,
-            job_count=job_count,
-            created_at=datetime.utcnow()
-        )
-        
-        session.add(daily_stat)
-        count += 1
+    """Aggregate daily statistics for each company from the running job
+    counters, in one bulk insert."""
+    ensure_counters(session)
+    
+    # Companies that already have stats for this date
+    existing = set(session.exec(
+        select(DailyCompanyStats.company_id).where(DailyCompanyStats.date == stats_date)
+    ).all())
+    
+    job_counts = {
+        company_id: job_count for company_id, job_count in counts(session, COMPANY).items()
+        if company_id not in existing
+    }
+    if not job_counts:
+        return 0
     
+    salaries = percentiles(session, active_salaries(JobPosting.company_id))
+    
+    now = datetime.utcnow()
+    session.execute(insert(DailyCompanyStats), [
+        {
+            "company_id": company_id,
+            "date": stats_date,
+            "job_count": job_count,
+            "median_salary": salaries.get(company_id, Percentiles()).p50,
+            "created_at": now,
+        }
+        for company_id, job_count in job_counts.items()
+    ])
     session.commit()
-    return count
+    return len(job_counts)
 
 
 def aggregate_global_stats(session: Session, stats_date: date):
-    """Aggregate global daily statistics."""
+    """Aggregate global daily statistics from the running job counters."""
+    ensure_counters(session)
+    
     # Check if stats already exist
     existing = session.exec(
         select(DailyGlobalStats).where(DailyGlobalStats.date == stats_date)
@@ -359,33 +537,24 @@ def aggregate_global_stats(session: Session, stats_date: date):
     if existing:
         return
     
-    # Count totals
-    total_jobs = session.exec(
-        select(func.count(JobPosting.id)).where(JobPosting.is_active == True)
-    ).one() or 0
+    # Active jobs, and skills, companies and locations with active jobs
+    total_jobs = counts(session, GLOBAL).get(0, 0)
+    entities = dict(session.exec(
+        select(StatCounter.scope, func.count()).where(
+            StatCounter.scope.in_([SKILL, COMPANY, LOCATION]),
+            StatCounter.job_count > 0
+        ).group_by(StatCounter.scope)
+    ).all())
     
-    unique_skills = session.exec(
-        select(func.count(func.distinct(JobSkillLink.skill_id)))
-    ).one() or 0
-    
-    unique_companies = session.exec(
-        select(func.count(func.distinct(JobPosting.company_id))).where(
-            JobPosting.is_active == True
-        )
-    ).one() or 0
-    
-    unique_locations = session.exec(
-        select(func.count(func.distinct(JobPosting.location_id))).where(
-            JobPosting.is_active == True
-        )
-    ).one() or 0
+    median_salary = percentiles(session, active_salaries()).get(None, Percentiles()).p50
     
     daily_stat = DailyGlobalStats(
         date=stats_date,
         total_jobs=total_jobs,
-        unique_skills=unique_skills,
-        unique_companies=unique_companies,
-        unique_locations=unique_locations,
+        unique_skills=entities.get(SKILL, 0),
+        unique_companies=entities.get(COMPANY, 0),
+        unique_locations=entities.get(LOCATION, 0),
+        median_salary=median_salary,
         created_at=datetime.utcnow()
     )
     
@@ -393,6 +562,53 @@ def aggregate_global_stats(session: Session, stats_date: date):
     session.commit()
 
 
+# Stages that write separate tables from the same counters and can run side
+# by side; global stats summarise the day and run once they have all finished
+AGGREGATION_STAGES: Dict[str, Callable[[Session, date], int]] = {
+    "skills": aggregate_skill_stats,
+    "locations": aggregate_location_stats,
+    "companies": aggregate_company_stats,
+}
+
+
+def run_aggregation_stages(
+    stats_date: date, workers: Optional[int] = None, db_engine=engine
+) -> Tuple[Dict[str, int], Dict[str, float]]:
+    """Run the skill, location and company stages in a thread pool, each on
+    its own session, then the global stage. Returns the rows written by
+    each stage and each stage's wall time in seconds (plus the total).
+    
+    A failing stage is raised only after the others finish, and the global
+    stage never runs for a day whose other stages did not all succeed;
+    stages skip entities that already have stats for the date, so a retry
+    picks up where the failed run stopped.
+    """
+    workers = workers or get_settings().aggregation_workers
+    started = time.perf_counter()
+    
+    # Built once here rather than by several stages at the same time
+    with Session(db_engine) as session:
+        ensure_counters(session)
+    
+    def run_stage(stage: Callable[[Session, date], Any]) -> Tuple[Any, float]:
+        start = time.perf_counter()
+        with Session(db_engine) as session:
+            result = stage(session, stats_date)
+        return result, round(time.perf_counter() - start, 3)
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="aggregate") as pool:
+        futures = {name: pool.submit(run_stage, stage) for name, stage in AGGREGATION_STAGES.items()}
+        wait(futures.values())
+    
+    counts, timings = {}, {}
+    for name, future in futures.items():
+        counts[name], timings[name] = future.result()
+    
+    _, timings["global"] = run_stage(aggregate_global_stats)
+    timings["total"] = round(time.perf_counter() - started, 3)
+    return counts, timings
+
+
 @celery_app.task(name='app.tasks.cleanup_old_jobs_task')
 def cleanup_old_jobs_task() -> Dict[str, Any]:
     """
@@ -419,6 +635,9 @@ def cleanup_old_jobs_task() -> Dict[str, Any]:
             job.is_active = False
             count += 1
         
+        # Take them out of the running stats in the same transaction
+        record_jobs(session, load_job_keys(session, [job.id for job in result]).values(), -1)
+        
         session.commit()
         session.close()
         
@@ -435,6 +654,36 @@ def cleanup_old_jobs_task() -> Dict[str, Any]:
         return {'status': 'error', 'message': str(e)}
 
 
+@celery_app.task(name='app.tasks.reconcile_counters_task')
+def reconcile_counters_task() -> Dict[str, Any]:
+    """
+    Recount the running job counters from scratch and replace them,
+    reporting any that had drifted.
+    Runs daily at 3 AM.
+    """
+    logger.info("Starting stat counter reconciliation task")
+    
+    try:
+        session = Session(engine)
+        mismatches = rebuild_counters(session)
+        session.close()
+        
+        if mismatches:
+            logger.warning(f"Stat counters had drifted and were corrected: {mismatches}")
+        else:
+            logger.info("✅ Stat counters match a full recount")
+        
+        return {
+            'status': 'success',
+            'mismatches': mismatches,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in counter reconciliation task: {str(e)}")
+        return {'status': 'error', 'message': str(e)}
+
+
 # Manual trigger tasks
 @celery_app.task(name='app.tasks.trigger_scraping_now')
 def trigger_scraping_now():
@@ -1,14 +1,87 @@
 """
 Start Celery worker to process tasks.
-Run: python -m app.worker
+Run: python -m app.worker [scraping|analytics|maintenance|all]
+
+Each profile consumes its own queue with an execution model suited to it:
+threads for the I/O-bound scraping queue, prefork processes for the
+CPU and database heavy analytics queue, and a single solo worker for
+maintenance. "all" consumes every queue from one worker. On Windows,
+where prefork is unsupported, every profile defaults to solo with a
+concurrency of 1. WORKER_POOL, WORKER_CONCURRENCY,
+WORKER_PREFETCH_MULTIPLIER and WORKER_MAX_TASKS_PER_CHILD override the
+chosen profile.
 """
 
+import argparse
+import os
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
 from app.celery_app import celery_app
+from app.config import Settings, get_settings
 
-if __name__ == '__main__':
-    celery_app.worker_main([
+
+class WorkerProfile(NamedTuple):
+    queues: List[str]
+    pool: str  # prefork, threads or solo
+    concurrency: int
+    prefetch_multiplier: int = 1
+    # Recycle a prefork child after this many tasks; ignored by other pools
+    max_tasks_per_child: Optional[int] = None
+
+
+CPUS = os.cpu_count() or 1
+
+WORKER_PROFILES: Dict[str, WorkerProfile] = {
+    # Tasks mostly wait on the network, so many threads share one process
+    "scraping": WorkerProfile(["scraping"], "threads", 8),
+    "analytics": WorkerProfile(["analytics"], "prefork", CPUS, max_tasks_per_child=100),
+    "maintenance": WorkerProfile(["maintenance", "celery"], "solo", 1),
+    "all": WorkerProfile(["scraping", "analytics", "maintenance", "celery"], "prefork", max(2, CPUS), max_tasks_per_child=100),
+}
+
+# Windows has no fork, so keep one solo worker there, as before profiles
+WINDOWS_PROFILES: Dict[str, WorkerProfile] = {
+    name: profile._replace(pool="solo", concurrency=1) for name, profile in WORKER_PROFILES.items()
+}
+
+
+def resolve_profile(name: str, settings: Settings, platform: str = sys.platform) -> WorkerProfile:
+    """The named profile for this platform, with any configured overrides."""
+    profiles = WINDOWS_PROFILES if platform == "win32" else WORKER_PROFILES
+    if name not in profiles:
+        raise ValueError(f"Unknown worker profile {name!r}; choose from {', '.join(profiles)}")
+    profile = profiles[name]
+    return profile._replace(
+        pool=settings.worker_pool or profile.pool,
+        concurrency=settings.worker_concurrency or profile.concurrency,
+        prefetch_multiplier=settings.worker_prefetch_multiplier or profile.prefetch_multiplier,
+        max_tasks_per_child=settings.worker_max_tasks_per_child or profile.max_tasks_per_child,
+    )
+
+
+def worker_argv(name: str, profile: WorkerProfile) -> List[str]:
+    argv = [
         'worker',
         '--loglevel=info',
-        '--pool=solo',  # Use solo pool for Windows compatibility
-        '--concurrency=1',
-    ])
+        f'--hostname={name}@%h',
+        f'--queues={",".join(profile.queues)}',
+        f'--pool={profile.pool}',
+        f'--concurrency={profile.concurrency}',
+        f'--prefetch-multiplier={profile.prefetch_multiplier}',
+    ]
+    if profile.pool == 'prefork' and profile.max_tasks_per_child:
+        argv.append(f'--max-tasks-per-child={profile.max_tasks_per_child}')
+    return argv
+
+
+if __name__ == '__main__':
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Start a Celery worker with a named profile.")
+    parser.add_argument(
+        "profile", nargs="?", default=settings.worker_profile, choices=sorted(WORKER_PROFILES),
+        help="queues and pool settings to run with (default: WORKER_PROFILE or all)"
+    )
+    args = parser.parse_args()
+
+    celery_app.worker_main(worker_argv(args.profile, resolve_profile(args.profile, settings)))
@@ -0,0 +1,134 @@
+"""
+Queries and time of the daily aggregation stages by number of skills,
+after a full recount that builds the running job counters they read,
+against a synthetic job table in a fresh SQLite file (or Postgres when
+BENCH_POSTGRES_URL points at a throwaway database: its tables are dropped
+and recreated on every run). Each stage's rows are checked against
+counts and medians computed in Python from the seeded data; "all xN"
+rows run every stage of the daily task with N threads.
+Run: python -m benchmarks.bench_aggregation [jobs]
+"""
+
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.counters import rebuild_counters
+from app.models import Company, DailySkillStats, JobPosting, JobSkillLink, Location, Skill
+from app.tasks import aggregate_skill_stats, run_aggregation_stages
+from benchmarks.bench_pipeline import QueryCounter
+
+STATS_DATE = date(2026, 1, 31)
+
+
+def seed(engine, skills: int, jobs: int, rng: random.Random) -> List[Tuple[int, int, int, bool, float, List[int]]]:
+    """Fill the tables; returns (job_id, company_id, location_id, is_active,
+    salary_max, skill_ids) per job for the reference counts."""
+    companies, locations = max(10, jobs // 20), max(5, jobs // 100)
+    now = datetime.utcnow()
+    seeded = []
+    with Session(engine) as session:
+        session.execute(insert(Skill), [{"id": i, "name": f"skill-{i}", "is_active": i % 25 != 0} for i in range(1, skills + 1)])
+        session.execute(insert(Company), [{"id": i, "name": f"company-{i}"} for i in range(1, companies + 1)])
+        session.execute(insert(Location), [{"id": i, "city": f"city-{i}", "country": "US"} for i in range(1, locations + 1)])
+        postings, links = [], []
+        for job_id in range(1, jobs + 1):
+            job = (
+                job_id, rng.randint(1, companies), rng.randint(1, locations), rng.random() > 0.1,
+                rng.choice([None, rng.randrange(50_000, 250_000, 1_000)]),
+                rng.sample(range(1, skills + 1), rng.randint(1, min(8, skills))),
+            )
+            seeded.append(job)
+            postings.append({
+                "id": job_id, "source": "bench", "title": f"job {job_id}", "company_id": job[1],
+                "location_id": job[2], "is_active": job[3], "salary_max": job[4], "created_at": now,
+            })
+            links.extend({"job_id": job_id, "skill_id": skill_id} for skill_id in job[5])
+        session.execute(insert(JobPosting), postings)
+        session.execute(insert(JobSkillLink), links)
+        # History for the growth rates
+        session.execute(insert(DailySkillStats), [
+            {"skill_id": skill_id, "date": STATS_DATE - timedelta(days=days), "job_count": rng.randint(1, 50), "created_at": now}
+            for days in (7, 30) for skill_id in range(1, skills + 1)
+        ])
+        session.commit()
+    return seeded
+
+
+def expected_skill_stats(seeded) -> Dict[int, Tuple[int, int, int, Optional[float]]]:
+    jobs, companies, locations, salaries = defaultdict(int), defaultdict(set), defaultdict(set), defaultdict(list)
+    for _, company_id, location_id, is_active, salary, skill_ids in seeded:
+        if is_active:
+            for skill_id in skill_ids:
+                if skill_id % 25 != 0:
+                    jobs[skill_id] += 1
+                    companies[skill_id].add(company_id)
+                    locations[skill_id].add(location_id)
+                    if salary is not None:
+                        salaries[skill_id].append(salary)
+    return {
+        skill_id: (
+            jobs[skill_id], len(companies[skill_id]), len(locations[skill_id]),
+            statistics.median(salaries[skill_id]) if salaries[skill_id] else None,
+        )
+        for skill_id in jobs
+    }
+
+
+def make_engine(name: str):
+    url = os.getenv("BENCH_POSTGRES_URL")
+    if url:
+        engine = create_engine(url)
+        SQLModel.metadata.drop_all(engine)
+    else:
+        engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), name)}")
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+if __name__ == "__main__":
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    logging.disable(logging.WARNING)
+
+    print(f"{jobs:,} jobs, {os.getenv('BENCH_POSTGRES_URL') and 'Postgres' or 'SQLite'}")
+    print(f"  {'skills':>7} {'stage':<8} {'rows':>6} {'queries':>8} {'time':>9}")
+    for skills in (50, 200, 800):
+        engine = make_engine(f"aggregation-{skills}.db")
+        seeded = seed(engine, skills, jobs, random.Random(skills))
+        counter = QueryCounter()
+        counter.attach(engine)
+
+        # Full recount that builds the running counters, as reconcile_counters_task does
+        with Session(engine) as session:
+            start = time.perf_counter()
+            rebuild_counters(session)
+            elapsed = time.perf_counter() - start
+        print(f"  {skills:>7} {'recount':<8} {'':>6} {counter.count:>8} {elapsed:>8.3f}s")
+        counter.count = 0
+
+        with Session(engine) as session:
+            start = time.perf_counter()
+            rows = aggregate_skill_stats(session, STATS_DATE)
+            elapsed = time.perf_counter() - start
+            stats = session.exec(select(DailySkillStats).where(DailySkillStats.date == STATS_DATE)).all()
+
+        actual = {stat.skill_id: (stat.job_count, stat.unique_companies, stat.unique_locations, stat.median_salary) for stat in stats}
+        assert actual == expected_skill_stats(seeded), f"skill stats differ with {skills} skills"
+        print(f"  {skills:>7} {'skill':<8} {rows:>6} {counter.count:>8} {elapsed:>8.3f}s")
+
+        # Every stage of aggregate_daily_stats_task, serial and in threads
+        for workers in (1, 3):
+            counter.count = 0
+            counts, timings = run_aggregation_stages(STATS_DATE + timedelta(days=workers), workers=workers, db_engine=engine)
+            print(f"  {skills:>7} {f'all x{workers}':<8} {sum(counts.values()):>6} {counter.count:>8} {timings['total']:>8.3f}s")
+        engine.dispose()
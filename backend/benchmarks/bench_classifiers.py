@@ -0,0 +1,173 @@
+"""
+Correctness and throughput of the employment type, seniority and remote
+type classifiers. Checks the rule tables against the labelled cases in
+benchmarks/fixtures/classifier_cases.json (exits non-zero on a mismatch),
+then compares the compiled classifiers with the old substring checks
+(fast, but they stop at false hits such as "sr" in "description") and
+with the same checks written as per-call whole-word regex searches.
+Run: python -m benchmarks.bench_classifiers [count]
+"""
+
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from app.models import EmploymentType, RemoteType, SeniorityLevel
+from app.scrapers.classifiers import (
+    classify_batch, classify_employment_type, classify_remote_type, classify_seniority
+)
+from benchmarks.corpus import make_jobs
+
+CASES = Path(__file__).parent / "fixtures" / "classifier_cases.json"
+
+
+def legacy_employment_type(text: str) -> EmploymentType:
+    """Substring checks that BaseScraper.parse_employment_type used before the rule table."""
+    text_lower = text.lower()
+    if "full" in text_lower and "time" in text_lower:
+        return EmploymentType.FULL_TIME
+    elif "part" in text_lower and "time" in text_lower:
+        return EmploymentType.PART_TIME
+    elif "contract" in text_lower:
+        return EmploymentType.CONTRACT
+    elif "freelance" in text_lower:
+        return EmploymentType.FREELANCE
+    elif "intern" in text_lower:
+        return EmploymentType.INTERNSHIP
+    return EmploymentType.FULL_TIME
+
+
+def legacy_seniority(title: str, description: str = "") -> SeniorityLevel:
+    text = (title + " " + description).lower()
+    if any(word in text for word in ["cto", "ceo", "cfo", "chief"]):
+        return SeniorityLevel.C_LEVEL
+    elif any(word in text for word in ["vp", "vice president"]):
+        return SeniorityLevel.VP
+    elif "director" in text:
+        return SeniorityLevel.DIRECTOR
+    elif "manager" in text or "lead" in text:
+        return SeniorityLevel.MANAGER
+    elif "principal" in text or "staff" in text:
+        return SeniorityLevel.PRINCIPAL
+    elif "senior" in text or "sr" in text:
+        return SeniorityLevel.SENIOR
+    elif "junior" in text or "jr" in text or "entry" in text:
+        return SeniorityLevel.JUNIOR
+    else:
+        return SeniorityLevel.MID
+
+
+def legacy_remote_type(text: str) -> RemoteType:
+    text_lower = text.lower()
+    if "remote" in text_lower and "hybrid" not in text_lower:
+        return RemoteType.REMOTE
+    elif "hybrid" in text_lower:
+        return RemoteType.HYBRID
+    else:
+        return RemoteType.ONSITE
+
+
+def legacy_classify(title: str, description: str):
+    text = title + " " + description
+    return legacy_employment_type(text), legacy_seniority(title, description), legacy_remote_type(text)
+
+
+def bounded_classify(title: str, description: str):
+    """The legacy chains with each substring check made a whole-word regex
+    search, as a straightforward fix would write them."""
+    text = (title + " " + description).lower()
+
+    def has(*words):
+        return any(re.search(r"\b" + re.escape(word).replace(r"\ ", "[ -]") + r"\b", text) for word in words)
+
+    if has("full time", "fulltime"):
+        employment = EmploymentType.FULL_TIME
+    elif has("part time", "parttime"):
+        employment = EmploymentType.PART_TIME
+    elif has("contract", "contractor", "contracts"):
+        employment = EmploymentType.CONTRACT
+    elif has("freelance", "freelancer"):
+        employment = EmploymentType.FREELANCE
+    elif has("intern", "interns", "internship", "internships"):
+        employment = EmploymentType.INTERNSHIP
+    else:
+        employment = EmploymentType.FULL_TIME
+
+    if has("cto", "ceo", "cfo", "chief"):
+        seniority = SeniorityLevel.C_LEVEL
+    elif has("vp", "vice president"):
+        seniority = SeniorityLevel.VP
+    elif has("director", "directors"):
+        seniority = SeniorityLevel.DIRECTOR
+    elif has("manager", "managers", "lead"):
+        seniority = SeniorityLevel.MANAGER
+    elif has("principal", "staff"):
+        seniority = SeniorityLevel.PRINCIPAL
+    elif has("senior", "sr"):
+        seniority = SeniorityLevel.SENIOR
+    elif has("junior", "jr", "entry level"):
+        seniority = SeniorityLevel.JUNIOR
+    else:
+        seniority = SeniorityLevel.MID
+
+    if has("hybrid"):
+        remote = RemoteType.HYBRID
+    elif has("remote", "remotely", "work from home", "wfh"):
+        remote = RemoteType.REMOTE
+    else:
+        remote = RemoteType.ONSITE
+    return employment, seniority, remote
+
+
+def compiled_classify(title: str, description: str):
+    text = title + " " + description
+    return classify_employment_type(text), classify_seniority(title, description), classify_remote_type(text)
+
+
+def check_cases() -> int:
+    """Print every case the rule tables get wrong; return how many."""
+    cases = json.loads(CASES.read_text(encoding="utf-8"))
+    results = classify_batch([(case["title"], case["description"]) for case in cases])
+    failures, legacy_wrong = 0, 0
+    for case, result in zip(cases, results):
+        expected = (case["employment_type"], case["seniority"], case["remote_type"])
+        got = tuple(label.value for label in result)
+        if got != expected:
+            failures += 1
+            print(f"  FAIL {case['note']}: expected {expected}, got {got}")
+        if tuple(label.value for label in legacy_classify(case["title"], case["description"])) != expected:
+            legacy_wrong += 1
+    print(f"{len(cases) - failures}/{len(cases)} labelled cases correct (legacy checks: {len(cases) - legacy_wrong})")
+    return failures
+
+
+def run(name: str, classify, jobs) -> float:
+    start = time.perf_counter()
+    classify(jobs)
+    elapsed = time.perf_counter() - start
+    rate = len(jobs) / elapsed
+    print(f"  {name:<10} {elapsed:8.3f}s  {rate:12,.0f} jobs/sec")
+    return rate
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    if check_cases():
+        sys.exit(1)
+
+    for sentences in (12, 60):
+        jobs = make_jobs(count, sentences=sentences)
+        avg_len = sum(len(d) for _, d in jobs) // len(jobs)
+        print(f"\n{count:,} descriptions, ~{avg_len:,} chars each")
+        legacy = run("legacy", lambda jobs: [legacy_classify(t, d) for t, d in jobs], jobs)
+        bounded = run("bounded", lambda jobs: [bounded_classify(t, d) for t, d in jobs], jobs)
+        run("compiled", lambda jobs: [compiled_classify(t, d) for t, d in jobs], jobs)
+        batch = run("batch", classify_batch, jobs)
+        print(f"  speedup    {batch / bounded:.1f}x vs bounded, {batch / legacy:.1f}x vs legacy")
+        assert [tuple(c) for c in classify_batch(jobs)] == [bounded_classify(t, d) for t, d in jobs]
+        relabelled = sum(
+            tuple(c) != legacy_classify(t, d) for c, (t, d) in zip(classify_batch(jobs), jobs)
+        )
+        print(f"  labels differing from legacy: {relabelled:,} of {count:,}")
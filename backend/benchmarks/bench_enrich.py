@@ -0,0 +1,52 @@
+"""
+Throughput of the enrichment stage (skills, classification, salary) by
+worker count. Workers=1 is the serial in-process path; larger counts run
+chunks in the process pool. Pool start-up is reported separately.
+Run: python -m benchmarks.bench_enrich [count]
+"""
+
+import logging
+import os
+import sys
+import time
+
+from app.scrapers.enrich import enrich_jobs, get_enrich_pool, shutdown_enrich_pool
+from app.scrapers.remoteok import RemoteOKScraper
+from benchmarks.corpus import make_remoteok_feed
+
+
+def raw_jobs(count: int) -> list:
+    scraper = RemoteOKScraper(None)
+    return [
+        scraper.parse_listing(listing, listing["id"], scraper.parse_epoch(listing["epoch"]))
+        for listing in make_remoteok_feed(count, sentences=60)[1:]
+    ]
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    logging.disable(logging.WARNING)
+    jobs = raw_jobs(count)
+
+    print(f"{count:,} RemoteOK listings, ~{sum(len(j['description']) for j in jobs) // count:,} chars each, {os.cpu_count()} CPUs")
+    print(f"  {'workers':>7} {'startup':>9} {'time':>9} {'jobs/sec':>11} {'speedup':>8}")
+    serial = None
+    reference = None
+    for workers in (1, 2, 4, 8):
+        startup = 0.0
+        if workers > 1:
+            start = time.perf_counter()
+            # Spawn every worker up front so start-up is not counted as enrichment
+            pool = get_enrich_pool(workers)
+            list(pool.map(abs, range(workers * 4)))
+            startup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        enriched = enrich_jobs(RemoteOKScraper, jobs, workers=workers, chunk_size=500)
+        elapsed = time.perf_counter() - start
+        shutdown_enrich_pool()
+
+        if reference is None:
+            serial, reference = elapsed, enriched
+        assert enriched == reference, f"{workers} workers gave different results"
+        print(f"  {workers:>7} {startup:>8.2f}s {elapsed:>8.2f}s {count / elapsed:>11,.0f} {serial / elapsed:>7.2f}x")
@@ -0,0 +1,263 @@
+"""
+Parse and save throughput of the scraping pipeline, against recorded fixtures.
+Reports jobs/sec, peak allocated KiB per job (tracemalloc) and database
+queries per job, and compares them with a stored baseline.
+
+Fixtures live in benchmarks/fixtures (see benchmarks.record_fixtures).
+save_job/save_jobs run against a fresh SQLite file, and also against
+Postgres when BENCH_POSTGRES_URL points at a throwaway database: its
+tables are dropped and recreated on every run.
+
+Run: python -m benchmarks.bench_pipeline [--save-baseline] [--check]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from bs4 import BeautifulSoup
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.scrapers.cache import DimensionCache
+from app.scrapers.http import HTTPClient
+from app.scrapers.indeed import CARD_SELECTOR, IndeedScraper
+from app.scrapers.remoteok import RemoteOKScraper
+from benchmarks.record_fixtures import INDEED_FIXTURE, REMOTEOK_FIXTURE
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+# A run whose jobs/sec falls more than this far below the baseline is a regression
+TOLERANCE = 0.25
+
+# A benchmark prepares fresh state (untimed) and returns the workload,
+# which returns how many jobs it processed
+Workload = Callable[[], int]
+
+
+class QueryCounter:
+    """Counts statements executed on the engines it is attached to."""
+
+    def __init__(self):
+        self.count = 0
+
+    def attach(self, engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args) -> None:
+        self.count += 1
+
+
+def load_fixtures() -> Tuple[bytes, List[str]]:
+    feed = REMOTEOK_FIXTURE.read_bytes()
+    soup = BeautifulSoup(INDEED_FIXTURE.read_text(encoding="utf-8"), "lxml")
+    cards = [str(card) for card in soup.select(CARD_SELECTOR)]
+    return feed, cards
+
+
+def parsed_jobs(feed: bytes, cards: List[str]) -> List[Dict[str, Any]]:
+    """Job dicts from both fixtures, as the scrapers hand them to save_job."""
+    remoteok, indeed = RemoteOKScraper(None), IndeedScraper(None)
+    jobs = [
+        ("remoteok", RemoteOKScraper.enrich(
+            remoteok.parse_listing(listing, str(listing["id"]), remoteok.parse_epoch(listing.get("epoch")))
+        ))
+        for listing in json.loads(feed)[1:]
+    ]
+    for i, html in enumerate(cards):
+        job = indeed.parse_card(IndeedScraper.card_fields_from_html(html), i)
+        if job:
+            jobs.append(("indeed", IndeedScraper.enrich(job)))
+    return jobs
+
+
+def remoteok_scrape(feed: bytes) -> Callable[[], Workload]:
+    def prepare() -> Workload:
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, content=feed))
+        scraper = RemoteOKScraper(None, http_client=HTTPClient(transport=transport, validators={}))
+        return lambda: len(asyncio.run(scraper.scrape(limit=sys.maxsize)))
+    return prepare
+
+
+def indeed_card_html(cards: List[str]) -> Callable[[], Workload]:
+    def prepare() -> Workload:
+        scraper = IndeedScraper(None)
+
+        def run() -> int:
+            for i, html in enumerate(cards):
+                IndeedScraper.enrich(scraper.parse_card(IndeedScraper.card_fields_from_html(html), i))
+            return len(cards)
+        return run
+    return prepare
+
+
+def indeed_parse_card(cards: List[str]) -> Callable[[], Workload]:
+    # Fields as the in-page extraction returns them, so only parse_card and enrich are timed
+    fields = [IndeedScraper.card_fields_from_html(html) for html in cards]
+
+    def prepare() -> Workload:
+        scraper = IndeedScraper(None)
+
+        def run() -> int:
+            for i, card in enumerate(fields):
+                IndeedScraper.enrich(scraper.parse_card(card, i))
+            return len(fields)
+        return run
+    return prepare
+
+
+def text_workload(method: str, texts: List[Tuple[str, str]], rounds: int = 20) -> Callable[[], Workload]:
+    def prepare() -> Workload:
+        parse = getattr(RemoteOKScraper(None), method)
+
+        def run() -> int:
+            for _ in range(rounds):
+                for title, description in texts:
+                    parse(title, description)
+            return len(texts) * rounds
+        return run
+    return prepare
+
+
+def save_workload(url_factory: Callable[[], str], jobs, counter: QueryCounter, batch: bool) -> Callable[[], Workload]:
+    def prepare() -> Workload:
+        engine = create_engine(url_factory())
+        SQLModel.metadata.drop_all(engine)
+        SQLModel.metadata.create_all(engine)
+        counter.attach(engine)
+        session = Session(engine)
+        cache = DimensionCache()
+        scrapers = {"remoteok": RemoteOKScraper(session, cache), "indeed": IndeedScraper(session, cache)}
+
+        def run() -> int:
+            try:
+                if batch:
+                    for source, scraper in scrapers.items():
+                        scraper.save_jobs([job for job_source, job in jobs if job_source == source])
+                else:
+                    for source, job in jobs:
+                        scrapers[source].save_job(job)
+                return len(jobs)
+            finally:
+                session.close()
+                engine.dispose()
+        return run
+    return prepare
+
+
+def measure(prepare: Callable[[], Workload], counter: Optional[QueryCounter], repeat: int) -> Dict[str, float]:
+    """Best jobs/sec over repeat timed runs, then one traced run for memory."""
+    rates, queries = [], []
+    for _ in range(repeat):
+        run = prepare()
+        before = counter.count if counter else 0
+        start = time.perf_counter()
+        jobs = run()
+        elapsed = time.perf_counter() - start
+        rates.append(jobs / elapsed)
+        if counter:
+            queries.append((counter.count - before) / jobs)
+
+    run = prepare()
+    tracemalloc.start()
+    jobs = run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "jobs_per_sec": round(max(rates), 1),
+        "kib_per_job": round(peak / 1024 / jobs, 2),
+        "queries_per_job": round(min(queries), 2) if queries else None,
+    }
+
+
+def build_benchmarks(counter: QueryCounter) -> Dict[str, Tuple[Callable[[], Workload], bool]]:
+    feed, cards = load_fixtures()
+    jobs = parsed_jobs(feed, cards)
+    texts = [(job["title"], job["description"] or "") for _, job in jobs]
+    tmp = tempfile.mkdtemp(prefix="bench_pipeline_")
+    runs = iter(range(sys.maxsize))
+
+    def sqlite_url() -> str:
+        return f"sqlite:///{tmp}/bench_{next(runs)}.db"
+
+    benchmarks = {
+        "remoteok_scrape": (remoteok_scrape(feed), False),
+        "indeed_card_html": (indeed_card_html(cards), False),
+        "indeed_parse_card": (indeed_parse_card(cards), False),
+        "extract_skills": (text_workload("extract_skills", texts), False),
+        "parse_seniority": (text_workload("parse_seniority", texts), False),
+        "save_job_sqlite": (save_workload(sqlite_url, jobs, counter, batch=False), True),
+        "save_jobs_sqlite": (save_workload(sqlite_url, jobs, counter, batch=True), True),
+    }
+    postgres_url = os.getenv("BENCH_POSTGRES_URL")
+    if postgres_url:
+        benchmarks["save_job_postgres"] = (save_workload(lambda: postgres_url, jobs, counter, batch=False), True)
+        benchmarks["save_jobs_postgres"] = (save_workload(lambda: postgres_url, jobs, counter, batch=True), True)
+    return benchmarks
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> List[str]:
+    """Print each result against the baseline; return the regressions."""
+    regressions = []
+    print(f"\n  {'benchmark':<20} {'jobs/sec':>11} {'vs base':>8} {'KiB/job':>9} {'queries/job':>12}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = ""
+        if base:
+            ratio = result["jobs_per_sec"] / base["jobs_per_sec"]
+            change = f"{(ratio - 1) * 100:+.0f}%"
+            if ratio < 1 - TOLERANCE:
+                regressions.append(f"{name}: {ratio:.2f}x baseline jobs/sec")
+            if (result["queries_per_job"] or 0) > (base.get("queries_per_job") or 0) + 0.01:
+                regressions.append(f"{name}: {result['queries_per_job']} queries/job, was {base['queries_per_job']}")
+        queries = "-" if result["queries_per_job"] is None else f"{result['queries_per_job']:.2f}"
+        print(
+            f"  {name:<20} {result['jobs_per_sec']:>11,.0f} {change:>8} "
+            f"{result['kib_per_job']:>9.2f} {queries:>12}"
+        )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark; the best is kept")
+    parser.add_argument("--only", action="append", help="run only the named benchmark(s)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write results to {BASELINE.name}")
+    parser.add_argument("--check", action="store_true", help="exit non-zero on a regression against the baseline")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    counter = QueryCounter()
+    results = {}
+    for name, (prepare, counts_queries) in build_benchmarks(counter).items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = measure(prepare, counter if counts_queries else None, args.repeat)
+
+    baseline = json.loads(BASELINE.read_text())["results"] if BASELINE.exists() else {}
+    regressions = compare(results, baseline)
+
+    if args.save_baseline:
+        BASELINE.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": {**baseline, **results},
+        }, indent=2) + "\n")
+        print(f"\nSaved baseline to {BASELINE}")
+    elif regressions:
+        print("\nRegressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        if args.check:
+            sys.exit(1)
@@ -0,0 +1,89 @@
+"""
+Memory and time of reading the RemoteOK feed.
+Compares the streaming parser, which stops after `limit` listings, with the
+old approach of loading the whole feed with response.json() and slicing it.
+The feed is served from memory through httpx.MockTransport in 64 KiB chunks.
+Run: python -m benchmarks.bench_remoteok_feed [limit]
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import time
+import tracemalloc
+
+import httpx
+
+from app.scrapers.http import HTTPClient
+from app.scrapers.remoteok import RemoteOKScraper
+from benchmarks.corpus import make_remoteok_feed
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ChunkedBody(httpx.AsyncByteStream):
+    """Response body delivered in fixed-size chunks, like a network read."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def __aiter__(self):
+        view = memoryview(self.body)
+        for start in range(0, len(view), CHUNK_SIZE):
+            yield bytes(view[start:start + CHUNK_SIZE])
+
+
+def make_client(body: bytes) -> HTTPClient:
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, stream=ChunkedBody(body)))
+    return HTTPClient(transport=transport, validators={})
+
+
+async def legacy_scrape(body: bytes, limit: int) -> list:
+    """What RemoteOKScraper.scrape did before streaming: parse everything, then slice."""
+    client = make_client(body)
+    scraper = RemoteOKScraper(None, http_client=client)
+    response = await client.get(scraper.base_url)
+    data = response.json()
+    jobs = [
+        scraper.enrich(scraper.parse_listing(listing, str(listing.get("id", "")), scraper.parse_epoch(listing.get("epoch"))))
+        for listing in data[1:limit + 1]
+    ]
+    await client.aclose()
+    return jobs
+
+
+async def streaming_scrape(body: bytes, limit: int) -> list:
+    client = make_client(body)
+    jobs = await RemoteOKScraper(None, http_client=client).scrape(limit=limit)
+    await client.aclose()
+    return jobs
+
+
+def measure(scrape, body: bytes, limit: int):
+    """Return (seconds, peak traced MiB); the two are measured in separate runs."""
+    start = time.perf_counter()
+    jobs = asyncio.run(scrape(body, limit))
+    elapsed = time.perf_counter() - start
+    assert len(jobs) == limit, f"{scrape.__name__} returned {len(jobs)} jobs"
+
+    tracemalloc.start()
+    asyncio.run(scrape(body, limit))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+if __name__ == "__main__":
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    logging.disable(logging.INFO)
+
+    print(f"limit={limit}, chunk={CHUNK_SIZE // 1024} KiB")
+    print(f"  {'listings':>9} {'feed MiB':>9}   {'mode':<10} {'time':>9} {'peak MiB':>10}")
+    for count in (1_000, 10_000, 100_000):
+        body = json.dumps(make_remoteok_feed(count)).encode()
+        size = len(body) / (1024 * 1024)
+        for name, scrape in (("legacy", legacy_scrape), ("streaming", streaming_scrape)):
+            elapsed, peak = measure(scrape, body, limit)
+            print(f"  {count:>9,} {size:>9.1f}   {name:<10} {elapsed:>8.3f}s {peak:>10.1f}")
+        del body
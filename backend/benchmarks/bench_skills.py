@@ -0,0 +1,60 @@
+"""
+Micro-benchmark for skill extraction.
+Compares the compiled single-pass matcher with the old per-pattern loop,
+after checking that both find the same skills in every description.
+Run: python -m benchmarks.bench_skills [count]
+"""
+
+import re
+import sys
+import time
+
+from app.scrapers.skills import SKILL_PATTERNS, skill_matcher
+from benchmarks.corpus import make_jobs
+
+
+def legacy_extract_skills(title: str, description: str) -> list[str]:
+    """Per-pattern loop that BaseScraper.extract_skills used before the matcher."""
+    text = (title + " " + description).lower()
+    found_skills = []
+    for skill in SKILL_PATTERNS:
+        if len(skill) <= 3:
+            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
+            if re.search(pattern, text):
+                skill_name = skill.upper()
+                if skill_name not in found_skills:
+                    found_skills.append(skill_name)
+        else:
+            if skill.lower() in text:
+                skill_name = skill.title() if len(skill) > 3 else skill.upper()
+                if skill_name not in found_skills:
+                    found_skills.append(skill_name)
+    return found_skills
+
+
+def compiled_extract_skills(title: str, description: str) -> list[str]:
+    return skill_matcher.find(title + " " + description)
+
+
+def run(name: str, extract, jobs) -> float:
+    start = time.perf_counter()
+    for title, description in jobs:
+        extract(title, description)
+    elapsed = time.perf_counter() - start
+    rate = len(jobs) / elapsed
+    print(f"  {name:<10} {elapsed:8.3f}s  {rate:12,.0f} jobs/sec")
+    return rate
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+
+    for sentences in (12, 60):
+        jobs = make_jobs(count, sentences=sentences)
+        avg_len = sum(len(d) for _, d in jobs) // len(jobs)
+        print(f"\n{count:,} descriptions, ~{avg_len:,} chars each")
+        for title, description in jobs:
+            assert compiled_extract_skills(title, description) == legacy_extract_skills(title, description), title
+        legacy = run("legacy", legacy_extract_skills, jobs)
+        compiled = run("compiled", compiled_extract_skills, jobs)
+        print(f"  speedup    {compiled / legacy:.1f}x")
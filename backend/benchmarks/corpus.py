@@ -0,0 +1,130 @@
+"""
+Synthetic job-posting corpus for benchmarks.
+Descriptions mix skill mentions with the boilerplate real postings carry,
+so both hits and near-misses ("trust", "expression", "description") show up.
+"""
+
+import random
+from typing import List, Tuple
+
+TITLES = [
+    "Senior Software Engineer", "Backend Developer", "Frontend Engineer",
+    "Full Stack Developer", "Staff Platform Engineer", "Junior Python Developer",
+    "Engineering Manager", "Lead Data Engineer", "DevOps Engineer",
+    "Principal Architect", "Site Reliability Engineer", "Mobile Developer (iOS)",
+    "Machine Learning Engineer", "Director of Engineering", "Contract React Developer",
+]
+
+COMPANIES = [
+    "Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries",
+    "Wayne Enterprises", "Cyberdyne", "Soylent", "Vandelay Industries",
+]
+
+CITIES = [
+    "San Francisco", "New York", "Austin", "Seattle", "Remote", "London",
+    "Berlin", "Toronto", "Manila", "Singapore",
+]
+
+SKILL_PHRASES = [
+    "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Go", "Golang",
+    "Rust", "PHP", "Ruby on Rails", "Swift", "Kotlin", "Scala", "R",
+    "React", "Vue", "Angular", "Node.js", "Express", "Django", "Flask", "FastAPI",
+    "Spring Boot", ".NET", "ASP.NET", "Laravel", "Next.js", "AWS", "Azure", "GCP",
+    "Google Cloud", "Kubernetes", "K8s", "Docker", "Terraform", "PostgreSQL",
+    "MySQL", "MongoDB", "Redis", "Elasticsearch", "DynamoDB", "Oracle",
+    "SQL Server", "Cassandra", "Git", "GitHub", "GitLab", "Jenkins", "CI/CD",
+    "Jira", "Linux", "Unix", "Bash",
+]
+
+FILLER = [
+    "We are a fast-growing team building products our customers trust.",
+    "You will own features end to end, from design through deployment.",
+    "Strong communication skills and a collaborative mindset are essential.",
+    "Experience with distributed systems and event-driven architecture is a plus.",
+    "We value regular expression of ideas in an open, inclusive culture.",
+    "This role offers a competitive salary, equity and full health benefits.",
+    "Our hiring process includes a short take-home and a system design interview.",
+    "Help us scale a platform that serves millions of requests per day.",
+    "A detailed description of the role and our leading benefits is below.",
+    "You will mentor engineers, review code and shape our technical roadmap.",
+    "Flexible hours, hybrid or fully remote options across several time zones.",
+    "Knowledge of observability tooling, metrics, tracing and alerting.",
+]
+
+
+def make_description(rng: random.Random, sentences: int = 12) -> str:
+    """Build one realistic-looking job description."""
+    parts = []
+    for _ in range(sentences):
+        if rng.random() < 0.35:
+            skills = rng.sample(SKILL_PHRASES, rng.randint(1, 4))
+            parts.append(f"Hands-on experience with {', '.join(skills)} in production.")
+        else:
+            parts.append(rng.choice(FILLER))
+    return " ".join(parts)
+
+
+def make_jobs(count: int, seed: int = 42, sentences: int = 12) -> List[Tuple[str, str]]:
+    """Return (title, description) pairs."""
+    rng = random.Random(seed)
+    return [
+        (rng.choice(TITLES), make_description(rng, sentences))
+        for _ in range(count)
+    ]
+
+
+def make_remoteok_feed(count: int, seed: int = 42, sentences: int = 12) -> List[dict]:
+    """Return a RemoteOK API payload: a metadata object, then count listings
+    ordered newest first, with HTML descriptions."""
+    rng = random.Random(seed)
+    now = 1_760_000_000
+    feed: List[dict] = [{"last_updated": now, "legal": "API terms of service"}]
+    for i in range(count):
+        job_id = 1_000_000 - i
+        tags = rng.sample(SKILL_PHRASES, 3) + [rng.choice(["full-time", "contract"])]
+        feed.append({
+            "id": str(job_id),
+            "epoch": now - i * 600,
+            "date": "",
+            "company": rng.choice(COMPANIES),
+            "position": rng.choice(TITLES),
+            "tags": [tag.lower() for tag in tags],
+            "description": "<p>" + make_description(rng, sentences) + "</p>",
+            "location": rng.choice(CITIES),
+            "salary_min": rng.choice([0, 80_000, 120_000]),
+            "salary_max": rng.choice([0, 150_000, 200_000]),
+            "url": f"https://remoteok.com/remote-jobs/{job_id}",
+        })
+    return feed
+
+
+SALARY_SNIPPETS = [
+    None, "$120,000 - $160,000 a year", "$55 - $70 an hour", "From $95,000 a year",
+    "Up to $180,000 a year",
+]
+
+
+def make_indeed_page(count: int, seed: int = 42) -> str:
+    """Return an Indeed search results page with count job cards, using the
+    markup the scraper's CARD_FIELDS selectors expect."""
+    rng = random.Random(seed)
+    cards = []
+    for i in range(count):
+        salary = rng.choice(SALARY_SNIPPETS)
+        salary_html = f'<div class="salary-snippet"><span>{salary}</span></div>' if salary else ""
+        job_type = rng.choice(["Full-time", "Contract", "Part-time", "Full-time, Remote"])
+        cards.append(
+            f'<div class="cardOutline"><div class="job_seen_beacon"><table><tbody><tr><td>'
+            f'<h2 class="jobTitle"><a href="/rc/clk?jk={i:016x}&amp;fccid=1" data-jk="{i:016x}">'
+            f'<span title="{rng.choice(TITLES)}">{rng.choice(TITLES)}</span></a></h2>'
+            f'<div class="company_location"><span data-testid="company-name">{rng.choice(COMPANIES)}</span>'
+            f'<div data-testid="text-location">{rng.choice(CITIES)}, {rng.choice(["CA", "NY", "TX", "WA"])}</div></div>'
+            f'{salary_html}<div class="metadata"><div>{job_type}</div></div>'
+            f'</td></tr></tbody></table>'
+            f'<div class="job-snippet"><ul><li>{make_description(rng, 3)}</li></ul></div>'
+            f'</div></div>'
+        )
+    return (
+        '<html><head><title>Jobs</title></head><body>'
+        '<div id="mosaic-provider-jobcards">' + "".join(cards) + '</div></body></html>'
+    )
@@ -0,0 +1,83 @@
+"""
+Import-time report for each process type: the API, every worker profile
+and beat. Each target is imported in a fresh interpreter under
+python -X importtime, the way the process loads it at startup (workers
+and beat also import the Celery task modules and their pool). Reports the
+total import time, peak RSS, which heavy dependencies got loaded, and the
+slowest top-level imports.
+Run: python -m benchmarks.import_report [--only NAME] [--top N]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from app.worker import WORKER_PROFILES
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Dependencies worth knowing about when they are loaded at startup
+HEAVY_MODULES = ["playwright", "bs4", "lxml", "httpx", "redis", "sqlalchemy", "fastapi", "celery"]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+REPORT_RSS = "\nimport resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+
+
+def targets() -> Dict[str, str]:
+    """Process name -> code that imports what the process imports at startup."""
+    code = {"api": "import app.main"}
+    for name, profile in WORKER_PROFILES.items():
+        code[f"worker:{name}"] = (
+            "from app.worker import celery_app\n"
+            "from celery.concurrency import get_implementation\n"
+            "celery_app.loader.import_default_modules()\n"
+            f"get_implementation({profile.pool!r})"
+        )
+    code["beat"] = (
+        "from app.beat import celery_app\n"
+        "import celery.beat\n"
+        "celery_app.loader.import_default_modules()"
+    )
+    return code
+
+
+def measure(code: str) -> Tuple[List[Tuple[int, int, int, str]], int]:
+    """Run code under -X importtime; return (self us, cumulative us, depth,
+    module) per import and the peak RSS in KiB."""
+    env = dict(os.environ, PYTHONPATH=str(BACKEND))
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code + REPORT_RSS],
+        cwd=BACKEND, env=env, capture_output=True, text=True, check=True,
+    )
+    imports = []
+    for line in process.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            imports.append((int(own), int(cumulative), len(indent) // 2, module))
+    return imports, int(process.stdout.split()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", help="report only the named process(es)")
+    parser.add_argument("--top", type=int, default=5, help="slowest top-level imports to list per process")
+    args = parser.parse_args()
+
+    for name, code in targets().items():
+        if args.only and name not in args.only:
+            continue
+        imports, rss = measure(code)
+        loaded = {module for _, _, _, module in imports}
+        heavy = [module for module in HEAVY_MODULES if module in loaded]
+        total = sum(own for own, _, _, _ in imports)
+        print(f"\n{name}: {total / 1000:,.0f} ms, {len(imports)} modules, peak RSS {rss / 1024:,.0f} MiB")
+        print(f"  loaded: {', '.join(heavy) or '-'}")
+        top_level = sorted((entry for entry in imports if entry[2] == 0), key=lambda entry: -entry[1])
+        for _, cumulative, _, module in top_level[:args.top]:
+            print(f"  {cumulative / 1000:8,.1f} ms  {module}")
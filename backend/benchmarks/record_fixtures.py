@@ -0,0 +1,52 @@
+"""
+Record the parser fixtures used by benchmarks.bench_pipeline.
+With --archive, fixtures are taken from real payloads in the raw payload
+archive (see app/scrapers/archive.py); otherwise they are generated from
+the synthetic corpus in the same formats the sources serve.
+Run: python -m benchmarks.record_fixtures [--archive DIR] [--count N]
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from app.scrapers.archive import iter_archive
+from benchmarks.corpus import make_indeed_page, make_remoteok_feed
+
+FIXTURES = Path(__file__).parent / "fixtures"
+REMOTEOK_FIXTURE = FIXTURES / "remoteok_feed.json"
+INDEED_FIXTURE = FIXTURES / "indeed_cards.html"
+
+
+def from_archive(archive_dir: str, count: int):
+    listings = []
+    for record in iter_archive("remoteok", root=archive_dir):
+        listings.append(record["payload"])
+        if len(listings) >= count:
+            break
+    cards = []
+    for record in iter_archive("indeed", root=archive_dir):
+        cards.append(record["payload"])
+        if len(cards) >= count:
+            break
+    feed = [{"legal": "API terms of service"}] + listings
+    page = '<html><body><div id="mosaic-provider-jobcards">' + "".join(cards) + "</div></body></html>"
+    return feed, page
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--archive", help="payload archive directory to record from")
+    parser.add_argument("--count", type=int, default=200, help="listings and cards per fixture")
+    args = parser.parse_args()
+
+    if args.archive:
+        feed, page = from_archive(args.archive, args.count)
+    else:
+        feed, page = make_remoteok_feed(args.count), make_indeed_page(args.count)
+
+    FIXTURES.mkdir(exist_ok=True)
+    REMOTEOK_FIXTURE.write_text(json.dumps(feed, indent=1), encoding="utf-8")
+    INDEED_FIXTURE.write_text(page, encoding="utf-8")
+    print(f"Wrote {len(feed) - 1} listings to {REMOTEOK_FIXTURE}")
+    print(f"Wrote {page.count('job_seen_beacon')} cards to {INDEED_FIXTURE}")